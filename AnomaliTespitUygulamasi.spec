@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('data', 'data'), ('config', 'config'), ('models', 'models'), ('services', 'services'), ('utils', 'utils')],
-    hiddenimports=['tkinter', 'tkinter.ttk', 'matplotlib.backends.backend_tkagg', 'sklearn.ensemble', 'sklearn.svm', 'sklearn.preprocessing', 'sklearn.model_selection', 'sklearn.metrics', 'sklearn.decomposition'],
+    hiddenimports=['tkinter', 'tkinter.ttk', 'matplotlib.backends.backend_tkagg', 'sklearn.ensemble', 'sklearn.svm', 'sklearn.preprocessing', 'sklearn.model_selection', 'sklearn.metrics', 'sklearn.decomposition', 'models.registry', 'models.isolation_forest_model', 'models.one_class_svm_model', 'models.hbos_model', 'models.knn_model', 'models.ensemble_model', 'services.data_preprocessing_service', 'services.model_trainer_service', 'services.streaming_scoring_service', 'services.online_scoring_service', 'services.benchmark_service'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
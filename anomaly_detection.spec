@@ -28,6 +28,19 @@ a = Analysis(
         'seaborn',
         'matplotlib',
         'matplotlib.pyplot',
+        # models/ ve services/ PEP 562 ile, models.registry modül yollarıyla tembel içe aktarır;
+        # PyInstaller bu içe aktarmaları göremez
+        'models.registry',
+        'models.isolation_forest_model',
+        'models.one_class_svm_model',
+        'models.hbos_model',
+        'models.knn_model',
+        'models.ensemble_model',
+        'services.data_preprocessing_service',
+        'services.model_trainer_service',
+        'services.streaming_scoring_service',
+        'services.online_scoring_service',
+        'services.benchmark_service',
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,71 @@
+"""
+Uçtan uca benchmark
+main.py akışının aşamalarını (yükleme, ön işleme, bölme, ölçekleme, eğitim, skorlama,
+grafik) sentetik veri setlerinde ölçer, sonuçları JSON'a yazar ve referansla karşılaştırır.
+
+Kullanım:
+    python benchmark.py --sizes 10k,100k
+    python benchmark.py --sizes 10k,100k,1M,10M --models isolation_forest --no-plot
+    python benchmark.py --save-baseline          # Sonuçları referans olarak sakla
+    python benchmark.py --baseline benchmarks/baseline.json
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from config.config import BENCHMARK_PARAMS
+from services.benchmark_service import BenchmarkService
+
+
+def parse_size(value):
+    """'10k', '1M', '10000' biçimindeki satır sayısını tamsayıya çevirir"""
+    multipliers = {'k': 10 ** 3, 'm': 10 ** 6}
+    value = value.strip().lower()
+    if value and value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def main():
+    """Benchmark'ı komut satırı argümanlarıyla çalıştırır"""
+    parser = argparse.ArgumentParser(description="Anomali tespiti uçtan uca benchmark")
+    parser.add_argument('--sizes', default=None,
+                        help="Virgülle ayrılmış satır sayıları (örn. 10k,100k,1M,10M)")
+    parser.add_argument('--models', default=None,
+                        help="Virgülle ayrılmış kayıtlı modeller (örn. isolation_forest,one_class_svm)")
+    parser.add_argument('--no-plot', action='store_true', help="Grafik aşamasını atla")
+    parser.add_argument('--output', default=None, help="Sonuç JSON dosyası")
+    parser.add_argument('--baseline', default=BENCHMARK_PARAMS['baseline_path'],
+                        help="Karşılaştırılacak referans JSON dosyası")
+    parser.add_argument('--save-baseline', action='store_true', help="Sonuçları referans olarak kaydet")
+    parser.add_argument('--time-tolerance', type=float, default=BENCHMARK_PARAMS['time_tolerance'])
+    parser.add_argument('--memory-tolerance', type=float, default=BENCHMARK_PARAMS['memory_tolerance'])
+    args = parser.parse_args()
+    
+    sizes = [parse_size(size) for size in args.sizes.split(',')] if args.sizes else None
+    models = args.models.split(',') if args.models else None
+    
+    service = BenchmarkService()
+    report = service.run(sizes, models, plot=False if args.no_plot else None)
+    
+    output = args.output or os.path.join(BENCHMARK_PARAMS['output_dir'],
+                                         f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json")
+    service.save(report, output)
+    
+    if args.save_baseline:
+        service.save(report, args.baseline)
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"\nReferans bulunamadı ({args.baseline}). Oluşturmak için --save-baseline kullanın.")
+        return 0
+    
+    regressions = service.compare(report, service.load(args.baseline),
+                                  args.time_tolerance, args.memory_tolerance)
+    # Gerileme varsa CI'da başarısız olacak çıkış kodu
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
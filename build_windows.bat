@@ -14,7 +14,7 @@ if exist __pycache__ rmdir /s /q __pycache__
 
 echo.
 echo Executable olusturuluyor...
-pyinstaller --onefile --windowed --name=AnomaliTespitUygulamasi --add-data="data;data" --add-data="config;config" --add-data="models;models" --add-data="services;services" --add-data="utils;utils" --hidden-import=tkinter --hidden-import=tkinter.ttk --hidden-import=matplotlib.backends.backend_tkagg --hidden-import=sklearn.ensemble --hidden-import=sklearn.svm --hidden-import=sklearn.preprocessing --hidden-import=sklearn.model_selection --hidden-import=sklearn.metrics --hidden-import=sklearn.decomposition main.py
+pyinstaller --onefile --windowed --name=AnomaliTespitUygulamasi --add-data="data;data" --add-data="config;config" --add-data="models;models" --add-data="services;services" --add-data="utils;utils" --hidden-import=tkinter --hidden-import=tkinter.ttk --hidden-import=matplotlib.backends.backend_tkagg --hidden-import=sklearn.ensemble --hidden-import=sklearn.svm --hidden-import=sklearn.preprocessing --hidden-import=sklearn.model_selection --hidden-import=sklearn.metrics --hidden-import=sklearn.decomposition --hidden-import=models.registry --hidden-import=models.isolation_forest_model --hidden-import=models.one_class_svm_model --hidden-import=models.hbos_model --hidden-import=models.knn_model --hidden-import=models.ensemble_model --hidden-import=services.data_preprocessing_service --hidden-import=services.model_trainer_service --hidden-import=services.streaming_scoring_service --hidden-import=services.online_scoring_service --hidden-import=services.benchmark_service main.py
 
 echo.
 echo Release paketi olusturuluyor...
@@ -6,26 +6,239 @@ import os
 # Veri seti yolu
 DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'creditcard.csv')
 
+# Veri seti önbelleği (CSV -> sütun başına .npy)
+DATA_CACHE_PARAMS = {
+    'enabled': True,
+    'cache_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', '.cache'),
+    'hash_mode': 'sample'  # 'sample': baş/orta/son blok özeti, 'full': tüm dosyanın özeti
+}
+
+# Kompakt veri yolu: tek bir bellek eşlemeli float32 özellik matrisi
+COMPACT_DATA_PARAMS = {
+    'enabled': False,
+    'dtype': 'float32',
+    # None ise matris, kapanınca silinen geçici bir dosyada tutulur
+    'mmap_path': None,
+    'chunk_size': 100000
+}
+
+# Parça parça skorlama parametreleri
+STREAMING_PARAMS = {
+    'chunk_size': 50000
+}
+
 # Model parametreleri
 ISOLATION_FOREST_PARAMS = {
     'random_state': 42,
-    'contamination': 0.1
+    'contamination': 0.1,
+    # Eğitimden sonra ormanı düz dizilere aktar ve vektörize motorla skorla
+    'flat_engine': True,
+    # Tek iş parçacığında bu satırdan büyük batch'ler sklearn ile skorlanır (düz motor
+    # satır başına biraz daha yavaştır); çok çekirdekte düz motor parçaları paralel skorlar
+    'flat_max_rows': 10000
 }
 
 ONE_CLASS_SVM_PARAMS = {
     'nu': 0.1,
-    'kernel': 'rbf'
+    'kernel': 'rbf',
+    # 'exact': sklearn OneClassSVM, 'approx': çekirdek yaklaşımı + doğrusal SGD çözücü
+    'backend': 'exact',
+    # backend='exact' eğitim verisi: 'full', 'sample', 'coreset' veya 'shards'
+    'training_mode': 'full',
+    # True ise main.py tam ve yaklaşık çekirdeğin ROC AUC karşılaştırmasını raporlar
+    'compare_backends': False
+}
+
+# HBOS: özellik başına histogram log yoğunlukları (satır başına özellik sayısı kadar tablo okuması)
+HBOS_PARAMS = {
+    'n_bins': 50,             # Özellik başına histogram kutusu
+    'tail_quantile': 0.001,   # Histogram aralığı dışında kalan (kuyruk kutularına düşen) oran
+    'alpha': 1.0,             # Boş kutular için Laplace düzeltmesi
+    'contamination': 0.1,     # Eğitim skorlarının bu yüzdeliği karar sınırı (0) olur
+    'sample_size': 100000,    # Aralık ve karar sınırı için örneklem
+    'chunk_size': 65536,      # Eğitim ve skorlama parça boyutu
+    'random_state': 42
+}
+
+# k-NN uzaklık: normal eğitim satırları üzerinde IVF yaklaşık en yakın komşu indeksi
+KNN_PARAMS = {
+    'n_neighbors': 10,            # Skor: en yakın k komşuya ortalama uzaklık
+    'n_lists': None,              # IVF liste (k-means merkez) sayısı; None ise sqrt(satır sayısı)
+    'n_probe': 8,                 # Sorgu başına taranan liste (n_lists ile kesin arama)
+    'kmeans_sample_size': 50000,  # Merkezlerin fit edildiği örneklem
+    'kmeans_max_iter': 20,
+    'contamination': 0.1,         # Eğitim uzaklıklarının bu oranı karar sınırının (0) dışında kalır
+    'offset_sample_size': 5000,   # Karar sınırı için sorgulanan eğitim satırı
+    'chunk_size': 2048,           # Sorgu parça boyutu (parçalar iş parçacıklarında paralel)
+    'n_jobs': -1,
+    'random_state': 42
+}
+
+# Alt küme ile One-Class SVM eğitimi (training_mode != 'full')
+ONE_CLASS_SVM_SUBSET_PARAMS = {
+    'sample_size': 20000,  # 'sample' ve 'coreset' için satır sayısı
+    'n_shards': 4,         # 'shards' için ayrık parça sayısı (parçalar paralel eğitilir)
+    'n_strata': 10,        # 'sample' için uzaklık katmanı sayısı
+    'random_state': 42,
+    # svm_training_tradeoff() eğrisinde denenecek örneklem boyutları ve parça sayıları
+    'tradeoff_sample_sizes': [2000, 5000, 10000, 20000, 50000],
+    'tradeoff_shard_counts': [2, 4, 8]
+}
+
+# Yaklaşık çekirdekli One-Class SVM parametreleri (backend='approx')
+ONE_CLASS_SVM_APPROX_PARAMS = {
+    'method': 'nystroem',  # 'nystroem' veya 'rff' (random Fourier features)
+    'n_components': 300,
+    'gamma': 'scale',
+    'n_epochs': 5,
+    'batch_size': 10000,
+    'tol': 1e-3,
+    'random_state': 42
+}
+
+# One-Class SVM destek vektörü sıkıştırması (indirgenmiş küme, backend='exact')
+SVM_COMPRESSION_PARAMS = {
+    'enabled': False,
+    'n_vectors': 500,   # İndirgenmiş kümedeki vektör sayısı
+    'max_iter': 100,    # Destek vektörlerini kümeleyen k-means iterasyon sayısı
+    'random_state': 42
+}
+
+# Çalışma noktası (eşik) seçimi: sabit contamination/nu yerine alarm bütçesi veya kesinlik hedefi
+THRESHOLD_PARAMS = {
+    'enabled': False,              # True: eğitimden sonra her model için eşik seçilir ve modelle kaydedilir
+    'alert_budget_per_10k': 50,    # 10 bin işlemde en fazla alarm (None: sınırsız)
+    'min_precision': None,         # En düşük kesinlik (None: kısıt yok)
+    'validation_size': 0.2,        # Eşik seçimi için eğitim setinden ayrılan doğrulama oranı (None: eğitim seti)
+    'table_rows': 10               # Yazdırılan çalışma noktası tablosunun satır sayısı
+}
+
+# İki aşamalı (kaskad) skorlama: ucuz ön filtre tüm satırları, pahalı model yalnızca şüphelileri skorlar
+CASCADE_PARAMS = {
+    'enabled': False,
+    'prefilter_model': 'isolation_forest',  # Ön filtre (daha hızlısı için 'hbos')
+    'model': 'one_class_svm',               # Yalnızca iletilen satırlarda çalışan pahalı model
+    'forward_rate': 0.05                    # Eğitim skorlarının bu oranı ön filtre eşiğini belirler
+}
+
+# Skor birleştirme (ensemble): üye skorları eğitim yüzdeliklerine çevrilip birleştirilir
+ENSEMBLE_PARAMS = {
+    'enabled': False,
+    'models': None,           # Üye modeller, None: eğitilmiş tüm modeller
+    'method': 'mean',         # 'mean': ağırlıklı ortalama, 'max': en alarm veren üye
+    'weights': None,          # Model adı -> ağırlık ('mean' için), None: eşit
+    'n_quantiles': 1000,      # Üye başına yüzdelik tablosu boyutu
+    'contamination': 0.1,     # Birleşik eğitim skorlarının bu yüzdeliği karar sınırı (0) olur
+    'sample_size': 100000,    # Yüzdelik tabloları için skorlanan eğitim satırı
+    'n_jobs': -1,             # Üyeleri paralel skorlayan iş parçacığı sayısı
+    'random_state': 42
 }
 
 # Eğitim parametreleri
+TRAINING_PARAMS = {
+    'models': None,     # Eğitilecek kayıtlı modeller (models.registry), None: tümü
+    'parallel': False,  # True: modeller ayrı süreçlerde aynı anda eğitilir
+    'n_jobs': -1        # Modeller arasında paylaştırılacak toplam çekirdek (-1: tümü)
+}
+
 TRAIN_TEST_SPLIT = {
     'test_size': 0.3,
     'random_state': 42,
     'stratify': True
 }
 
+# Çıkarım paketi (scaler + modeller + özellik şeması)
+BUNDLE_PARAMS = {
+    'path': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'artifacts', 'inference_bundle.joblib'),
+    'save_after_training': True
+}
+
+# Skorlama paketi: sklearn gerektirmeyen numpy dizileri (score.py)
+SCORING_ARTIFACT_PARAMS = {
+    'path': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'artifacts', 'scoring'),
+    'save_after_training': True,
+    # score.py --check-startup: içe aktarma + paket yükleme için süre bütçesi (ms)
+    'startup_budget_ms': 500,
+    # Skorlama sürecinde yüklenmemesi gereken ağır modüller
+    'forbidden_modules': ['sklearn', 'scipy', 'matplotlib', 'seaborn']
+}
+
+# İstek birleştirici (micro-batching)
+COALESCER_PARAMS = {
+    'max_batch_size': 256,  # Tek vektörize çağrıdaki en fazla satır
+    'max_wait_us': 2000     # İlk istekten sonra batch doldurmak için en fazla bekleme (mikrosaniye)
+}
+
+# Çevrimiçi skorlama sunucusu
+SERVER_PARAMS = {
+    'host': '127.0.0.1',
+    'port': 8080,
+    'max_batch_size': COALESCER_PARAMS['max_batch_size'],
+    'max_wait_us': COALESCER_PARAMS['max_wait_us'],
+    'request_queue_size': 128  # Kabul bekleyen bağlantı kuyruğu (listen backlog)
+}
+
+# Çalışma zamanı ölçümleri (utils.metrics_utils)
+METRICS_PARAMS = {
+    'enabled': True,
+    # Çağrı başına ayrılan belleği tracemalloc ile ölç (çağrıları belirgin şekilde yavaşlatır)
+    'track_allocations': False,
+    'duration_buckets': [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0],
+    'prometheus_prefix': 'anomaly_detection',
+    # Çalışma sonunda ölçümlerin yazılacağı dosya (.json veya .prom), None ise yazılmaz
+    'export_path': None,
+    # Profil modu: None, 'cprofile' veya 'tracemalloc'
+    'profile': None,
+    'profile_stages': [],  # Profili çıkarılacak aşamalar (örn. ['one_class_svm.fit'], '*': tümü)
+    'profile_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'artifacts', 'profiles'),
+    'profile_top_n': 30,
+    'tracemalloc_frames': 1
+}
+
+# Uçtan uca benchmark (benchmark.py)
+BENCHMARK_PARAMS = {
+    'sizes': [10000, 100000],  # Varsayılan satır sayıları (--sizes 10k,100k,1M,10M ile değiştirilebilir)
+    'models': None,  # Ölçülecek kayıtlı modeller (None: tümü)
+    'plot': True,
+    'random_state': 42,
+    'data_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'benchmark'),
+    'output_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'artifacts', 'benchmarks'),
+    'baseline_path': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'benchmarks', 'baseline.json'),
+    # Tam çekirdekli One-Class SVM bu satır sayısının üstünde örneklemle eğitilir
+    'svm_max_rows': 50000,
+    'time_tolerance': 0.2,    # İzin verilen göreli süre artışı
+    'memory_tolerance': 0.2,  # İzin verilen göreli tepe RSS artışı
+    'min_seconds': 0.05       # Bundan kısa aşamaların süresi gürültü sayılır
+}
+
 # Görselleştirme parametreleri
 PLOT_PARAMS = {
     'figsize': (10, 6),
     'dpi': 100
 }
+
+# Anomali dağılımı grafikleri için 2 boyutlu PCA izdüşümü (eğitimde bir kez fit edilir)
+PROJECTION_PARAMS = {
+    'method': 'auto',            # 'auto', 'full', 'randomized' veya 'incremental'
+    'sample_size': 50000,        # Fit için en fazla satır ('incremental' tüm veriyi kullanır)
+    'randomized_min_rows': 10000,  # 'auto': bu satır sayısından itibaren randomized SVD
+    'batch_size': 100000,        # IncrementalPCA ve dönüşüm parça boyutu
+    'random_state': 42
+}
+
+# Anomali dağılımı grafiği: büyük verilerde normal noktaların yoğunluğa göre seyreltilmesi
+SCATTER_PARAMS = {
+    'mode': 'auto',       # 'auto', 'scatter' (tüm noktalar), 'hexbin' veya 'subsample'
+    'max_points': 20000,  # 'auto': bu nokta sayısının üstünde hexbin; 'subsample': hedef örneklem
+    'gridsize': 60,       # hexbin ve tabakalı örneklem ızgarası (eksen başına hücre)
+    'random_state': 42
+}
+
+# Başsız rapor (main.py --headless): grafikler pencere yerine dosyalara çizilir
+REPORT_PARAMS = {
+    'headless': False,
+    'output_dir': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'artifacts', 'report'),
+    'formats': ['png'],  # 'png' ve/veya 'svg'
+    'html': True,        # Tüm figürleri ve metrikleri tek bir report.html dosyasında birleştir
+    'n_jobs': None       # Figürleri çizen işçi süreç sayısı (None: çekirdek sayısı, 1: süreç açmadan)
+}
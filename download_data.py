@@ -43,9 +43,20 @@ def download_creditcard_dataset():
     return str(data_file)
 
 
-def create_sample_dataset(file_path):
+def create_sample_dataset(file_path, n_samples=10000, n_features=28, random_state=42, chunk_size=1000000):
     """
-    Test için küçük bir örnek veri seti oluşturur.
+    Test için sentetik bir örnek veri seti oluşturur.
+    
+    Büyük veri setleri belleğe sığması için chunk_size satırlık parçalar halinde üretilip
+    dosyaya eklenir; her parçada anomali oranı %1'dir. chunk_size'dan küçük veri setleri
+    tek parçada üretilir, aynı tohumla her zaman aynı dosya oluşur.
+    
+    Args:
+        file_path: Oluşturulacak CSV dosyası
+        n_samples: Satır sayısı
+        n_features: Özellik (V1..Vn) sayısı
+        random_state: Rastgelelik tohumu
+        chunk_size: Parça başına satır sayısı
     """
     import pandas as pd
     import numpy as np
@@ -53,37 +64,41 @@ def create_sample_dataset(file_path):
     print("\nTest için örnek veri seti oluşturuluyor...")
     
     # Rastgele veri oluştur
-    np.random.seed(42)
-    n_samples = 10000
-    n_features = 28
-    
-    # Normal dağılımdan rastgele veri oluştur
-    X = np.random.randn(n_samples, n_features)
-    
-    # Anomali oranı %1
-    n_anomalies = int(0.01 * n_samples)
-    anomaly_indices = np.random.choice(n_samples, n_anomalies, replace=False)
-    
-    # Anomali etiketleri
-    y = np.zeros(n_samples)
-    y[anomaly_indices] = 1
-    
-    # Anomali verilerini daha farklı yap
-    X[anomaly_indices] += np.random.randn(n_anomalies, n_features) * 2
-    
-    # DataFrame oluştur
+    np.random.seed(random_state)
     feature_names = [f'V{i+1}' for i in range(n_features)]
-    df = pd.DataFrame(X, columns=feature_names)
-    df['Class'] = y
-    
-    # Time sütunu ekle (orijinal veri setinde olduğu gibi)
-    df.insert(0, 'Time', np.arange(n_samples))
+    n_total_anomalies = 0
+    
+    for offset in range(0, n_samples, chunk_size):
+        n_chunk = min(chunk_size, n_samples - offset)
+        
+        # Normal dağılımdan rastgele veri oluştur
+        X = np.random.randn(n_chunk, n_features)
+        
+        # Anomali oranı %1
+        n_anomalies = int(0.01 * n_chunk)
+        anomaly_indices = np.random.choice(n_chunk, n_anomalies, replace=False)
+        
+        # Anomali etiketleri
+        y = np.zeros(n_chunk)
+        y[anomaly_indices] = 1
+        
+        # Anomali verilerini daha farklı yap
+        X[anomaly_indices] += np.random.randn(n_anomalies, n_features) * 2
+        
+        # DataFrame oluştur
+        df = pd.DataFrame(X, columns=feature_names)
+        df['Class'] = y
+        
+        # Time sütunu ekle (orijinal veri setinde olduğu gibi)
+        df.insert(0, 'Time', np.arange(offset, offset + n_chunk))
+        
+        # Dosyayı kaydet (ilk parça başlıkla, sonrakiler ekleyerek)
+        df.to_csv(file_path, index=False, mode='w' if offset == 0 else 'a', header=offset == 0)
+        n_total_anomalies += n_anomalies
     
-    # Dosyayı kaydet
-    df.to_csv(file_path, index=False)
     print(f"Örnek veri seti oluşturuldu: {file_path}")
-    print(f"Veri seti boyutu: {df.shape}")
-    print(f"Anomali oranı: {df['Class'].mean():.4f}")
+    print(f"Veri seti boyutu: ({n_samples}, {n_features + 2})")
+    print(f"Anomali oranı: {n_total_anomalies / n_samples:.4f}")
 
 
 def setup_kaggle_api():
@@ -1,25 +1,46 @@
-import pandas as pd
-import numpy as np
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, roc_curve, precision_recall_curve
-from sklearn.decomposition import PCA
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend kullan - popup açmaz
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
 
-# Matplotlib ayarları
-plt.rcParams['figure.max_open_warning'] = 0  # Çoklu figure uyarısını kapat
-plt.ioff()  # Interactive mode'u kapat - popup açmaz
+import numpy as np
 
-# Proje modüllerini içe aktar
+# Proje modüllerini içe aktar. Grafik kütüphaneleri (matplotlib, seaborn) ve sklearn
+# yalnızca kullanıldıkları adımda yüklenir.
 from services.data_preprocessing_service import DataPreprocessingService
 from services.model_trainer_service import ModelTrainerService
-from config.config import PLOT_PARAMS
-from utils.visualization_utils import plot_all_visualizations
+from config.config import (PLOT_PARAMS, COMPACT_DATA_PARAMS, BUNDLE_PARAMS, SVM_COMPRESSION_PARAMS, METRICS_PARAMS,
+                           SCORING_ARTIFACT_PARAMS, REPORT_PARAMS, THRESHOLD_PARAMS, CASCADE_PARAMS,
+                           ENSEMBLE_PARAMS, ONE_CLASS_SVM_PARAMS)
+from models.registry import model_title
+from utils.metrics_utils import get_registry
+
+
+def _load_plotting(headless=False):
+    """Matplotlib'i pencere açmayacak şekilde ayarlar ve grafik fonksiyonunu döner"""
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend kullan - popup açmaz
+    import matplotlib.pyplot as plt
+    
+    # Matplotlib ayarları
+    plt.rcParams['figure.max_open_warning'] = 0  # Çoklu figure uyarısını kapat
+    plt.ioff()  # Interactive mode'u kapat - popup açmaz
+    
+    if headless:
+        from utils.visualization_utils import render_report
+        return render_report
+    from utils.visualization_utils import plot_all_visualizations
+    return plot_all_visualizations
 
 
-def main():
-    """Ana uygulama fonksiyonu"""
+def main(headless=None, report_dir=None, report_formats=None):
+    """
+    Ana uygulama fonksiyonu
+    
+    Args:
+        headless: True ise grafikler pencere yerine rapor dosyalarına çizilir (None ise config'den)
+        report_dir: Başsız rapor klasörü (None ise config'den)
+        report_formats: Başsız rapor figür biçimleri (None ise config'den)
+    """
+    headless = REPORT_PARAMS['headless'] if headless is None else headless
+    
     print("=== Anomali Tespit Projesi ===")
     print("Bu proje Kadir Can Felek tarafından tamamlanmıştır.\n")
     
@@ -29,27 +50,48 @@ def main():
     # Veri setini yükle
     print("Veri seti yükleniyor...")
     try:
-        df = data_service.load_data()
-        print(f"Veri seti boyutu: {df.shape}")
-        print(f"Anomali oranı: {df['Class'].mean():.4f}")
+        if COMPACT_DATA_PARAMS['enabled']:
+            data = data_service.load_columns()
+        else:
+            data = data_service.load_data()
+        print(f"Veri seti boyutu: ({len(data['Class'])}, {len(data.keys())})")
+        print(f"Anomali oranı: {np.mean(data['Class']):.4f}")
     except FileNotFoundError:
         print("Hata: Veri seti bulunamadı. Lütfen 'data/creditcard.csv' dosyasını ekleyin.")
         print("Veri setini indirmek için 'download_data.py' scriptini çalıştırabilirsiniz.")
         return
     
-    # Veriyi ön işle
-    print("\nVeri ön işleme yapılıyor...")
-    X, y = data_service.preprocess_data(df)
-    print(f"Özellik sayısı: {X.shape[1]}")
+    if COMPACT_DATA_PARAMS['enabled']:
+        # Tek bir bellek eşlemeli float32 matris; eğitim/test setleri onun görünümleri
+        print("\nKompakt veri yolu kullanılıyor...")
+        X_train, X_test, y_train, y_test = data_service.prepare_compact_data(data)
+        print(f"Eğitim seti boyutu: {X_train.shape}")
+        print(f"Test seti boyutu: {X_test.shape}")
+        
+        print("\nÖzellikler yerinde normalleştiriliyor...")
+        X_train_scaled, X_test_scaled = data_service.scale_features(X_train, X_test, inplace=True)
+    else:
+        # Veriyi ön işle
+        print("\nVeri ön işleme yapılıyor...")
+        X, y = data_service.preprocess_data(data)
+        print(f"Özellik sayısı: {X.shape[1]}")
+        
+        # Veriyi eğitim ve test setlerine ayır
+        X_train, X_test, y_train, y_test = data_service.split_data(X, y)
+        print(f"Eğitim seti boyutu: {X_train.shape}")
+        print(f"Test seti boyutu: {X_test.shape}")
+        
+        # Özellikleri normalleştir
+        print("\nÖzellikler normalleştiriliyor...")
+        X_train_scaled, X_test_scaled = data_service.scale_features(X_train, X_test)
     
-    # Veriyi eğitim ve test setlerine ayır
-    X_train, X_test, y_train, y_test = data_service.split_data(X, y)
-    print(f"Eğitim seti boyutu: {X_train.shape}")
-    print(f"Test seti boyutu: {X_test.shape}")
-    
-    # Özellikleri normalleştir
-    print("\nÖzellikler normalleştiriliyor...")
-    X_train_scaled, X_test_scaled = data_service.scale_features(X_train, X_test)
+    # Eşik test setinde seçilirse raporlanan test metrikleri ve en iyi model seçimi iyimser olur;
+    # çalışma noktaları eğitim setinden ayrılan doğrulama setinde seçilir
+    X_val_scaled, y_val = X_train_scaled, y_train
+    if THRESHOLD_PARAMS['enabled'] and THRESHOLD_PARAMS['validation_size']:
+        X_train_scaled, X_val_scaled, y_train, y_val = data_service.split_data(
+            X_train_scaled, y_train, test_size=THRESHOLD_PARAMS['validation_size'])
+        print(f"Eşik doğrulama seti boyutu: {X_val_scaled.shape}")
     
     # Model eğitimi servisini başlat
     model_trainer = ModelTrainerService()
@@ -57,38 +99,82 @@ def main():
     # Modelleri eğit ve değerlendir
     results = model_trainer.train_models(X_train_scaled, X_test_scaled, y_train, y_test)
     
-    # Sonuçları al
-    iso_results = results['isolation_forest']
-    svm_results = results['one_class_svm']
+    # Tam ve yaklaşık çekirdekli One-Class SVM'in ROC AUC / süre karşılaştırması
+    svm_comparison = None
+    if ONE_CLASS_SVM_PARAMS['compare_backends']:
+        print("\nOne-Class SVM backend'leri karşılaştırılıyor...")
+        svm_comparison = model_trainer.compare_svm_backends(X_train_scaled, X_test_scaled, y_train, y_test)
+    
+    # Anomali dağılımı grafiklerinin 2-B izdüşümü (eğitim örnekleminde bir kez)
+    model_trainer.fit_projection(X_train_scaled)
+    
+    # One-Class SVM skorlamasını destek vektörlerini sıkıştırarak hızlandır
+    if SVM_COMPRESSION_PARAMS['enabled']:
+        print("\nOne-Class SVM sıkıştırılıyor...")
+        model_trainer.compress_svm(X_test_scaled, y_test)
+    
+    # Eğitilmiş tüm modellerin skorlarını birleştiren ensemble
+    if ENSEMBLE_PARAMS['enabled']:
+        model_trainer.train_ensemble(X_train_scaled, X_test_scaled, y_test)
     
-    y_pred_iso = iso_results['predictions']
-    y_pred_iso_scores = iso_results['scores']
-    metrics_iso = iso_results['metrics']
+    # Sabit contamination/nu yerine alarm bütçesine veya kesinlik hedefine göre eşik seç
+    if THRESHOLD_PARAMS['enabled']:
+        model_trainer.select_thresholds(X=X_val_scaled, y=y_val)
     
-    y_pred_svm = svm_results['predictions']
-    y_pred_svm_scores = svm_results['scores']
-    metrics_svm = svm_results['metrics']
+    # Ucuz ön filtre + yalnızca şüpheli satırlarda One-Class SVM
+    if CASCADE_PARAMS['enabled']:
+        model_trainer.calibrate_cascade(X_train_scaled)
+        model_trainer.evaluate_cascade(X_test_scaled, y_test)
     
-    # Görselleştirmeler
+    # Skorlama süreçleri için scaler, modeller ve özellik şemasını tek pakette sakla
+    if BUNDLE_PARAMS['save_after_training']:
+        model_trainer.save_bundle(data_service.get_scaler(), data_service.feature_columns)
+    
+    # sklearn gerektirmeyen skorlama paketi (score.py)
+    if SCORING_ARTIFACT_PARAMS['save_after_training']:
+        model_trainer.save_scoring_artifact(data_service.get_scaler(), data_service.feature_columns)
+    
+    # Görselleştirmeler (eğitilen tüm modeller; eğriler değerlendirmede sıralanan skorlardan)
     print("\nTüm grafikler tek bir çıktıda oluşturuluyor...")
     
-    # Tüm görselleştirmeleri tek bir figure'da göster
-    plot_all_visualizations(y_test, y_pred_iso, y_pred_svm, y_pred_iso_scores, y_pred_svm_scores, 
-                           metrics_iso, metrics_svm, X_test_scaled)
+    if headless:
+        # Pencere açmadan PNG/SVG ve HTML rapora çiz
+        render_report = _load_plotting(headless=True)
+        render_report(y_test, results, X_test_scaled, output_dir=report_dir, formats=report_formats,
+                      projection=model_trainer.projection)
+    else:
+        # Tüm görselleştirmeleri tek bir figure'da göster
+        plot_all_visualizations = _load_plotting()
+        plot_all_visualizations(y_test, results, X_test_scaled, projection=model_trainer.projection)
     
     # En iyi modeli göster
     best_model_name, best_model_results = model_trainer.get_best_model()
-    print(f"\nEn iyi performans gösteren model: {best_model_name.replace('_', ' ').title()}")
+    print(f"\nEn iyi performans gösteren model: {model_title(best_model_name)}")
     print(f"F1 Skoru: {best_model_results['metrics'][3]:.4f}")
     
     # Performans özetini göster
     performance_df = model_trainer.get_model_performance_summary()
     print("\nPerformans Özeti:")
     print(performance_df.to_string(index=False))
+    if svm_comparison is not None:
+        print("\nOne-Class SVM Backend Karşılaştırması (exact / approx):")
+        print(svm_comparison.to_string(index=False))
+    
+    # Aşama başına süre, satır ve bellek sayaçları
+    if METRICS_PARAMS['export_path']:
+        get_registry().export(METRICS_PARAMS['export_path'])
     
     print("\n=== Analiz Tamamlandı ===")
     print("Tüm grafikler gösterildi. Program sonlandırılıyor...")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Anomali tespit modellerini eğitir ve karşılaştırır")
+    parser.add_argument('--headless', action='store_true', default=None,
+                        help="Pencere açmadan grafikleri rapor dosyalarına çiz")
+    parser.add_argument('--report-dir', default=None, help="Başsız rapor klasörü")
+    parser.add_argument('--formats', default=None, help="Figür biçimleri, örn. png,svg")
+    args = parser.parse_args()
+    
+    main(headless=args.headless, report_dir=args.report_dir,
+         report_formats=args.formats.split(',') if args.formats else None)
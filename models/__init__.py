@@ -1,7 +1,33 @@
 """
-Model sınıfları
+Model sınıfları ve model kayıt defteri
+
+Modeller ilk erişimde içe aktarılır (PEP 562).
 """
-from .isolation_forest_model import IsolationForestModel
-from .one_class_svm_model import OneClassSVMModel
+import importlib
+
+_MODELS = {
+    'IsolationForestModel': '.isolation_forest_model',
+    'OneClassSVMModel': '.one_class_svm_model',
+    'HBOSModel': '.hbos_model',
+    'KNNModel': '.knn_model',
+    'EnsembleModel': '.ensemble_model',
+    'Detector': '.registry',
+    'ModelSpec': '.registry',
+    'register_model': '.registry',
+    'get_model_spec': '.registry',
+    'registered_models': '.registry'
+}
+
+__all__ = list(_MODELS)
+
+
+def __getattr__(name):
+    if name not in _MODELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_MODELS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['IsolationForestModel', 'OneClassSVMModel']
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,358 @@
+"""
+Skor birleştirme (ensemble) Model sınıfı
+"""
+import os
+import threading
+
+import numpy as np
+
+from config.config import ENSEMBLE_PARAMS
+from utils.evaluation_utils import apply_threshold
+from utils.metrics_utils import instrument
+
+
+FUSION_METHODS = ('mean', 'max')
+
+# ScoreFusion iş parçacığı havuzlarının tembel oluşturulması için
+_POOL_LOCK = threading.Lock()
+
+
+def score_members(members, X, n_jobs=1, training=False, executor=None):
+    """
+    Üyelerin ham skorları; üyeler iş parçacıklarında paralel skorlanır (skorlama
+    çoğunlukla GIL'i bırakan numpy/sklearn çağrılarıdır).
+    
+    Args:
+        members: Model adı -> decision_function sağlayan model veya motor
+        X: Skorlanacak veri
+        n_jobs: İş parçacığı sayısı (-1: tüm çekirdekler)
+        training: True ise X üyelerin eğitim satırlarıdır; training_decision_function
+            sağlayan üyeler (ör. k-NN) satırları eğitim dışı bir satır gibi skorlar
+        executor: Verilirse üyeler bu havuzda skorlanır (n_jobs yok sayılır); verilmezse
+            birden çok iş parçacığı için çağrı başına bir havuz açılır
+        
+    Returns:
+        numpy.ndarray: (n_members, n_rows) skorlar
+    """
+    def score(member):
+        if training and hasattr(member, 'training_decision_function'):
+            return member.training_decision_function(X)
+        return member.decision_function(X)
+    
+    members = list(members.values())
+    n_jobs = n_jobs if n_jobs and n_jobs > 0 else os.cpu_count() or 1
+    if executor is not None and len(members) > 1:
+        scores = list(executor.map(score, members))
+    elif n_jobs > 1 and len(members) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(n_jobs, len(members))) as executor:
+            scores = list(executor.map(score, members))
+    else:
+        scores = [score(member) for member in members]
+    return np.vstack([np.asarray(member_scores, dtype=np.float64) for member_scores in scores])
+
+
+class ScoreFusion:
+    """
+    Üye modellerin skorlarını ortak ölçeğe çekip birleştiren skorlama motoru.
+    
+    Her üyenin eğitim skorlarından bir yüzdelik tablosu tutulur (quantiles[i] artan,
+    levels ortak yüzdelik düzeyleri). Bir skor tabloda ikili aramayla (O(log n)) sıra
+    yüzdeliğine çevrilir; tablo aralığının dışındaki skorlar eğitim skor aralığına
+    bölünerek doğrusal uzatılır, böylece kuyruklarda da sıralama korunur.
+    
+    Birleştirme: 'mean' yüzdeliklerin ağırlıklı ortalaması, 'max' en alarm veren üye
+    (en düşük yüzdelik). decision_function = birleşik yüzdelik - offset; düşük (negatif)
+    skor daha anormaldir. Üyeler iş parçacıklarında paralel skorlanır; havuz ilk
+    skorlamada bir kez açılır ve tekrar kullanılır (küçük batch'lerde çağrı başına havuz
+    açıp kapamanın maliyeti skorlamayı aşar).
+    """
+    
+    def __init__(self, members, quantiles, levels, weights, method='mean', offset=0.0, n_jobs=1,
+                 decision_threshold=None):
+        if method not in FUSION_METHODS:
+            raise ValueError(f"Geçersiz birleştirme yöntemi: '{method}'. {FUSION_METHODS} içinden biri olmalı.")
+        
+        self.members = members
+        self.quantiles = quantiles
+        self.levels = levels
+        self.weights = weights
+        self.method = method
+        self.offset = float(offset)
+        self.n_jobs = n_jobs
+        # Çalışma noktası eşiği (None: negatif skor anomali)
+        self.decision_threshold = decision_threshold
+        self._spread = np.maximum(quantiles[:, -1] - quantiles[:, 0], np.finfo(float).eps)
+        self._pool = None
+    
+    def __getstate__(self):
+        # İş parçacığı havuzu kaydedilmez; yüklendikten sonra ilk skorlamada yeniden açılır
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
+    
+    def _executor(self):
+        """Üyeleri skorlayan havuz; tek iş parçacığı veya tek üyede None"""
+        n_jobs = self.n_jobs if self.n_jobs and self.n_jobs > 0 else os.cpu_count() or 1
+        if n_jobs <= 1 or len(self.members) <= 1:
+            return None
+        pool = getattr(self, '_pool', None)
+        if pool is None:
+            with _POOL_LOCK:
+                pool = getattr(self, '_pool', None)
+                if pool is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    pool = self._pool = ThreadPoolExecutor(max_workers=min(n_jobs, len(self.members)))
+        return pool
+    
+    def set_n_jobs(self, n_jobs):
+        """
+        İş parçacığı sayısını ayarlar; mevcut havuz kapatılır, sonraki skorlamada yeni
+        boyutla açılır.
+        
+        Args:
+            n_jobs: Çekirdek sayısı (-1: tüm çekirdekler)
+        """
+        with _POOL_LOCK:
+            pool, self._pool = getattr(self, '_pool', None), None
+            self.n_jobs = n_jobs
+        if pool is not None:
+            pool.shutdown(wait=False)
+    
+    def member_scores(self, X):
+        """Üyelerin ham skorları, (n_members, n_rows) (bkz. score_members)"""
+        return score_members(self.members, X, self.n_jobs, executor=self._executor())
+    
+    def normalize(self, scores):
+        """
+        Ham skorları üye başına eğitim yüzdeliklerine çevirir.
+        
+        Args:
+            scores: (n_members, n_rows) ham skorlar
+            
+        Returns:
+            numpy.ndarray: (n_members, n_rows) yüzdelikler (tablo dışında [0, 1] aralığını aşabilir)
+        """
+        ranks = np.empty_like(scores)
+        for i in range(scores.shape[0]):
+            table = self.quantiles[i]
+            ranks[i] = np.interp(scores[i], table, self.levels)
+            ranks[i] += (np.minimum(scores[i] - table[0], 0) + np.maximum(scores[i] - table[-1], 0)) / self._spread[i]
+        return ranks
+    
+    def fuse(self, ranks):
+        """Üye yüzdeliklerini birleştirir (offset uygulanmadan)"""
+        if self.method == 'max':
+            return ranks.min(axis=0)
+        return self.weights @ ranks
+    
+    def decision_function(self, X):
+        """Karar fonksiyonu (negatif skor anomali)"""
+        return self.fuse(self.normalize(self.member_scores(X))) - self.offset
+    
+    def score_and_predict(self, X):
+        """Skorlar ve etiketler (eşik yoksa negatif skor anomali: 1)"""
+        scores = self.decision_function(X)
+        return scores, apply_threshold(scores, self.decision_threshold)
+    
+    def to_arrays(self):
+        """
+        Skorlama paketine yazılacak diziler ve meta veri. Üye motorların dizileri
+        '<üye>.<dizi>' adlarıyla aynı pakete yazılır.
+        
+        Returns:
+            tuple: (dizi adı -> numpy.ndarray, meta veri sözlüğü)
+        """
+        from models.registry import engine_types
+        
+        type_names = {engine_class: name for name, engine_class in engine_types().items()}
+        arrays = {'quantiles': self.quantiles, 'levels': self.levels, 'weights': self.weights}
+        members = {}
+        for member_name, engine in self.members.items():
+            if type(engine) not in type_names:
+                raise ValueError(f"'{member_name}' için desteklenmeyen skorlama motoru: {type(engine).__name__}")
+            member_arrays, member_meta = engine.to_arrays()
+            arrays.update({f"{member_name}.{array_name}": array for array_name, array in member_arrays.items()})
+            members[member_name] = {
+                'type': type_names[type(engine)],
+                'arrays': list(member_arrays),
+                'meta': member_meta
+            }
+        meta = {
+            'method': self.method,
+            'offset': self.offset,
+            'n_jobs': self.n_jobs,
+            'members': members,
+            'decision_threshold': self.decision_threshold
+        }
+        return arrays, meta
+    
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """to_arrays() çıktısından motoru ve üye motorları yeniden oluşturur"""
+        from models.registry import engine_types
+        
+        types = engine_types()
+        members = {}
+        for member_name, spec in meta['members'].items():
+            member_arrays = {array_name: arrays[f"{member_name}.{array_name}"] for array_name in spec['arrays']}
+            members[member_name] = types[spec['type']].from_arrays(member_arrays, spec['meta'])
+        return cls(members, arrays['quantiles'], arrays['levels'], arrays['weights'], meta['method'], meta['offset'],
+                   n_jobs=meta.get('n_jobs', ENSEMBLE_PARAMS['n_jobs']),
+                   decision_threshold=meta.get('decision_threshold'))
+
+
+class EnsembleModel:
+    """Eğitilmiş modellerin skorlarını birleştiren anomali tespit modeli"""
+    
+    # Üyeler iş parçacıklarında paralel skorlanır (None: sınırsız)
+    max_n_jobs = None
+    
+    def __init__(self, members, **params):
+        """
+        Skor birleştirme modelini başlatır
+        
+        Args:
+            members: Model adı -> eğitilmiş model (decision_function)
+            **params: Model parametreleri (varsayılanlar config'deki ENSEMBLE_PARAMS; 'enabled' ve
+                'models' servis düzeyindedir, modele verilmez)
+                method: 'mean' (ağırlıklı ortalama) veya 'max' (en alarm veren üye)
+                weights: Model adı -> ağırlık ('mean' için; None ise eşit)
+                n_quantiles: Üye başına yüzdelik tablosu boyutu
+                contamination: Eğitim verisinde anomali sayılacak oran (offset'i belirler)
+                sample_size: Yüzdelik tabloları için skorlanan eğitim satırı sayısı
+                n_jobs: Üyeleri skorlayan iş parçacığı sayısı (-1: tüm çekirdekler)
+        """
+        defaults = {key: value for key, value in ENSEMBLE_PARAMS.items() if key not in ('enabled', 'models')}
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise ValueError(f"Geçersiz ensemble parametreleri: {sorted(unknown)}")
+        if not members:
+            raise ValueError("Ensemble için en az bir üye model gerekli.")
+        
+        self.members = dict(members)
+        self.params = defaults
+        self.params.update(params)
+        if self.params['method'] not in FUSION_METHODS:
+            raise ValueError(f"Geçersiz birleştirme yöntemi: '{self.params['method']}'. "
+                             f"{FUSION_METHODS} içinden biri olmalı.")
+        
+        weights = self.params['weights'] or {}
+        unknown = set(weights) - set(self.members)
+        if unknown:
+            raise ValueError(f"Ağırlıkları verilen modeller ensemble'da yok: {sorted(unknown)}")
+        weights = np.array([weights.get(name, 1.0) for name in self.members], dtype=np.float64)
+        if np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError(f"Ağırlıklar negatif olmamalı ve toplamı pozitif olmalı: {weights.tolist()}")
+        self.weights = weights / weights.sum()
+        
+        self.fusion = None
+        # Çalışma noktası eşiği (ModelTrainerService.select_threshold); None ise negatif skor anomali
+        self.threshold = None
+        self.is_trained = False
+    
+    @instrument('ensemble.fit')
+    def fit(self, X):
+        """
+        Üye modeller eğitilmiş kabul edilir; yalnızca eğitim skorlarının yüzdelik tabloları
+        ve birleşik skorun sıfır noktası hesaplanır. Eğitim satırları eğitim dışı satırlar gibi
+        skorlanır (k-NN satırın indeksteki kendisini atlar); aksi halde k-NN eğitim satırlarına
+        0 uzaklık verir, tablolar iyimser kalır ve yeni normal satırlar contamination oranından
+        çok daha sık işaretlenir.
+        
+        Args:
+            X: Eğitim verisi
+        """
+        params = self.params
+        n_rows = X.shape[0]
+        rows = np.arange(n_rows)
+        if n_rows > params['sample_size']:
+            rng = np.random.RandomState(params['random_state'])
+            rows = np.sort(rng.choice(n_rows, params['sample_size'], replace=False))
+        
+        levels = np.linspace(0, 1, params['n_quantiles'])
+        scores = score_members(self.members, np.asarray(X[rows]), params['n_jobs'], training=True)
+        
+        self.fusion = ScoreFusion(self.members, np.quantile(scores, levels, axis=1).T, levels, self.weights,
+                                  params['method'], n_jobs=params['n_jobs'])
+        # Diğer modellerdeki gibi: eğitim skorlarının contamination yüzdeliği sıfır noktasıdır
+        self.fusion.offset = float(np.quantile(self.fusion.fuse(self.fusion.normalize(scores)),
+                                               params['contamination']))
+        self.is_trained = True
+    
+    @instrument('ensemble.predict')
+    def predict(self, X):
+        """
+        Anomali tahminleri yapar
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            numpy.ndarray: Tahmin edilen etiketler (1: anomali, 0: normal)
+        """
+        _, predictions = self.score_and_predict(X)
+        return predictions
+    
+    @instrument('ensemble.decision_function')
+    def decision_function(self, X):
+        """
+        Anomali skorlarını döner
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            numpy.ndarray: Anomali skorları
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        
+        return self.fusion.decision_function(X)
+    
+    @instrument('ensemble.score_and_predict')
+    def score_and_predict(self, X):
+        """
+        Anomali skorlarını ve etiketlerini tek bir çıkarımla hesaplar.
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            tuple: (scores, predictions) - Anomali skorları ve etiketler (1: anomali, 0: normal)
+        """
+        scores = self.decision_function(X)
+        predictions = apply_threshold(scores, self.threshold)
+        return scores, predictions
+    
+    def export_scoring_engine(self):
+        """
+        Modelin sklearn gerektirmeyen skorlama motorunu döner (skorlama paketi için).
+        Üyeler kendi skorlama motorlarıyla birlikte yazılır.
+        
+        Returns:
+            ScoreFusion: Birleştirme motoru
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        
+        members = {name: model.export_scoring_engine() for name, model in self.members.items()}
+        return ScoreFusion(members, self.fusion.quantiles, self.fusion.levels, self.weights, self.params['method'],
+                           self.fusion.offset, n_jobs=self.params['n_jobs'])
+    
+    def set_n_jobs(self, n_jobs):
+        """
+        Üyeleri skorlayan iş parçacığı sayısını ayarlar
+        
+        Args:
+            n_jobs: Çekirdek sayısı (-1: tüm çekirdekler)
+        """
+        self.params['n_jobs'] = n_jobs
+        if self.fusion is not None:
+            self.fusion.set_n_jobs(n_jobs)
+    
+    def get_params(self):
+        """Model parametrelerini döner"""
+        params = dict(self.params)
+        params['members'] = list(self.members)
+        return params
@@ -0,0 +1,227 @@
+"""
+HBOS (Histogram-based Outlier Score) Model sınıfı
+"""
+import numpy as np
+
+from config.config import HBOS_PARAMS
+from utils.evaluation_utils import apply_threshold
+from utils.metrics_utils import instrument
+
+
+class HistogramScorer:
+    """
+    Özellik başına eşit genişlikli histogramların log yoğunluk tablosu.
+    
+    Her özellik [low, low + n_bins * width) aralığında n_bins kutuya, aralığın altı ve
+    üstü birer kuyruk kutusuna bölünür. Tablo (n_features, n_bins + 2) boyutundadır ve
+    düz dizi olarak saklanır. Bir satırın skoru, her özellik için kutu indisinin
+    aritmetikle bulunup tablodan okunmasıyla elde edilen log yoğunlukların toplamıdır:
+    satır başına n_features tablo okuması, arama veya dallanma yoktur.
+    
+    Skor kuralı diğer modellerle aynıdır: decision_function = log yoğunluk toplamı - offset,
+    düşük (negatif) skor daha anormaldir.
+    """
+    
+    def __init__(self, low, inv_width, log_density, offset=0.0, chunk_size=65536, decision_threshold=None):
+        self.low = low
+        self.inv_width = inv_width
+        self.log_density = log_density
+        self.offset = float(offset)
+        self.chunk_size = chunk_size
+        # Çalışma noktası eşiği (None: negatif skor anomali)
+        self.decision_threshold = decision_threshold
+        
+        n_features, n_slots = log_density.shape
+        self._n_bins = n_slots - 2
+        self._table = np.ascontiguousarray(log_density).ravel()
+        # Özellik f'nin kutuları düz tabloda f * n_slots'tan başlar
+        self._feature_base = np.arange(n_features, dtype=np.intp) * n_slots
+    
+    def bin_indices(self, X):
+        """
+        Satırların düz tablodaki kutu indislerini hesaplar.
+        
+        Args:
+            X: (n_rows, n_features) boyutlu veri
+            
+        Returns:
+            numpy.ndarray: (n_rows, n_features) düz tablo indisleri
+        """
+        bins = np.asarray(X, dtype=np.float64) - self.low
+        bins *= self.inv_width
+        # 0: alt kuyruk, 1..n_bins: histogram, n_bins + 1: üst kuyruk (NaN alt kuyruğa düşer)
+        np.floor(bins, out=bins)
+        bins += 1
+        np.clip(bins, 0, self._n_bins + 1, out=bins)
+        bins = np.nan_to_num(bins, copy=False).astype(np.intp)
+        bins += self._feature_base
+        return bins
+    
+    def log_densities(self, X):
+        """Satır başına log yoğunluk toplamı (yüksek değer daha normal)"""
+        scores = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], self.chunk_size):
+            bins = self.bin_indices(X[start:start + self.chunk_size])
+            scores[start:start + bins.shape[0]] = self._table[bins].sum(axis=1)
+        return scores
+    
+    def decision_function(self, X):
+        """Karar fonksiyonu (negatif skor anomali)"""
+        return self.log_densities(X) - self.offset
+    
+    def score_and_predict(self, X):
+        """Skorlar ve etiketler (eşik yoksa negatif skor anomali: 1)"""
+        scores = self.decision_function(X)
+        return scores, apply_threshold(scores, self.decision_threshold)
+    
+    def to_arrays(self):
+        """
+        Skorlama paketine yazılacak diziler ve meta veri.
+        
+        Returns:
+            tuple: (dizi adı -> numpy.ndarray, meta veri sözlüğü)
+        """
+        return ({'low': self.low, 'inv_width': self.inv_width, 'log_density': self.log_density},
+                {'offset': self.offset, 'decision_threshold': self.decision_threshold})
+    
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """to_arrays() çıktısından tabloyu yeniden oluşturur"""
+        return cls(arrays['low'], arrays['inv_width'], arrays['log_density'], meta['offset'],
+                   decision_threshold=meta.get('decision_threshold'))
+
+
+class HBOSModel:
+    """HBOS anomali tespit modeli (özellikler bağımsız varsayılır)"""
+    
+    # Skorlama tek çekirdekte vektörize tablo okumasıdır
+    max_n_jobs = 1
+    
+    def __init__(self, **params):
+        """
+        HBOS modelini başlatır
+        
+        Args:
+            **params: Model parametreleri (varsayılanlar config'deki HBOS_PARAMS)
+                n_bins: Özellik başına histogram kutusu sayısı
+                tail_quantile: Histogram aralığının dışında (kuyruk kutularında) kalan oran
+                alpha: Boş kutular için Laplace düzeltmesi
+                contamination: Eğitim verisinde anomali sayılacak oran (offset'i belirler)
+                sample_size: Histogram aralığı ve offset için kullanılan örneklem
+                chunk_size: Eğitim ve skorlama parça boyutu
+        """
+        unknown = set(params) - set(HBOS_PARAMS)
+        if unknown:
+            raise ValueError(f"Geçersiz HBOS parametreleri: {sorted(unknown)}")
+        
+        self.params = HBOS_PARAMS.copy()
+        self.params.update(params)
+        self.scorer = None
+        # Çalışma noktası eşiği (ModelTrainerService.select_threshold); None ise negatif skor anomali
+        self.threshold = None
+        self.is_trained = False
+    
+    @instrument('hbos.fit')
+    def fit(self, X):
+        """
+        Histogramları tek bir akış geçişiyle kurar. Kutu aralıkları örneklemin
+        yüzdeliklerinden belirlenir, sayımlar parça başına tek bir bincount ile toplanır.
+        Bellek eşlemeli matrislerde de parça boyutuyla sınırlı bellek kullanır.
+        
+        Args:
+            X: Eğitim verisi
+        """
+        X = X.values if hasattr(X, 'values') else X
+        params = self.params
+        n_rows, n_features = X.shape
+        n_bins = params['n_bins']
+        rng = np.random.RandomState(params['random_state'])
+        
+        sample_index = np.arange(n_rows)
+        if n_rows > params['sample_size']:
+            sample_index = np.sort(rng.choice(n_rows, params['sample_size'], replace=False))
+        sample = np.asarray(X[sample_index], dtype=np.float64)
+        
+        low = np.quantile(sample, params['tail_quantile'], axis=0)
+        high = np.quantile(sample, 1 - params['tail_quantile'], axis=0)
+        width = np.where(high > low, (high - low) / n_bins, 1.0)
+        
+        # Sayımlar için yoğunluksuz tabloyla aynı indisleme kullanılır
+        counter = HistogramScorer(low, 1.0 / width, np.zeros((n_features, n_bins + 2)))
+        counts = np.zeros(n_features * (n_bins + 2))
+        for start in range(0, n_rows, params['chunk_size']):
+            bins = counter.bin_indices(X[start:start + params['chunk_size']])
+            counts += np.bincount(bins.ravel(), minlength=counts.shape[0])
+        
+        # Kuyruk kutuları da histogram kutusu genişliğinde sayılır
+        counts = counts.reshape(n_features, n_bins + 2)
+        density = (counts + params['alpha']) / ((n_rows + params['alpha'] * (n_bins + 2)) * width[:, None])
+        
+        self.scorer = HistogramScorer(low, 1.0 / width, np.log(density), chunk_size=params['chunk_size'])
+        # sklearn modellerindeki gibi: eğitim skorlarının contamination yüzdeliği sıfır noktasıdır
+        self.scorer.offset = float(np.quantile(self.scorer.log_densities(sample), params['contamination']))
+        self.is_trained = True
+    
+    @instrument('hbos.predict')
+    def predict(self, X):
+        """
+        Anomali tahminleri yapar
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            numpy.ndarray: Tahmin edilen etiketler (1: anomali, 0: normal)
+        """
+        _, predictions = self.score_and_predict(X)
+        return predictions
+    
+    @instrument('hbos.decision_function')
+    def decision_function(self, X):
+        """
+        Anomali skorlarını döner
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            numpy.ndarray: Anomali skorları
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        
+        X = X.values if hasattr(X, 'values') else X
+        return self.scorer.decision_function(X)
+    
+    @instrument('hbos.score_and_predict')
+    def score_and_predict(self, X):
+        """
+        Anomali skorlarını ve etiketlerini tek bir çıkarımla hesaplar.
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            tuple: (scores, predictions) - Anomali skorları ve etiketler (1: anomali, 0: normal)
+        """
+        scores = self.decision_function(X)
+        predictions = apply_threshold(scores, self.threshold)
+        return scores, predictions
+    
+    def export_scoring_engine(self):
+        """
+        Modelin sklearn gerektirmeyen skorlama motorunu döner (skorlama paketi için).
+        
+        Returns:
+            HistogramScorer: Log yoğunluk tablosu
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        return self.scorer
+    
+    def set_n_jobs(self, n_jobs):
+        """Skorlama tek çekirdekte çalışır; çekirdek bütçesi kullanılmaz"""
+    
+    def get_params(self):
+        """Model parametrelerini döner"""
+        return dict(self.params)
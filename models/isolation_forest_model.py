@@ -1,23 +1,257 @@
 """
 Isolation Forest Model sınıfı
 """
-from sklearn.ensemble import IsolationForest
+import os
+
 import numpy as np
 
+from utils.evaluation_utils import apply_threshold
+from utils.metrics_utils import instrument
+
+
+def _average_path_length(n_samples):
+    """
+    n örnekli bir yaprakta başarısız BST aramasının ortalama yol uzunluğu c(n)
+    (sklearn IsolationForest ile aynı tanım)
+    """
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros_like(n_samples)
+    result[n_samples == 2] = 1.0
+    mask = n_samples > 2
+    n = n_samples[mask]
+    result[mask] = 2.0 * (np.log(n - 1.0) + np.euler_gamma) - 2.0 * (n - 1.0) / n
+    return result
+
+
+class FlatIsolationForest:
+    """
+    Eğitilmiş bir IsolationForest'ın bitişik numpy dizilerine düzleştirilmiş hali.
+    
+    Her ağaç, derinliği ormanın en derin ağacına eşit tam bir ikili ağaca yerleştirilir:
+    i. düğümün çocukları 2i+1 ve 2i+2'dir, bu yüzden çocuk dizileri tutulmaz. Erken biten
+    yaprakların yol uzunluğu alt ağaçlarının tamamına kopyalanır; böylece her satır tüm
+    ağaçlarda tam max_depth adım ilerler ve tüm batch seviye seviye, ağaç başına Python
+    döngüsü ve girdi doğrulaması olmadan skorlanır.
+    
+    Eşikler, float32 girdiyle karşılaştırma sonucunu değiştirmeyecek şekilde (eşiğe eşit
+    ya da küçük en büyük float32) saklanır; dallanma sklearn ile birebir aynıdır.
+    
+    Tek iş parçacığında satır başına maliyet sklearn'ün Cython ağaç gezintisinden biraz
+    yüksektir; kazanç küçük batch'lerdeki sabit çağrı maliyetinin kalkmasındandır. Büyük
+    batch'ler parçalara bölünüp iş parçacıklarında skorlanır (numpy indeksleme GIL'i bırakır).
+    """
+    
+    # Düz dizilerin izin verilen en büyük boyutu (düğüm başına 17 bayt)
+    max_nodes = 1 << 24
+    
+    def __init__(self, feature, threshold, missing_right, leaf_value, max_depth, n_estimators,
+                 denominator, offset, chunk_size=256, n_jobs=1, decision_threshold=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_right = missing_right
+        self.leaf_value = leaf_value
+        self.max_depth = max_depth
+        self.n_estimators = n_estimators
+        self.denominator = denominator
+        self.offset = offset
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        # Çalışma noktası eşiği (None: negatif skor anomali)
+        self.decision_threshold = decision_threshold
+        
+        tree_size = 2 ** (max_depth + 1) - 1
+        tree_base = np.arange(n_estimators, dtype=np.int64) * tree_size
+        self._tree_base = tree_base
+        # Global indeksle çocuk: 2*idx + (1 - base) + sağa_git
+        self._child_offset = 1 - tree_base
+    
+    @classmethod
+    def from_estimator(cls, estimator):
+        """
+        Eğitilmiş sklearn IsolationForest'ı düzleştirir.
+        
+        Args:
+            estimator: Eğitilmiş sklearn.ensemble.IsolationForest
+            
+        Returns:
+            FlatIsolationForest: Düzleştirilmiş orman
+        """
+        max_depth = max(int(tree.tree_.max_depth) for tree in estimator.estimators_)
+        n_estimators = len(estimator.estimators_)
+        tree_size = 2 ** (max_depth + 1) - 1
+        
+        if tree_size * n_estimators > cls.max_nodes:
+            raise ValueError(f"Orman düz diziye sığmıyor (derinlik {max_depth}, {n_estimators} ağaç). "
+                             f"max_samples değerini küçültün.")
+        
+        feature = np.zeros((n_estimators, tree_size), dtype=np.int32)
+        threshold = np.full((n_estimators, tree_size), np.inf, dtype=np.float32)
+        missing_right = np.zeros((n_estimators, tree_size), dtype=bool)
+        leaf_value = np.zeros((n_estimators, tree_size), dtype=np.float64)
+        
+        for k, (tree, tree_features) in enumerate(zip(estimator.estimators_, estimator.estimators_features_)):
+            t = tree.tree_
+            tree_features = np.asarray(tree_features)
+            missing_left = getattr(t, 'missing_go_to_left', None)
+            path_length = _average_path_length(t.n_node_samples)
+            
+            # (sklearn düğümü, tam ağaçtaki konum, derinlik)
+            stack = [(0, 0, 0)]
+            while stack:
+                node, position, depth = stack.pop()
+                if t.children_left[node] == -1:
+                    # Yaprağın değerini alt ağaçtaki tüm konumlara yay
+                    first, last = position, position
+                    while first < tree_size:
+                        leaf_value[k, first:last + 1] = depth + path_length[node]
+                        first, last = 2 * first + 1, 2 * last + 2
+                    continue
+                
+                feature[k, position] = tree_features[t.feature[node]]
+                node_threshold = np.float32(t.threshold[node])
+                if node_threshold > t.threshold[node]:
+                    node_threshold = np.nextafter(node_threshold, np.float32(-np.inf))
+                threshold[k, position] = node_threshold
+                missing_right[k, position] = missing_left is not None and not missing_left[node]
+                
+                stack.append((t.children_left[node], 2 * position + 1, depth + 1))
+                stack.append((t.children_right[node], 2 * position + 2, depth + 1))
+        
+        return cls(
+            feature=feature.ravel(),
+            threshold=threshold.ravel(),
+            missing_right=missing_right.ravel(),
+            leaf_value=leaf_value.ravel(),
+            max_depth=max_depth,
+            n_estimators=n_estimators,
+            denominator=n_estimators * float(_average_path_length([estimator.max_samples_])[0]),
+            offset=float(estimator.offset_)
+        )
+    
+    def path_lengths(self, X):
+        """
+        Her satırın tüm ağaçlardaki toplam yol uzunluğunu hesaplar.
+        
+        Args:
+            X: (n_rows, n_features) boyutlu veri
+            
+        Returns:
+            numpy.ndarray: Toplam yol uzunlukları
+        """
+        # sklearn ağaçları float32 girdiyle karşılaştırma yapar
+        X = np.asarray(X, dtype=np.float32)
+        n_features = X.shape[1]
+        depths = np.empty(X.shape[0])
+        starts = range(0, X.shape[0], self.chunk_size)
+        
+        def traverse(start):
+            X_chunk = np.ascontiguousarray(X[start:start + self.chunk_size])
+            X_flat = X_chunk.ravel()
+            row_offsets = (np.arange(X_chunk.shape[0], dtype=np.int64) * n_features)[:, None]
+            has_nan = np.isnan(X_flat).any()
+            
+            nodes = np.broadcast_to(self._tree_base, (X_chunk.shape[0], self.n_estimators)).copy()
+            for _ in range(self.max_depth):
+                values = X_flat[self.feature[nodes] + row_offsets]
+                go_right = values > self.threshold[nodes]
+                if has_nan:
+                    go_right |= np.isnan(values) & self.missing_right[nodes]
+                nodes *= 2
+                nodes += self._child_offset
+                nodes += go_right
+            # Her parça kendi dilimine yazar
+            depths[start:start + self.chunk_size] = self.leaf_value[nodes].sum(axis=1)
+        
+        n_jobs = self.n_threads()
+        if n_jobs > 1 and len(starts) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(n_jobs, len(starts))) as executor:
+                list(executor.map(traverse, starts))
+        else:
+            for start in starts:
+                traverse(start)
+        
+        return depths
+    
+    def n_threads(self):
+        """Skorlamada kullanılacak iş parçacığı sayısı (n_jobs=-1 veya None: tüm çekirdekler)"""
+        return self.n_jobs if self.n_jobs and self.n_jobs > 0 else os.cpu_count() or 1
+    
+    def score_samples(self, X):
+        """sklearn IsolationForest.score_samples ile aynı skorları döner"""
+        depths = self.path_lengths(X)
+        if self.denominator == 0:
+            return -np.ones_like(depths)
+        return -(2.0 ** (-depths / self.denominator))
+    
+    def decision_function(self, X):
+        """sklearn IsolationForest.decision_function ile aynı skorları döner"""
+        return self.score_samples(X) - self.offset
+    
+    def score_and_predict(self, X):
+        """Skorlar ve etiketler (eşik yoksa negatif skor anomali: 1)"""
+        scores = self.decision_function(X)
+        return scores, apply_threshold(scores, self.decision_threshold)
+    
+    def to_arrays(self):
+        """
+        Skorlama paketine yazılacak diziler ve meta veri.
+        
+        Returns:
+            tuple: (dizi adı -> numpy.ndarray, meta veri sözlüğü)
+        """
+        arrays = {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'missing_right': self.missing_right,
+            'leaf_value': self.leaf_value
+        }
+        meta = {
+            'max_depth': int(self.max_depth),
+            'n_estimators': int(self.n_estimators),
+            'denominator': float(self.denominator),
+            'offset': float(self.offset),
+            'n_jobs': self.n_jobs,
+            'decision_threshold': self.decision_threshold
+        }
+        return arrays, meta
+    
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """to_arrays() çıktısından ormanı yeniden oluşturur"""
+        return cls(arrays['feature'], arrays['threshold'], arrays['missing_right'], arrays['leaf_value'],
+                   meta['max_depth'], meta['n_estimators'], meta['denominator'], meta['offset'],
+                   n_jobs=meta.get('n_jobs', 1), decision_threshold=meta.get('decision_threshold'))
+
 
 class IsolationForestModel:
     """Isolation Forest anomali tespit modeli"""
     
-    def __init__(self, **params):
+    # Ağaçlar bağımsız eğitildiği için çekirdek sayısıyla ölçeklenir (None: sınırsız)
+    max_n_jobs = None
+    
+    def __init__(self, flat_engine=False, flat_max_rows=None, **params):
         """
         Isolation Forest modelini başlatır
         
         Args:
+            flat_engine: True ise eğitimden sonra orman düzleştirilir ve skorlama
+                vektörize düz dizi motoruyla yapılır
+            flat_max_rows: Tek iş parçacığıyla skorlanırken düz motorun kullanılacağı en
+                fazla batch satırı; daha büyük batch'ler sklearn ile skorlanır (None: sınırsız)
             **params: Model parametreleri
         """
+        from sklearn.ensemble import IsolationForest
+        
         self.model = IsolationForest(**params)
+        self.flat_engine = flat_engine
+        self.flat_max_rows = flat_max_rows
+        self.flat_forest = None
+        # Çalışma noktası eşiği (ModelTrainerService.select_threshold); None ise negatif skor anomali
+        self.threshold = None
         self.is_trained = False
     
+    @instrument('isolation_forest.fit')
     def fit(self, X):
         """
         Modeli eğitir
@@ -27,7 +261,14 @@ class IsolationForestModel:
         """
         self.model.fit(X)
         self.is_trained = True
+        
+        if self.flat_engine:
+            try:
+                self.export_flat_forest()
+            except ValueError as e:
+                print(f"Uyarı: Düz dizi motoru kullanılamıyor, sklearn skorlaması kullanılacak. {e}")
     
+    @instrument('isolation_forest.predict')
     def predict(self, X):
         """
         Anomali tahminleri yapar
@@ -38,13 +279,10 @@ class IsolationForestModel:
         Returns:
             numpy.ndarray: Tahmin edilen etiketler (1: anomali, 0: normal)
         """
-        if not self.is_trained:
-            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
-        
-        predictions = self.model.predict(X)
-        # Isolation Forest -1 (anomali) ve 1 (normal) döner, biz 1 (anomali) ve 0 (normal) istiyoruz
-        return np.where(predictions == -1, 1, 0)
+        _, predictions = self.score_and_predict(X)
+        return predictions
     
+    @instrument('isolation_forest.decision_function')
     def decision_function(self, X):
         """
         Anomali skorlarını döner
@@ -58,8 +296,78 @@ class IsolationForestModel:
         if not self.is_trained:
             raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
         
+        if self.flat_forest is not None and self._use_flat_forest(X):
+            return self.flat_forest.decision_function(X)
+        
         return self.model.decision_function(X)
     
+    def _use_flat_forest(self, X):
+        """
+        Düz motor küçük batch'lerde ve birden çok iş parçacığıyla her boyutta hızlıdır; tek
+        iş parçacığında büyük batch'lerde sklearn'ün sıralı ağaç gezintisi daha hızlıdır.
+        """
+        max_rows = getattr(self, 'flat_max_rows', None)
+        return max_rows is None or X.shape[0] <= max_rows or self.flat_forest.n_threads() > 1
+    
+    def export_flat_forest(self):
+        """
+        Eğitilmiş ormanı düz dizilere aktarır ve sonraki skorlamalarda kullanır.
+        
+        Returns:
+            FlatIsolationForest: Düzleştirilmiş orman
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        
+        self.flat_forest = FlatIsolationForest.from_estimator(self.model)
+        self.flat_forest.n_jobs = self.model.n_jobs
+        return self.flat_forest
+    
+    def export_scoring_engine(self):
+        """
+        Modelin sklearn gerektirmeyen skorlama motorunu döner (skorlama paketi için).
+        
+        Returns:
+            FlatIsolationForest: Düzleştirilmiş orman
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        if self.flat_forest is not None:
+            return self.flat_forest
+        engine = FlatIsolationForest.from_estimator(self.model)
+        engine.n_jobs = self.model.n_jobs
+        return engine
+    
+    @instrument('isolation_forest.score_and_predict')
+    def score_and_predict(self, X):
+        """
+        Anomali skorlarını ve etiketlerini tek bir çıkarımla hesaplar.
+        Isolation Forest negatif skorları anomali olarak etiketler, bu yüzden etiketler
+        skorlar eşiklenerek elde edilir ve model ikinci kez çalıştırılmaz. Çalışma noktası
+        eşiği seçilmişse skoru eşiğe eşit veya daha düşük satırlar anomali sayılır.
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            tuple: (scores, predictions) - Anomali skorları ve etiketler (1: anomali, 0: normal)
+        """
+        scores = self.decision_function(X)
+        # Eşik yoksa sklearn predict() ile aynı kural: negatif skor anomali (1), diğerleri normal (0)
+        predictions = apply_threshold(scores, getattr(self, 'threshold', None))
+        return scores, predictions
+    
+    def set_n_jobs(self, n_jobs):
+        """
+        Eğitim ve skorlama için kullanılacak çekirdek sayısını ayarlar
+        
+        Args:
+            n_jobs: Çekirdek sayısı
+        """
+        self.model.set_params(n_jobs=n_jobs)
+        if self.flat_forest is not None:
+            self.flat_forest.n_jobs = n_jobs
+    
     def get_params(self):
         """Model parametrelerini döner"""
         return self.model.get_params()
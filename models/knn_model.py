@@ -0,0 +1,338 @@
+"""
+k-NN uzaklık Model sınıfı
+"""
+import os
+
+import numpy as np
+
+from config.config import KNN_PARAMS
+from utils.evaluation_utils import apply_threshold
+from utils.metrics_utils import instrument
+
+
+class IVFIndex:
+    """
+    IVF (inverted file) yaklaşık en yakın komşu indeksi, yalnızca numpy.
+    
+    Eğitim satırları k-means merkezlerine (listeler) atanır ve liste sırasına göre tek bir
+    bitişik float32 matriste saklanır; list_offsets[l]:list_offsets[l + 1] aralığı l.
+    listedir. Bir sorgu yalnızca merkezi en yakın n_probe listedeki satırlarla
+    karşılaştırılır. Parça içindeki sorgular listelere göre gruplanır, her liste için
+    uzaklıklar tek bir matris çarpımıyla hesaplanır ve sorgu başına en yakın k uzaklık
+    güncellenir. n_probe = liste sayısı ile arama kesindir.
+    
+    Skor: decision_function = offset - (en yakın k komşuya ortalama uzaklık); uzak
+    (negatif skorlu) satırlar anomalidir.
+    """
+    
+    def __init__(self, centroids, vectors, list_offsets, n_neighbors, n_probe, offset=0.0, chunk_size=2048,
+                 n_jobs=1, decision_threshold=None):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.list_offsets = list_offsets
+        self.n_neighbors = int(n_neighbors)
+        self.n_probe = int(min(n_probe, centroids.shape[0]))
+        self.offset = float(offset)
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        # Çalışma noktası eşiği (None: negatif skor anomali)
+        self.decision_threshold = decision_threshold
+        self._centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+        self._vector_norms = np.einsum('ij,ij->i', vectors, vectors)
+    
+    @classmethod
+    def build(cls, X, centroids, n_neighbors, n_probe, chunk_size=2048):
+        """
+        Satırları en yakın merkeze atayıp liste sırasına dizer.
+        
+        Args:
+            X: Eğitim verisi (ölçeklenmiş normal satırlar)
+            centroids: (n_lists, n_features) k-means merkezleri
+            n_neighbors: Komşu sayısı (k)
+            n_probe: Sorgu başına taranan liste sayısı
+            chunk_size: Atama parça boyutu
+            
+        Returns:
+            IVFIndex: İndeks
+        """
+        centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        assignments = np.empty(X.shape[0], dtype=np.intp)
+        centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = np.asarray(X[start:start + chunk_size], dtype=np.float32)
+            assignments[start:start + chunk.shape[0]] = np.argmin(centroid_norms - 2 * chunk @ centroids.T, axis=1)
+        
+        order = np.argsort(assignments, kind='stable')
+        vectors = np.ascontiguousarray(np.asarray(X, dtype=np.float32)[order])
+        list_offsets = np.r_[0, np.cumsum(np.bincount(assignments, minlength=centroids.shape[0]))]
+        return cls(centroids, vectors, list_offsets.astype(np.int64), n_neighbors, n_probe, chunk_size=chunk_size)
+    
+    def _kneighbors_chunk(self, Q, n_neighbors):
+        """Parça için en yakın n_neighbors karesel uzaklık (artan sırada değil)"""
+        Q = np.asarray(Q, dtype=np.float32)
+        query_norms = np.einsum('ij,ij->i', Q, Q)
+        n_probe = self.n_probe
+        
+        centroid_distances = self._centroid_norms - 2 * Q @ self.centroids.T
+        if n_probe < self.centroids.shape[0]:
+            probes = np.argpartition(centroid_distances, n_probe - 1, axis=1)[:, :n_probe]
+        else:
+            probes = np.broadcast_to(np.arange(n_probe), (Q.shape[0], n_probe))
+        
+        # (sorgu, liste) çiftlerini listeye göre grupla
+        probes = probes.ravel()
+        order = np.argsort(probes, kind='stable')
+        sorted_lists = probes[order]
+        queries = order // n_probe
+        boundaries = np.r_[0, np.flatnonzero(np.diff(sorted_lists)) + 1, sorted_lists.shape[0]]
+        
+        best = np.full((Q.shape[0], n_neighbors), np.inf, dtype=np.float32)
+        for group_start, group_end in zip(boundaries[:-1], boundaries[1:]):
+            list_id = sorted_lists[group_start]
+            start, end = self.list_offsets[list_id], self.list_offsets[list_id + 1]
+            if start == end:
+                continue
+            rows = queries[group_start:group_end]
+            distances = Q[rows] @ self.vectors[start:end].T
+            distances *= -2
+            distances += query_norms[rows, None]
+            distances += self._vector_norms[None, start:end]
+            candidates = np.concatenate([best[rows], distances], axis=1)
+            best[rows] = np.partition(candidates, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        
+        np.maximum(best, 0, out=best)
+        return best
+    
+    def kneighbors_distance(self, X, n_neighbors=None, skip_nearest=False):
+        """
+        Satır başına en yakın k komşuya ortalama Öklid uzaklığı. Parçalar iş parçacıklarında
+        paralel sorgulanır (matris çarpımları GIL'i bırakır).
+        
+        Args:
+            X: Sorgu satırları
+            n_neighbors: Komşu sayısı (None ise indeksteki k)
+            skip_nearest: True ise en yakın komşu atlanır (indeksteki satırların kendisiyle
+                eşleşmesini dışlamak için)
+                
+        Returns:
+            numpy.ndarray: Ortalama uzaklıklar
+        """
+        n_neighbors = n_neighbors or self.n_neighbors
+        n_query = n_neighbors + 1 if skip_nearest else n_neighbors
+        starts = range(0, X.shape[0], self.chunk_size)
+        
+        def query(start):
+            best = np.sort(self._kneighbors_chunk(X[start:start + self.chunk_size], n_query), axis=1)
+            if skip_nearest:
+                best = best[:, 1:]
+            distances = np.sqrt(best, dtype=np.float64)
+            # Taranan listelerde k'dan az satır varsa yalnızca bulunan komşular kullanılır
+            found = np.isfinite(distances)
+            return np.where(found, distances, 0).sum(axis=1) / np.maximum(found.sum(axis=1), 1)
+        
+        n_jobs = self.n_jobs if self.n_jobs and self.n_jobs > 0 else os.cpu_count() or 1
+        if n_jobs > 1 and len(starts) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(n_jobs, len(starts))) as executor:
+                chunks = list(executor.map(query, starts))
+        else:
+            chunks = [query(start) for start in starts]
+        return np.concatenate(chunks) if chunks else np.empty(0)
+    
+    def decision_function(self, X):
+        """Karar fonksiyonu (negatif skor anomali)"""
+        return self.offset - self.kneighbors_distance(X)
+    
+    def score_and_predict(self, X):
+        """Skorlar ve etiketler (eşik yoksa negatif skor anomali: 1)"""
+        scores = self.decision_function(X)
+        return scores, apply_threshold(scores, self.decision_threshold)
+    
+    def to_arrays(self):
+        """
+        Skorlama paketine yazılacak diziler ve meta veri.
+        
+        Returns:
+            tuple: (dizi adı -> numpy.ndarray, meta veri sözlüğü)
+        """
+        arrays = {
+            'centroids': self.centroids,
+            'vectors': self.vectors,
+            'list_offsets': self.list_offsets
+        }
+        meta = {
+            'n_neighbors': self.n_neighbors,
+            'n_probe': self.n_probe,
+            'offset': self.offset,
+            'chunk_size': int(self.chunk_size),
+            'n_jobs': self.n_jobs,
+            'decision_threshold': self.decision_threshold
+        }
+        return arrays, meta
+    
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """to_arrays() çıktısından indeksi yeniden oluşturur (diziler bellek eşlemeli kalabilir)"""
+        return cls(arrays['centroids'], arrays['vectors'], arrays['list_offsets'], meta['n_neighbors'],
+                   meta['n_probe'], meta['offset'], chunk_size=meta['chunk_size'],
+                   n_jobs=meta.get('n_jobs', KNN_PARAMS['n_jobs']),
+                   decision_threshold=meta.get('decision_threshold'))
+
+
+class KNNModel:
+    """k-NN uzaklık anomali tespit modeli (IVF yaklaşık en yakın komşu indeksiyle)"""
+    
+    # Parçalar iş parçacıklarında paralel sorgulanır (None: sınırsız)
+    max_n_jobs = None
+    
+    def __init__(self, **params):
+        """
+        k-NN uzaklık modelini başlatır
+        
+        Args:
+            **params: Model parametreleri (varsayılanlar config'deki KNN_PARAMS)
+                n_neighbors: Komşu sayısı (k)
+                n_lists: IVF liste (k-means merkez) sayısı; None ise sqrt(satır sayısı)
+                n_probe: Sorgu başına taranan liste sayısı (n_lists ile kesin arama)
+                kmeans_sample_size: Merkezlerin fit edildiği örneklem
+                contamination: Eğitim verisinde anomali sayılacak oran (offset'i belirler)
+                offset_sample_size: Offset için sorgulanan eğitim satırı sayısı
+                chunk_size: Sorgu parça boyutu
+                n_jobs: Sorgu iş parçacığı sayısı (-1: tüm çekirdekler)
+        """
+        unknown = set(params) - set(KNN_PARAMS)
+        if unknown:
+            raise ValueError(f"Geçersiz k-NN parametreleri: {sorted(unknown)}")
+        
+        self.params = KNN_PARAMS.copy()
+        self.params.update(params)
+        self.index = None
+        # Çalışma noktası eşiği (ModelTrainerService.select_threshold); None ise negatif skor anomali
+        self.threshold = None
+        self.is_trained = False
+    
+    @instrument('knn.fit')
+    def fit(self, X):
+        """
+        İndeksi kurar: merkezler örneklem üzerinde k-means ile bulunur, tüm satırlar en yakın
+        merkezin listesine yerleştirilir.
+        
+        Args:
+            X: Eğitim verisi (sadece normal veriler)
+        """
+        from sklearn.cluster import KMeans
+        
+        # DataFrame'de X[indisler] sütun seçer; satır örneklemi için numpy dizisine çevir
+        X = X.values if hasattr(X, 'values') else X
+        params = self.params
+        rng = np.random.RandomState(params['random_state'])
+        n_rows = X.shape[0]
+        if n_rows <= params['n_neighbors']:
+            raise ValueError(f"k-NN için en az {params['n_neighbors'] + 1} eğitim satırı gerekli: {n_rows}")
+        
+        n_lists = params['n_lists'] or max(1, int(np.sqrt(n_rows)))
+        sample_size = min(n_rows, max(params['kmeans_sample_size'], n_lists))
+        sample = np.asarray(X[np.sort(rng.choice(n_rows, sample_size, replace=False))], dtype=np.float32)
+        kmeans = KMeans(n_clusters=min(n_lists, sample_size), n_init=1, max_iter=params['kmeans_max_iter'],
+                        random_state=params['random_state']).fit(sample)
+        
+        self.index = IVFIndex.build(X, kmeans.cluster_centers_, params['n_neighbors'], params['n_probe'],
+                                    params['chunk_size'])
+        self.index.n_jobs = params['n_jobs']
+        
+        # sklearn modellerindeki gibi: eğitim uzaklıklarının (1 - contamination) yüzdeliği sıfır noktasıdır
+        offset_rows = np.sort(rng.choice(n_rows, min(n_rows, params['offset_sample_size']), replace=False))
+        distances = self.index.kneighbors_distance(X[offset_rows], skip_nearest=True)
+        self.index.offset = float(np.quantile(distances, 1 - params['contamination']))
+        self.is_trained = True
+    
+    @instrument('knn.predict')
+    def predict(self, X):
+        """
+        Anomali tahminleri yapar
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            numpy.ndarray: Tahmin edilen etiketler (1: anomali, 0: normal)
+        """
+        _, predictions = self.score_and_predict(X)
+        return predictions
+    
+    @instrument('knn.decision_function')
+    def decision_function(self, X):
+        """
+        Anomali skorlarını döner
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            numpy.ndarray: Anomali skorları
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        
+        return self.index.decision_function(X.values if hasattr(X, 'values') else X)
+    
+    def training_decision_function(self, X):
+        """
+        Eğitim satırlarının skorları: her satırın indeksteki kendisi (0 uzaklık) atlanır,
+        böylece skorlar eğitim dışı satırlarla aynı ölçekte olur (offset hesabındaki gibi).
+        
+        Args:
+            X: Eğitim verisinden satırlar
+            
+        Returns:
+            numpy.ndarray: Anomali skorları
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        
+        X = X.values if hasattr(X, 'values') else X
+        return self.index.offset - self.index.kneighbors_distance(X, skip_nearest=True)
+    
+    @instrument('knn.score_and_predict')
+    def score_and_predict(self, X):
+        """
+        Anomali skorlarını ve etiketlerini tek bir çıkarımla hesaplar.
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            tuple: (scores, predictions) - Anomali skorları ve etiketler (1: anomali, 0: normal)
+        """
+        scores = self.decision_function(X)
+        predictions = apply_threshold(scores, self.threshold)
+        return scores, predictions
+    
+    def export_scoring_engine(self):
+        """
+        Modelin sklearn gerektirmeyen skorlama motorunu döner (skorlama paketi için).
+        
+        Returns:
+            IVFIndex: İndeks
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        return self.index
+    
+    def set_n_jobs(self, n_jobs):
+        """
+        Sorgu iş parçacığı sayısını ayarlar
+        
+        Args:
+            n_jobs: Çekirdek sayısı (-1: tüm çekirdekler)
+        """
+        self.params['n_jobs'] = n_jobs
+        if self.index is not None:
+            self.index.n_jobs = n_jobs
+    
+    def get_params(self):
+        """Model parametrelerini döner"""
+        params = dict(self.params)
+        if self.index is not None:
+            params['n_lists'] = self.index.centroids.shape[0]
+        return params
@@ -1,23 +1,137 @@
 """
 One-Class SVM Model sınıfı
 """
-from sklearn.svm import OneClassSVM
+import os
+
 import numpy as np
 
+from config.config import ONE_CLASS_SVM_APPROX_PARAMS, ONE_CLASS_SVM_SUBSET_PARAMS
+from utils.evaluation_utils import apply_threshold
+from utils.metrics_utils import instrument
+
+
+TRAINING_MODES = ('full', 'sample', 'coreset', 'shards')
+
+# Sıkıştırılmış skorlamada çekirdek matrisi bu kadar satırlık bloklarla hesaplanır
+_KERNEL_BLOCK_SIZE = 4096
+
+
+class KernelExpansion:
+    """
+    RBF çekirdek açılımı: f(x) = sum_j coef_j * exp(-gamma * ||x - v_j||^2) + intercept.
+    
+    Tam destek vektörleri, indirgenmiş küme, parça modellerinin ortalaması ve Nyström +
+    doğrusal SGD modeli bu biçimde ifade edilebilir. Yalnızca numpy kullandığından
+    skorlama süreçleri sklearn yüklemeden çalışır.
+    """
+    
+    def __init__(self, vectors, coef, intercept, gamma, decision_threshold=None):
+        self.vectors = vectors
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.gamma = float(gamma)
+        # Çalışma noktası eşiği (None: negatif skor anomali)
+        self.decision_threshold = decision_threshold
+        self._vector_norms = np.einsum('ij,ij->i', vectors, vectors)
+    
+    def decision_function(self, X):
+        """Karar fonksiyonu (sklearn OneClassSVM.decision_function ile aynı ölçek)"""
+        X = np.asarray(X, dtype=np.float64)
+        scores = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], _KERNEL_BLOCK_SIZE):
+            K = _rbf_kernel(X[start:start + _KERNEL_BLOCK_SIZE], self.vectors, self.gamma, self._vector_norms)
+            scores[start:start + _KERNEL_BLOCK_SIZE] = K @ self.coef
+        return scores + self.intercept
+    
+    def score_and_predict(self, X):
+        """Skorlar ve etiketler (eşik yoksa negatif skor anomali: 1)"""
+        scores = self.decision_function(X)
+        return scores, apply_threshold(scores, self.decision_threshold)
+    
+    def to_arrays(self):
+        """
+        Skorlama paketine yazılacak diziler ve meta veri.
+        
+        Returns:
+            tuple: (dizi adı -> numpy.ndarray, meta veri sözlüğü)
+        """
+        return ({'vectors': self.vectors, 'coef': self.coef},
+                {'intercept': self.intercept, 'gamma': self.gamma, 'decision_threshold': self.decision_threshold})
+    
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """to_arrays() çıktısından açılımı yeniden oluşturur"""
+        return cls(arrays['vectors'], arrays['coef'], meta['intercept'], meta['gamma'],
+                   decision_threshold=meta.get('decision_threshold'))
+
 
 class OneClassSVMModel:
     """One-Class SVM anomali tespit modeli"""
     
-    def __init__(self, **params):
+    # libsvm ve SGD çözücü tek çekirdekte çalışır
+    max_n_jobs = 1
+    
+    def __init__(self, backend='exact', approx_params=None, training_mode='full', subset_params=None, **params):
         """
         One-Class SVM modelini başlatır
         
         Args:
+            backend: 'exact' (sklearn OneClassSVM) veya 'approx'
+                (Nyström / random Fourier özellikleri + doğrusal SGD çözücü)
+            approx_params: backend='approx' için yaklaşım parametreleri (varsayılanlar config'deki
+                ONE_CLASS_SVM_APPROX_PARAMS)
+            training_mode: backend='exact' için eğitim verisi seçimi
+                'full': tüm normal veriler
+                'sample': uzaklık katmanlarına göre tabakalı rastgele örneklem
+                'coreset': ağırlıklı k-means coreset'i (önem örneklemesi)
+                'shards': ayrık parçalarda paralel eğitilen modellerin skor ortalaması
+            subset_params: training_mode için parametreler (sample_size, n_shards, ...;
+                varsayılanlar config'deki ONE_CLASS_SVM_SUBSET_PARAMS)
             **params: Model parametreleri
         """
-        self.model = OneClassSVM(**params)
+        if backend not in ('exact', 'approx'):
+            raise ValueError(f"Geçersiz backend: '{backend}'. 'exact' veya 'approx' olmalı.")
+        
+        if training_mode not in TRAINING_MODES:
+            raise ValueError(f"Geçersiz training_mode: '{training_mode}'. {TRAINING_MODES} içinden biri olmalı.")
+        if backend == 'approx' and training_mode != 'full':
+            raise ValueError("Alt küme ile eğitim yalnızca backend='exact' için desteklenir.")
+        if backend == 'approx' and params.get('kernel', 'rbf') != 'rbf':
+            raise ValueError(f"backend='approx' yalnızca RBF çekirdeği destekler: '{params['kernel']}'")
+        
+        self.backend = backend
+        self.training_mode = training_mode
+        self.subset_params = ONE_CLASS_SVM_SUBSET_PARAMS.copy()
+        self.subset_params.update(subset_params or {})
+        self.params = params
         self.is_trained = False
+        self.compressed = None
+        self.shard_models = None
+        # Eğitim verisinden çözülmüş RBF gamma değeri ('scale'/'auto' sayıya çevrilir)
+        self.gamma_ = None
+        # Çalışma noktası eşiği (ModelTrainerService.select_threshold); None ise negatif skor anomali
+        self.threshold = None
+        self.n_jobs = 1
+        
+        # Parçalar ayrı süreçlerde eğitildiğinden çekirdek bütçesi kullanılabilir
+        if training_mode == 'shards':
+            self.max_n_jobs = None
+        
+        if backend == 'exact':
+            from sklearn.svm import OneClassSVM
+            self.model = OneClassSVM(**params)
+        else:
+            from sklearn.linear_model import SGDOneClassSVM
+            self.approx_params = ONE_CLASS_SVM_APPROX_PARAMS.copy()
+            self.approx_params.update(approx_params or {})
+            self.feature_map = None
+            self.model = SGDOneClassSVM(
+                nu=params.get('nu', 0.5),
+                tol=self.approx_params['tol'],
+                random_state=self.approx_params['random_state']
+            )
     
+    @instrument('one_class_svm.fit')
     def fit(self, X):
         """
         Modeli eğitir (sadece normal verilerle)
@@ -25,9 +139,89 @@ class OneClassSVMModel:
         Args:
             X: Eğitim verisi (sadece normal veriler)
         """
-        self.model.fit(X)
+        if self.backend == 'approx':
+            self._fit_approx(np.asarray(X))
+        elif self.training_mode == 'full':
+            self.gamma_ = _resolve_gamma(self.model.gamma, X)
+            self.model.fit(X)
+        else:
+            self._fit_subset(np.asarray(X))
         self.is_trained = True
+        self.compressed = None
+    
+    def _fit_subset(self, X):
+        """
+        Çekirdek SVM'in yaklaşık karesel eğitim maliyetini alt küme üzerinde eğiterek düşürür.
+        """
+        params = self.subset_params
+        rng = np.random.RandomState(params['random_state'])
+        sample_size = min(params['sample_size'], X.shape[0])
+        
+        if self.training_mode == 'sample':
+            sample = X[_stratified_sample(X, sample_size, params['n_strata'], rng)]
+            self.gamma_ = _resolve_gamma(self.model.gamma, sample)
+            self.model.fit(sample)
+        
+        elif self.training_mode == 'coreset':
+            indices, weights = _kmeans_coreset(X, sample_size, rng)
+            self.gamma_ = _resolve_gamma(self.model.gamma, X[indices])
+            self.model.fit(X[indices], sample_weight=weights)
+        
+        else:
+            n_shards = max(1, min(params['n_shards'], X.shape[0]))
+            order = rng.permutation(X.shape[0])
+            shards = [X[np.sort(order[i::n_shards])] for i in range(n_shards)]
+            n_workers = min(self.n_jobs, n_shards)
+            
+            # gamma tüm veriden çözülür; parçalar aynı çekirdeği paylaşır ve
+            # ortalama skor tek bir çekirdek açılımı olarak dışa aktarılabilir
+            self.gamma_ = _resolve_gamma(self.model.gamma, X)
+            shard_params = dict(self.params, gamma=self.gamma_)
+            
+            if n_workers > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    self.shard_models = list(executor.map(_fit_shard, [shard_params] * n_shards, shards))
+            else:
+                self.shard_models = [_fit_shard(shard_params, shard) for shard in shards]
+            # Tek model gerektiren öznitelikler (support_vectors_ vb.) için ilk parça
+            self.model = self.shard_models[0]
     
+    def _fit_approx(self, X):
+        """
+        Çekirdek haritasını örneklem üzerinde kurar, SGD çözücüyü mini-batch'lerle eğitir.
+        Bellek kullanımı batch boyutuyla sınırlıdır, süre satır sayısıyla doğrusal artar.
+        """
+        from sklearn.kernel_approximation import Nystroem, RBFSampler
+        
+        params = self.approx_params
+        rng = np.random.RandomState(params['random_state'])
+        
+        gamma = self.gamma_ = _resolve_gamma(params['gamma'], X)
+        
+        if params['method'] == 'nystroem':
+            self.feature_map = Nystroem(kernel='rbf', gamma=gamma,
+                                        n_components=min(params['n_components'], X.shape[0]),
+                                        random_state=params['random_state'])
+            # Nyström yalnızca n_components kadar satır kullanır
+            sample_size = min(X.shape[0], params['n_components'] * 10)
+            sample = X[rng.choice(X.shape[0], sample_size, replace=False)]
+            self.feature_map.fit(sample)
+        elif params['method'] == 'rff':
+            self.feature_map = RBFSampler(gamma=gamma, n_components=params['n_components'],
+                                          random_state=params['random_state'])
+            self.feature_map.fit(X[:1])
+        else:
+            raise ValueError(f"Geçersiz yaklaşım yöntemi: '{params['method']}'. 'nystroem' veya 'rff' olmalı.")
+        
+        batch_size = params['batch_size']
+        for _ in range(params['n_epochs']):
+            order = rng.permutation(X.shape[0])
+            for start in range(0, X.shape[0], batch_size):
+                batch = X[np.sort(order[start:start + batch_size])]
+                self.model.partial_fit(self.feature_map.transform(batch))
+    
+    @instrument('one_class_svm.predict')
     def predict(self, X):
         """
         Anomali tahminleri yapar
@@ -38,13 +232,10 @@ class OneClassSVMModel:
         Returns:
             numpy.ndarray: Tahmin edilen etiketler (1: anomali, 0: normal)
         """
-        if not self.is_trained:
-            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
-        
-        predictions = self.model.predict(X)
-        # One-Class SVM -1 (anomali) ve 1 (normal) döner, biz 1 (anomali) ve 0 (normal) istiyoruz
-        return np.where(predictions == -1, 1, 0)
+        _, predictions = self.score_and_predict(X)
+        return predictions
     
+    @instrument('one_class_svm.decision_function')
     def decision_function(self, X):
         """
         Anomali skorlarını döner
@@ -58,8 +249,267 @@ class OneClassSVMModel:
         if not self.is_trained:
             raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
         
+        # Sıkıştırmadan önce kaydedilmiş modellerde bu öznitelik yoktur
+        if getattr(self, 'compressed', None) is not None:
+            return self.compressed.decision_function(X)
+        
+        if getattr(self, 'shard_models', None) is not None:
+            # Parça modellerinin karar fonksiyonlarının ortalaması
+            scores = np.zeros(X.shape[0])
+            for shard_model in self.shard_models:
+                scores += shard_model.decision_function(X)
+            return scores / len(self.shard_models)
+        
+        if self.backend == 'approx':
+            # Özellik haritası batch'ler halinde uygulanır, bellek sınırlı kalır
+            X = np.asarray(X)
+            batch_size = self.approx_params['batch_size']
+            scores = np.empty(X.shape[0])
+            for start in range(0, X.shape[0], batch_size):
+                batch = self.feature_map.transform(X[start:start + batch_size])
+                scores[start:start + batch_size] = self.model.decision_function(batch)
+            return scores
+        
         return self.model.decision_function(X)
     
+    @instrument('one_class_svm.compress', rows=None)
+    def compress(self, n_vectors, max_iter=100, ridge=1e-8, random_state=42):
+        """
+        Destek vektörü açılımını daha küçük bir indirgenmiş kümeyle (reduced set) değiştirir.
+        
+        Destek vektörleri dual katsayılarıyla ağırlıklı k-means ile n_vectors merkeze
+        kümelenir. Yeni katsayılar, çekirdek uzayındaki ağırlık vektörüne en yakın açılımı
+        veren K_zz beta = K_zx alpha sisteminin çözümüdür. RBF çekirdeğinde ||phi(x)|| = 1
+        olduğundan herhangi bir x için skor hatası |f(x) - f'(x)| <= ||w - w'|| ile sınırlıdır;
+        bu sınır 'error_bound' olarak döner.
+        
+        Args:
+            n_vectors: İndirgenmiş kümedeki vektör sayısı
+            max_iter: k-means iterasyon sayısı
+            ridge: K_zz çözümünde sayısal kararlılık için eklenen köşegen terim
+            random_state: k-means rastgelelik tohumu
+            
+        Returns:
+            dict: n_support, n_vectors, compression_ratio, error_bound
+        """
+        from sklearn.cluster import KMeans
+        
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        if self.backend != 'exact' or self.model.kernel != 'rbf':
+            raise ValueError("Sıkıştırma yalnızca RBF çekirdekli backend='exact' model için desteklenir.")
+        if self.shard_models is not None:
+            raise ValueError("Sıkıştırma training_mode='shards' ile eğitilmiş model için desteklenmez.")
+        
+        support_vectors = self.model.support_vectors_
+        alpha = self.model.dual_coef_[0]
+        gamma = self.gamma_
+        n_support = support_vectors.shape[0]
+        if n_vectors <= 0:
+            raise ValueError(f"n_vectors pozitif olmalı: {n_vectors}")
+        
+        if n_vectors >= n_support:
+            centers = support_vectors
+            beta = alpha
+        else:
+            kmeans = KMeans(n_clusters=n_vectors, n_init=1, max_iter=max_iter, random_state=random_state)
+            kmeans.fit(support_vectors, sample_weight=alpha)
+            centers = kmeans.cluster_centers_
+            
+            K_zz = _rbf_kernel(centers, centers, gamma)
+            K_zx_alpha = _kernel_dot(centers, support_vectors, alpha, gamma)
+            K_zz[np.diag_indices_from(K_zz)] += ridge
+            beta = np.linalg.solve(K_zz, K_zx_alpha)
+        
+        # ||w - w'||^2 = a'K_xx a - 2 b'K_zx a + b'K_zz b
+        w_norm_sq = alpha @ _kernel_dot(support_vectors, support_vectors, alpha, gamma)
+        cross = beta @ _kernel_dot(centers, support_vectors, alpha, gamma)
+        reduced_norm_sq = beta @ _kernel_dot(centers, centers, beta, gamma)
+        error_bound = float(np.sqrt(max(w_norm_sq - 2 * cross + reduced_norm_sq, 0.0)))
+        
+        self.compressed = KernelExpansion(np.ascontiguousarray(centers, dtype=np.float64),
+                                          np.asarray(beta, dtype=np.float64),
+                                          self.model.intercept_[0], gamma)
+        
+        return {
+            'n_support': n_support,
+            'n_vectors': centers.shape[0],
+            'compression_ratio': n_support / centers.shape[0],
+            'error_bound': error_bound
+        }
+    
+    def decompress(self):
+        """İndirgenmiş kümeyi bırakır, skorlama tekrar tüm destek vektörleriyle yapılır"""
+        self.compressed = None
+    
+    def export_scoring_engine(self):
+        """
+        Modeli sklearn gerektirmeyen bir çekirdek açılımına çevirir (skorlama paketi için).
+        Sıkıştırılmış model indirgenmiş kümeyi, parça modelleri birleştirilmiş açılımı,
+        Nyström + SGD modeli ise K(x, bileşenler) üzerinden eşdeğer açılımı kullanır.
+        
+        Returns:
+            KernelExpansion: Skorları modelle aynı olan açılım
+        """
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş. Önce fit() metodunu çağırın.")
+        if getattr(self, 'compressed', None) is not None:
+            return self.compressed
+        
+        if self.backend == 'approx':
+            if self.approx_params['method'] != 'nystroem':
+                raise ValueError("'rff' yaklaşımı çekirdek açılımı olarak dışa aktarılamaz.")
+            # w . phi(x) - offset, phi(x) = K(x, C) @ normalization.T
+            feature_map = self.feature_map
+            return KernelExpansion(np.ascontiguousarray(feature_map.components_, dtype=np.float64),
+                                   feature_map.normalization_.T @ self.model.coef_,
+                                   -float(np.ravel(self.model.offset_)[0]), feature_map.gamma)
+        
+        models = self.shard_models if getattr(self, 'shard_models', None) is not None else [self.model]
+        if any(model.kernel != 'rbf' for model in models):
+            raise ValueError("Yalnızca RBF çekirdekli model çekirdek açılımı olarak dışa aktarılabilir.")
+        # Parça skorlarının ortalaması, katsayıları parça sayısına bölünmüş birleşik açılımdır
+        return KernelExpansion(
+            np.ascontiguousarray(np.vstack([model.support_vectors_ for model in models]), dtype=np.float64),
+            np.concatenate([model.dual_coef_[0] for model in models]) / len(models),
+            np.mean([model.intercept_[0] for model in models]),
+            self.gamma_
+        )
+    
+    @instrument('one_class_svm.score_and_predict')
+    def score_and_predict(self, X):
+        """
+        Anomali skorlarını ve etiketlerini tek bir çıkarımla hesaplar.
+        sklearn'ün predict() metodu da karar fonksiyonunun işaretine baktığından
+        çekirdek değerlendirmesi yalnızca bir kez yapılır. Çalışma noktası eşiği seçilmişse
+        skoru eşiğe eşit veya daha düşük satırlar anomali sayılır.
+        
+        Args:
+            X: Test verisi
+            
+        Returns:
+            tuple: (scores, predictions) - Anomali skorları ve etiketler (1: anomali, 0: normal)
+        """
+        scores = self.decision_function(X)
+        # Eşik yoksa karar sınırının dışı (negatif skor) anomali: 1, içi normal: 0
+        predictions = apply_threshold(scores, getattr(self, 'threshold', None))
+        return scores, predictions
+    
+    def set_n_jobs(self, n_jobs):
+        """
+        Çekirdek bütçesini ayarlar. Tek bir One-Class SVM tek çekirdekte eğitilir; bütçe
+        yalnızca training_mode='shards' iken parçaları paralel eğitmek için kullanılır.
+        
+        Args:
+            n_jobs: Çekirdek sayısı (-1: tüm çekirdekler)
+        """
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        self.n_jobs = max(1, n_jobs)
+    
     def get_params(self):
         """Model parametrelerini döner"""
-        return self.model.get_params()
+        params = self.model.get_params()
+        if getattr(self, 'compressed', None) is not None:
+            params['reduced_set_size'] = self.compressed.vectors.shape[0]
+        if self.training_mode != 'full':
+            params['training_mode'] = self.training_mode
+            params.update({f'subset_{key}': value for key, value in self.subset_params.items()})
+        if self.backend == 'approx':
+            params.update({f'approx_{key}': value for key, value in self.approx_params.items()})
+        return params
+
+
+def _fit_shard(params, X):
+    """Tek bir veri parçasında One-Class SVM eğitir (süreç havuzu için modül seviyesinde)"""
+    from sklearn.svm import OneClassSVM
+    return OneClassSVM(**params).fit(X)
+
+
+def _resolve_gamma(gamma, X):
+    """
+    RBF gamma değerini sklearn OneClassSVM ile aynı tanımla çözer: 'scale'
+    1 / (n_features * X.var()), 'auto' 1 / n_features.
+    
+    Args:
+        gamma: 'scale', 'auto' veya sayı
+        X: Modelin eğitildiği veri
+        
+    Returns:
+        float: gamma
+    """
+    if gamma == 'scale':
+        # sklearn veriyi float64'e çevirip varyansı hesaplar
+        variance = np.asarray(X).var(dtype=np.float64)
+        return 1.0 / (X.shape[1] * variance) if variance != 0 else 1.0
+    if gamma == 'auto':
+        return 1.0 / X.shape[1]
+    return float(gamma)
+
+
+def _stratified_sample(X, sample_size, n_strata, rng):
+    """
+    Satırları merkeze uzaklıklarının yüzdeliklerine göre katmanlara ayırır ve her
+    katmandan boyutuyla orantılı örnek seçer; seyrek uç bölgeler örneklemde korunur.
+    
+    Returns:
+        numpy.ndarray: Seçilen satır indisleri (sıralı)
+    """
+    if sample_size <= 0:
+        raise ValueError(f"Örneklem boyutu pozitif olmalı: {sample_size}")
+    
+    distances = ((X - X.mean(axis=0)) ** 2).sum(axis=1)
+    edges = np.quantile(distances, np.linspace(0, 1, n_strata + 1)[1:-1])
+    strata = np.searchsorted(edges, distances, side='right')
+    
+    indices = []
+    for stratum in range(n_strata):
+        members = np.flatnonzero(strata == stratum)
+        take = int(round(sample_size * len(members) / X.shape[0]))
+        if take > 0:
+            indices.append(rng.choice(members, min(take, len(members)), replace=False))
+    # Örneklem katman sayısına göre çok küçükse tüm katmanlar sıfıra yuvarlanabilir
+    if not indices:
+        return np.sort(rng.choice(X.shape[0], sample_size, replace=False))
+    return np.sort(np.concatenate(indices))
+
+
+def _kmeans_coreset(X, coreset_size, rng):
+    """
+    Hafif k-means coreset'i (önem örneklemesi): satırlar yarı düzgün, yarı merkeze
+    uzaklığın karesiyle orantılı olasılıkla seçilir ve 1/(m q) ile ağırlıklandırılır.
+    Ağırlıklar ortalaması 1 olacak şekilde ölçeklenir, böylece nu yorumu korunur.
+    
+    Returns:
+        tuple: (satır indisleri, örnek ağırlıkları)
+    """
+    distances = ((X - X.mean(axis=0)) ** 2).sum(axis=1)
+    total = distances.sum()
+    probabilities = 0.5 / X.shape[0] + (0.5 * distances / total if total > 0 else 0.5 / X.shape[0])
+    
+    indices = np.sort(rng.choice(X.shape[0], coreset_size, replace=False, p=probabilities))
+    weights = 1.0 / probabilities[indices]
+    return indices, weights * (len(weights) / weights.sum())
+
+
+def _kernel_dot(A, B, coef, gamma):
+    """K(A, B) @ coef çarpımını tam çekirdek matrisini bellekte tutmadan bloklar halinde hesaplar"""
+    # Blok başına en fazla ~4M çekirdek değeri (32 MB)
+    block_size = max(1, (1 << 22) // max(B.shape[0], 1))
+    result = np.empty(A.shape[0])
+    for start in range(0, A.shape[0], block_size):
+        result[start:start + block_size] = _rbf_kernel(A[start:start + block_size], B, gamma) @ coef
+    return result
+
+
+def _rbf_kernel(A, B, gamma, B_norms=None):
+    """exp(-gamma * ||a - b||^2) matrisini numpy ile hesaplar (sklearn rbf_kernel ile aynı)"""
+    if B_norms is None:
+        B_norms = np.einsum('ij,ij->i', B, B)
+    K = A @ B.T
+    K *= -2
+    K += np.einsum('ij,ij->i', A, A)[:, None]
+    K += B_norms[None, :]
+    np.maximum(K, 0, out=K)
+    K *= -gamma
+    return np.exp(K, out=K)
@@ -0,0 +1,220 @@
+"""
+Model kayıt defteri (registry)
+
+Eğitim, değerlendirme, kalıcılık, grafikler ve benchmark modelleri adlarıyla bu kayıt
+defterinden alır. Yeni bir dedektör eklemek için `models/` altına Detector protokolüne
+uyan bir sarmalayıcı yazıp register_model() ile kaydetmek yeterlidir.
+
+Modül sklearn içe aktarmaz; fabrikalar ve skorlama motoru sınıfları ilk kullanımda
+yüklenir (score.py yalnızca motor sınıflarını yükler).
+"""
+import importlib
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+
+
+TRAINING_DATA = ('all', 'normal')
+
+
+@runtime_checkable
+class Detector(Protocol):
+    """
+    Kayıtlı modellerin ortak arayüzü. Skor kuralı: düşük skor daha anormaldir.
+    
+    max_n_jobs: Modelin kullanabileceği en fazla çekirdek (None: sınırsız)
+    threshold: Çalışma noktası eşiği (None: negatif skor anomali)
+    """
+    
+    max_n_jobs: Optional[int]
+    threshold: Optional[float]
+    
+    def fit(self, X):
+        """Modeli eğitir"""
+    
+    def decision_function(self, X):
+        """Anomali skorlarını döner"""
+    
+    def score_and_predict(self, X) -> Tuple[Any, Any]:
+        """(skorlar, etiketler) - etiketler threshold ile (1: anomali, 0: normal)"""
+    
+    def export_scoring_engine(self):
+        """sklearn gerektirmeyen skorlama motorunu döner (to_arrays / from_arrays)"""
+    
+    def set_n_jobs(self, n_jobs):
+        """Çekirdek bütçesini ayarlar"""
+    
+    def get_params(self) -> Dict[str, Any]:
+        """Model parametrelerini döner"""
+
+
+class ModelSpec:
+    """Kayıtlı bir modelin tanımı"""
+    
+    def __init__(self, name: str, factory: Callable[..., Detector], title: str = None, train_on: str = 'all',
+                 engine_types: Dict[str, str] = None):
+        """
+        Args:
+            name: Model adı (sonuç sözlükleri ve dosya adlarında kullanılır)
+            factory: Config parametreleriyle yeni bir model döner. Anahtar kelime
+                seçenekleri alabilir (n_train_rows, max_train_rows); tanımadıklarını yok sayar
+            title: Raporlarda görünen ad
+            train_on: 'all' (tüm eğitim satırları) veya 'normal' (yalnızca normal satırlar)
+            engine_types: Skorlama paketindeki motor tipi adı -> 'modül:Sınıf'
+        """
+        if train_on not in TRAINING_DATA:
+            raise ValueError(f"Geçersiz train_on: '{train_on}'. {TRAINING_DATA} içinden biri olmalı.")
+        
+        self.name = name
+        self.factory = factory
+        self.title = title or name.replace('_', ' ').title()
+        self.train_on = train_on
+        self.engine_types = engine_types or {}
+    
+    def create(self, **options) -> Detector:
+        """Yeni bir model oluşturur"""
+        return self.factory(**options)
+    
+    def training_rows(self, y_train):
+        """
+        Modelin eğitileceği satırlar.
+        
+        Args:
+            y_train: Eğitim etiketleri (numpy dizisi)
+            
+        Returns:
+            numpy.ndarray veya None: Satır maskesi (None ise tüm satırlar)
+        """
+        return y_train == 0 if self.train_on == 'normal' else None
+
+
+_REGISTRY: Dict[str, ModelSpec] = {}
+# Bir kayda bağlı olmayan skorlama motorları (ör. eğitilmiş modellerden kurulan ensemble)
+_ENGINE_TYPES: Dict[str, str] = {}
+
+
+def register_model(name: str, factory: Callable[..., Detector], title: str = None, train_on: str = 'all',
+                   engine_types: Dict[str, str] = None, replace: bool = False) -> ModelSpec:
+    """
+    Modeli kayıt defterine ekler (parametreler için bkz. ModelSpec).
+    
+    Args:
+        replace: True ise aynı adlı kayıt değiştirilir
+        
+    Returns:
+        ModelSpec: Kayıt
+    """
+    if name in _REGISTRY and not replace:
+        raise ValueError(f"Model '{name}' zaten kayıtlı.")
+    spec = ModelSpec(name, factory, title, train_on, engine_types)
+    _REGISTRY[name] = spec
+    return spec
+
+
+def unregister_model(name: str):
+    """Modeli kayıt defterinden çıkarır"""
+    _REGISTRY.pop(name, None)
+
+
+def get_model_spec(name: str) -> ModelSpec:
+    """Kayıtlı modelin tanımını döner"""
+    if name not in _REGISTRY:
+        raise ValueError(f"Model '{name}' kayıtlı değil. Kayıtlı modeller: {list(_REGISTRY)}")
+    return _REGISTRY[name]
+
+
+def registered_models() -> List[str]:
+    """Kayıtlı model adları (kayıt sırasıyla)"""
+    return list(_REGISTRY)
+
+
+def resolve_models(names: List[str] = None) -> List[ModelSpec]:
+    """
+    Model adlarını kayıtlara çevirir.
+    
+    Args:
+        names: Model adları (None ise kayıtlı tüm modeller)
+        
+    Returns:
+        list: ModelSpec listesi
+    """
+    return [get_model_spec(name) for name in (names or registered_models())]
+
+
+def model_title(name: str) -> str:
+    """Raporlarda görünen model adı (kayıtlı değilse addan türetilir)"""
+    spec = _REGISTRY.get(name)
+    return spec.title if spec is not None else name.replace('_', ' ').title()
+
+
+def register_engine_type(type_name: str, path: str):
+    """
+    Bir model kaydına bağlı olmayan skorlama motoru tipini ekler.
+    
+    Args:
+        type_name: Skorlama paketindeki motor tipi adı
+        path: 'modül:Sınıf'
+    """
+    _ENGINE_TYPES[type_name] = path
+
+
+def engine_types() -> Dict[str, type]:
+    """Skorlama paketi motor tipi adı -> sınıf (kayıtlı tüm modellerden ve motor tiplerinden)"""
+    paths = dict(_ENGINE_TYPES)
+    for spec in _REGISTRY.values():
+        paths.update(spec.engine_types)
+    types = {}
+    for type_name, path in paths.items():
+        module_name, class_name = path.split(':')
+        types[type_name] = getattr(importlib.import_module(module_name), class_name)
+    return types
+
+
+def _isolation_forest(**options):
+    """Isolation Forest (ISOLATION_FOREST_PARAMS)"""
+    from config.config import ISOLATION_FOREST_PARAMS
+    from models.isolation_forest_model import IsolationForestModel
+    
+    return IsolationForestModel(**ISOLATION_FOREST_PARAMS)
+
+
+def _one_class_svm(n_train_rows: int = None, max_train_rows: int = None, **options):
+    """One-Class SVM (ONE_CLASS_SVM_PARAMS); eğitim satırı max_train_rows'u aşarsa örneklemle eğitilir"""
+    from config.config import ONE_CLASS_SVM_PARAMS, ONE_CLASS_SVM_APPROX_PARAMS, ONE_CLASS_SVM_SUBSET_PARAMS
+    from models.one_class_svm_model import OneClassSVMModel
+    
+    params = ONE_CLASS_SVM_PARAMS.copy()
+    params.pop('compare_backends', None)
+    subset_params = ONE_CLASS_SVM_SUBSET_PARAMS.copy()
+    # Çekirdek SVM'in karesel eğitim maliyeti büyük veride örneklemle sınırlanır
+    if (max_train_rows is not None and n_train_rows is not None and n_train_rows > max_train_rows
+            and params.get('backend', 'exact') == 'exact' and params.get('training_mode', 'full') == 'full'):
+        params['training_mode'] = 'sample'
+        subset_params['sample_size'] = max_train_rows
+    return OneClassSVMModel(approx_params=ONE_CLASS_SVM_APPROX_PARAMS, subset_params=subset_params, **params)
+
+
+def _hbos(**options):
+    """HBOS (HBOS_PARAMS)"""
+    from config.config import HBOS_PARAMS
+    from models.hbos_model import HBOSModel
+    
+    return HBOSModel(**HBOS_PARAMS)
+
+
+def _knn(**options):
+    """k-NN uzaklık (KNN_PARAMS)"""
+    from config.config import KNN_PARAMS
+    from models.knn_model import KNNModel
+    
+    return KNNModel(**KNN_PARAMS)
+
+
+register_model('isolation_forest', _isolation_forest, title='Isolation Forest', train_on='all',
+               engine_types={'flat_isolation_forest': 'models.isolation_forest_model:FlatIsolationForest'})
+register_model('one_class_svm', _one_class_svm, title='One-Class SVM', train_on='normal',
+               engine_types={'kernel_expansion': 'models.one_class_svm_model:KernelExpansion'})
+register_model('hbos', _hbos, title='HBOS', train_on='normal',
+               engine_types={'histogram_scorer': 'models.hbos_model:HistogramScorer'})
+register_model('knn', _knn, title='k-NN Distance', train_on='normal',
+               engine_types={'ivf_index': 'models.knn_model:IVFIndex'})
+# Ensemble eğitilmiş üyelerden kurulur (ModelTrainerService.train_ensemble); yalnızca motoru kayıtlıdır
+register_engine_type('score_fusion', 'models.ensemble_model:ScoreFusion')
@@ -0,0 +1,144 @@
+"""
+Başsız (headless) skorlama
+Skorlama paketini (numpy dizileri) yükler ve bir işlem dosyasını parça parça skorlar.
+sklearn, scipy, matplotlib ve seaborn yüklenmez; süreç saniyeler yerine milisaniyelerde
+başlar.
+
+Kullanım:
+    python score.py data/creditcard.csv artifacts/scores.csv
+    python score.py transactions.npy scores.csv --model one_class_svm
+    python score.py --check-startup        # Soğuk başlangıç süresini bütçeyle karşılaştır
+"""
+import time
+_MODULE_START = time.perf_counter()
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from config.config import SCORING_ARTIFACT_PARAMS, STREAMING_PARAMS
+from services.streaming_scoring_service import StreamingScoringService
+from utils.scoring_artifact_utils import load_scoring_artifact
+
+
+def load_scorer(artifact_path: str = None, model_name: str = None, chunk_size: int = None):
+    """
+    Skorlama paketinden parça parça skorlama servisini oluşturur.
+    
+    Args:
+        artifact_path: Paket klasörü (None ise config'den alınır)
+        model_name: Kullanılacak model (None ise paketteki en iyi model)
+        chunk_size: Parça başına satır sayısı
+        
+    Returns:
+        tuple: (StreamingScoringService, model adı)
+    """
+    artifact = load_scoring_artifact(artifact_path or SCORING_ARTIFACT_PARAMS['path'])
+    model_name = model_name or artifact['metadata'].get('best_model') or next(iter(artifact['models']))
+    if model_name not in artifact['models']:
+        raise ValueError(f"Model '{model_name}' pakette yok. Mevcut modeller: {list(artifact['models'])}")
+    
+    scorer = StreamingScoringService(artifact['scaler'], artifact['models'][model_name],
+                                     artifact['feature_columns'], chunk_size)
+    return scorer, model_name
+
+
+def check_startup(artifact_path: str, budget_ms: float) -> int:
+    """
+    Yeni bir süreçte içe aktarma + paket yükleme süresini ölçer (-X importtime) ve bütçeyle
+    karşılaştırır. Yasaklı ağır modüllerden biri yüklenirse de başarısız sayılır.
+    
+    Args:
+        artifact_path: Paket klasörü
+        budget_ms: Süre bütçesi (milisaniye)
+        
+    Returns:
+        int: Çıkış kodu (0: bütçe içinde)
+    """
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime', os.path.abspath(__file__),
+                              '--startup-probe', '--artifact', artifact_path],
+                             capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if process.returncode != 0:
+        print(process.stderr)
+        raise RuntimeError("Başlangıç ölçümü başarısız oldu.")
+    
+    # "import time: self [us] | cumulative | imported package" satırlarından üst seviye modüller
+    top_level = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, package = line[len('import time:'):].split('|')
+        if not package.startswith('  '):
+            top_level.append((int(cumulative), package.strip()))
+    import_ms = sum(cumulative for cumulative, _ in top_level) / 1000
+    
+    probe = json.loads(process.stdout.strip().splitlines()[-1])
+    startup_ms = probe['startup_ms']
+    
+    print(f"Soğuk başlangıç: {startup_ms:.1f} ms (içe aktarma {import_ms:.1f} ms, "
+          f"paket yükleme {probe['load_ms']:.1f} ms; süreç toplamı {wall_ms:.1f} ms)")
+    print("En pahalı üst seviye içe aktarmalar:")
+    for cumulative, package in sorted(top_level, reverse=True)[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {package}")
+    
+    failed = False
+    if probe['forbidden_modules']:
+        print(f"Hata: Skorlama sürecinde ağır modüller yüklendi: {probe['forbidden_modules']}")
+        failed = True
+    if startup_ms > budget_ms:
+        print(f"Hata: Başlangıç süresi bütçeyi aşıyor ({startup_ms:.1f} ms > {budget_ms:.0f} ms)")
+        failed = True
+    if not failed:
+        print(f"Başlangıç süresi bütçe içinde ({budget_ms:.0f} ms).")
+    return 1 if failed else 0
+
+
+def _startup_probe(artifact_path: str, process_start: float):
+    """check_startup() için alt süreçte çalışır: paketi yükler ve ölçümleri JSON yazdırır"""
+    start = time.perf_counter()
+    load_scorer(artifact_path)
+    load_ms = (time.perf_counter() - start) * 1000
+    
+    forbidden = [name for name in SCORING_ARTIFACT_PARAMS['forbidden_modules'] if name in sys.modules]
+    print(json.dumps({
+        'startup_ms': (time.perf_counter() - process_start) * 1000,
+        'load_ms': load_ms,
+        'forbidden_modules': forbidden
+    }))
+
+
+def main(process_start: float):
+    """Skorlamayı komut satırı argümanlarıyla çalıştırır"""
+    parser = argparse.ArgumentParser(description="Anomali tespiti başsız skorlama")
+    parser.add_argument('input', nargs='?', help="Girdi dosyası (.csv, .npy veya sütun önbelleği klasörü)")
+    parser.add_argument('output', nargs='?', help="Çıktı CSV dosyası (row, score, prediction)")
+    parser.add_argument('--artifact', default=SCORING_ARTIFACT_PARAMS['path'], help="Skorlama paketi klasörü")
+    parser.add_argument('--model', default=None, help="Kullanılacak model (varsayılan: en iyi model)")
+    parser.add_argument('--chunk-size', type=int, default=STREAMING_PARAMS['chunk_size'])
+    parser.add_argument('--check-startup', action='store_true',
+                        help="Soğuk başlangıç süresini ölç ve bütçeyle karşılaştır")
+    parser.add_argument('--budget-ms', type=float, default=SCORING_ARTIFACT_PARAMS['startup_budget_ms'])
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.startup_probe:
+        _startup_probe(args.artifact, process_start)
+        return 0
+    if args.check_startup:
+        return check_startup(args.artifact, args.budget_ms)
+    if not args.input or not args.output:
+        parser.error("input ve output gerekli.")
+    
+    scorer, model_name = load_scorer(args.artifact, args.model, args.chunk_size)
+    print(f"Model: {model_name} (başlangıç {(time.perf_counter() - process_start) * 1000:.0f} ms)")
+    scorer.score_file(args.input, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    # Süre, yorumlayıcı açıldıktan sonraki ilk içe aktarmadan itibaren ölçülür
+    sys.exit(main(_MODULE_START))
@@ -0,0 +1,34 @@
+"""
+Çevrimiçi skorlama sunucusu
+Kaydedilmiş çıkarım paketini bir kez yükler ve işlemleri HTTP üzerinden skorlar.
+
+Kullanım:
+    python serve.py --port 8080
+    curl -X POST localhost:8080/score -d '{"transaction": {"V1": 0.1, ..., "Amount": 12.5}}'
+    curl localhost:8080/metrics
+"""
+import argparse
+
+from config.config import BUNDLE_PARAMS, SERVER_PARAMS
+from services.online_scoring_service import OnlineScoringService
+
+
+def main():
+    """Sunucuyu komut satırı argümanlarıyla başlatır"""
+    parser = argparse.ArgumentParser(description="Anomali tespiti çevrimiçi skorlama sunucusu")
+    parser.add_argument('--bundle', default=BUNDLE_PARAMS['path'], help="Çıkarım paketi dosyası")
+    parser.add_argument('--model', default=None, help="Kullanılacak model (varsayılan: en iyi model)")
+    parser.add_argument('--host', default=SERVER_PARAMS['host'])
+    parser.add_argument('--port', type=int, default=SERVER_PARAMS['port'])
+    parser.add_argument('--max-batch-size', type=int, default=SERVER_PARAMS['max_batch_size'])
+    parser.add_argument('--max-wait-us', type=float, default=SERVER_PARAMS['max_wait_us'])
+    args = parser.parse_args()
+    
+    service = OnlineScoringService.from_bundle(args.bundle, args.model,
+                                               max_batch_size=args.max_batch_size,
+                                               max_wait_us=args.max_wait_us)
+    service.serve_forever(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,29 @@
 """
 Servis sınıfları
+
+Servisler ilk erişimde içe aktarılır (PEP 562); böylece yalnızca skorlama yapan bir
+süreç eğitim, benchmark veya grafik bağımlılıklarını yüklemez.
 """
-from .data_preprocessing_service import DataPreprocessingService
-from .model_trainer_service import ModelTrainerService
+import importlib
+
+_SERVICES = {
+    'DataPreprocessingService': '.data_preprocessing_service',
+    'ModelTrainerService': '.model_trainer_service',
+    'StreamingScoringService': '.streaming_scoring_service',
+    'OnlineScoringService': '.online_scoring_service',
+    'BenchmarkService': '.benchmark_service'
+}
+
+__all__ = list(_SERVICES)
+
+
+def __getattr__(name):
+    if name not in _SERVICES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_SERVICES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['DataPreprocessingService', 'ModelTrainerService']
+def __dir__():
+    return sorted(list(globals()) + __all__)
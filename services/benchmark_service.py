@@ -0,0 +1,421 @@
+"""
+Uçtan uca performans ölçüm (benchmark) servisi
+"""
+import json
+import os
+import platform
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+
+import numpy as np
+
+from config.config import BENCHMARK_PARAMS, DATA_CACHE_PARAMS, PLOT_PARAMS
+
+
+# Benchmark sonuç dosyası biçim sürümü
+BENCHMARK_FORMAT_VERSION = 1
+
+# Ölçülen aşamalar (main.py akış sırasıyla); model başına fit_<model> ve score_<model>
+# aşamaları ölçülen modellere göre eklenir
+STAGES = ('load_cold', 'load_warm', 'preprocess', 'split', 'scale', 'fit_*', 'score_*', 'plot')
+
+
+class StageRecorder:
+    """Aşama başına duvar saati süresini, tepe RSS'i ve satır/sn değerini kaydeder"""
+    
+    def __init__(self, sample_interval: float = 0.005):
+        """
+        Args:
+            sample_interval: RSS örnekleme aralığı (saniye)
+        """
+        self.stages = {}
+        self.sample_interval = sample_interval
+    
+    def measure(self, name: str, n_rows: int):
+        """
+        Aşamayı ölçen bağlam yöneticisi döner.
+        
+        Örnek:
+            with recorder.measure('scale', len(X_train)):
+                data_service.scale_features(X_train, X_test)
+        """
+        return _StageContext(self, name, n_rows)
+    
+    def record(self, name: str, seconds: float, peak_rss: int, n_rows: int):
+        """Tamamlanan bir aşamayı kaydeder"""
+        self.stages[name] = {
+            'seconds': seconds,
+            'peak_rss_mb': _to_mb(peak_rss),
+            'rows': n_rows,
+            'rows_per_sec': n_rows / seconds if seconds > 0 else None
+        }
+
+
+class _StageContext:
+    """Aşama süresince RSS'i arka plan thread'inde örnekleyen bağlam"""
+    
+    def __init__(self, recorder: StageRecorder, name: str, n_rows: int):
+        self.recorder = recorder
+        self.name = name
+        self.n_rows = n_rows
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+    
+    def __enter__(self):
+        self.peak_rss = _current_rss()
+        self._thread.start()
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = _max_rss(self.peak_rss, _current_rss())
+        if exc_type is None:
+            self.recorder.record(self.name, seconds, self.peak_rss, self.n_rows)
+        return False
+    
+    def _sample(self):
+        while not self._stop.wait(self.recorder.sample_interval):
+            self.peak_rss = _max_rss(self.peak_rss, _current_rss())
+
+
+def _max_rss(*values):
+    """Ölçülebilen RSS değerlerinin en büyüğü (hiçbiri ölçülemediyse None)"""
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def _to_mb(value):
+    """Bayt -> MB (ölçülemeyen değer None kalır)"""
+    return value / 2 ** 20 if value is not None else None
+
+
+def _format_mb(value, width: int) -> str:
+    """MB değerini tablo sütunu olarak biçimlendirir"""
+    return f"{value:>{width}.1f}" if value is not None else f"{'-':>{width}}"
+
+
+def _current_rss():
+    """Sürecin o anki yerleşik bellek kullanımı (bayt; ölçülemiyorsa None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # /proc olmayan sistemlerde süreç ömrü boyunca görülen en yüksek değer
+        return _process_peak_rss()
+
+
+def _process_peak_rss():
+    """Sürecin ömrü boyunca ulaştığı en yüksek yerleşik bellek (bayt; ölçülemiyorsa None)"""
+    try:
+        import resource
+    except ImportError:
+        # resource yalnızca Unix'te var; Windows'ta tepe RSS raporlanmaz
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt
+    return peak if platform.system() == 'Darwin' else peak * 1024
+
+
+def run_pipeline(data_path: str, models: List[str] = None, plot: bool = True) -> Dict[str, Any]:
+    """
+    main.py akışının aşamalarını tek bir veri dosyasında çalıştırır ve ölçer.
+    Süreç havuzunda çalışabilmesi için modül seviyesinde tanımlıdır.
+    
+    Args:
+        data_path: Sentetik veya gerçek CSV dosyası
+        models: Ölçülecek modeller (None ise config'den alınır)
+        plot: Grafik aşaması ölçülsün mü
+        
+    Returns:
+        dict: Aşama ölçümleri, satır sayısı ve model başına eğitim modu
+    """
+    from services.data_preprocessing_service import DataPreprocessingService
+    from models.registry import resolve_models
+    from utils.data_cache_utils import file_fingerprint, get_cache_path
+    
+    specs = resolve_models(models or BENCHMARK_PARAMS['models'])
+    recorder = StageRecorder()
+    data_service = DataPreprocessingService()
+    
+    # Soğuk yükleme ölçümü için dosyanın önbelleğini temizle
+    cache_path = get_cache_path(data_path, DATA_CACHE_PARAMS['cache_dir'],
+                                file_fingerprint(data_path, DATA_CACHE_PARAMS['hash_mode']))
+    shutil.rmtree(cache_path, ignore_errors=True)
+    
+    with recorder.measure('load_cold', 0) as stage:
+        data = data_service.load_data(data_path, use_cache=True)
+        stage.n_rows = len(data)
+    n_rows = len(data)
+    del data
+    
+    with recorder.measure('load_warm', n_rows):
+        data = data_service.load_data(data_path, use_cache=True)
+    
+    with recorder.measure('preprocess', n_rows):
+        X, y = data_service.preprocess_data(data)
+    del data
+    
+    with recorder.measure('split', n_rows):
+        X_train, X_test, y_train, y_test = data_service.split_data(X, y)
+    del X, y
+    
+    with recorder.measure('scale', n_rows):
+        X_train, X_test = data_service.scale_features(X_train, X_test)
+    
+    X_train = np.asarray(X_train)
+    X_test = np.asarray(X_test)
+    y_train = np.asarray(y_train)
+    y_test = np.asarray(y_test)
+    
+    fitted = {}
+    training_modes = {}
+    for spec in specs:
+        rows = spec.training_rows(y_train)
+        X_fit = X_train if rows is None else X_train[rows]
+        # Karesel eğitim maliyetli modeller (tam çekirdekli SVM) büyük boyutlarda örneklemle eğitilir
+        model = spec.create(n_train_rows=len(X_fit), max_train_rows=BENCHMARK_PARAMS['svm_max_rows'])
+        with recorder.measure(f'fit_{spec.name}', len(X_fit)):
+            model.fit(X_fit)
+        fitted[spec.name] = model
+        training_modes[spec.name] = getattr(model, 'training_mode', None)
+        del X_fit
+    
+    results = {}
+    for model_name, model in fitted.items():
+        with recorder.measure(f'score_{model_name}', len(X_test)):
+            results[model_name] = model.score_and_predict(X_test)
+    
+    if plot and results:
+        with recorder.measure('plot', len(X_test)):
+            _render_plots(y_test, results, X_test)
+    
+    return {
+        'rows': n_rows,
+        'training_modes': training_modes,
+        'stages': recorder.stages,
+        'total_seconds': sum(stage['seconds'] for stage in recorder.stages.values()),
+        'process_peak_rss_mb': _to_mb(_process_peak_rss())
+    }
+
+
+def _render_plots(y_test, results, X_test):
+    """main.py'deki grafikleri pencere açmadan bellekteki PNG'lere çizer"""
+    from utils.visualization_utils import render_figure, report_data, report_figures
+    
+    # Değerlendirme (tek sıralama) report_data içinde yapılır
+    data = report_data(y_test, {model_name: {'scores': scores, 'predictions': predictions}
+                                for model_name, (scores, predictions) in results.items()}, X_test)
+    # İşçi süreç açılmaz; süre ve bellek ölçülen süreçte kalır
+    for name, _, _, _ in report_figures(data):
+        render_figure(name, ['png'], PLOT_PARAMS['dpi'], data)
+
+
+class BenchmarkService:
+    """Sentetik veri setlerinde uçtan uca akışı ölçen ve sonuçları referansla karşılaştıran servis"""
+    
+    def __init__(self, data_dir: str = None):
+        """
+        Args:
+            data_dir: Sentetik veri setlerinin tutulduğu klasör (None ise config'den alınır)
+        """
+        self.data_dir = data_dir or BENCHMARK_PARAMS['data_dir']
+    
+    def dataset_path(self, n_rows: int) -> str:
+        """
+        Verilen boyuttaki sentetik veri setinin yolunu döner, yoksa oluşturur.
+        
+        Args:
+            n_rows: Satır sayısı
+            
+        Returns:
+            str: CSV dosya yolu
+        """
+        from download_data import create_sample_dataset
+        
+        path = os.path.join(self.data_dir, f"synthetic_{n_rows}.csv")
+        if not os.path.exists(path):
+            os.makedirs(self.data_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            create_sample_dataset(tmp_path, n_samples=n_rows, random_state=BENCHMARK_PARAMS['random_state'])
+            os.replace(tmp_path, path)
+        return path
+    
+    def run(self, sizes: List[int] = None, models: List[str] = None, plot: bool = None) -> Dict[str, Any]:
+        """
+        Her boyut için akışı ayrı bir süreçte çalıştırır; böylece tepe RSS ölçümleri
+        önceki boyutlardan etkilenmez.
+        
+        Args:
+            sizes: Satır sayıları (None ise config'den alınır)
+            models: Ölçülecek modeller
+            plot: Grafik aşaması ölçülsün mü
+            
+        Returns:
+            dict: Ortam bilgisi ve boyut başına aşama ölçümleri
+        """
+        sizes = sizes or BENCHMARK_PARAMS['sizes']
+        plot = BENCHMARK_PARAMS['plot'] if plot is None else plot
+        
+        report = {
+            'format_version': BENCHMARK_FORMAT_VERSION,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'environment': _environment(),
+            'results': {}
+        }
+        
+        for n_rows in sizes:
+            data_path = self.dataset_path(n_rows)
+            print(f"\n=== Benchmark: {n_rows} satır ===")
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_pipeline, data_path, models, plot).result()
+            report['results'][str(n_rows)] = result
+            print_stage_table(result)
+        
+        return report
+    
+    def save(self, report: Dict[str, Any], filepath: str) -> str:
+        """
+        Benchmark raporunu JSON olarak kaydeder.
+        
+        Args:
+            report: run() çıktısı
+            filepath: Hedef dosya
+            
+        Returns:
+            str: Kaydedilen dosya yolu
+        """
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Benchmark sonuçları kaydedildi: {filepath}")
+        return filepath
+    
+    def load(self, filepath: str) -> Dict[str, Any]:
+        """
+        Kaydedilmiş benchmark raporunu yükler.
+        
+        Args:
+            filepath: Rapor dosyası
+            
+        Returns:
+            dict: Benchmark raporu
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"'{filepath}' dosyası bulunamadı.")
+        with open(filepath) as f:
+            report = json.load(f)
+        if report.get('format_version') != BENCHMARK_FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen benchmark biçimi: {report.get('format_version')} "
+                             f"(beklenen: {BENCHMARK_FORMAT_VERSION})")
+        return report
+    
+    def compare(self, report: Dict[str, Any], baseline: Dict[str, Any], time_tolerance: float = None,
+                memory_tolerance: float = None, min_seconds: float = None) -> List[Dict[str, Any]]:
+        """
+        Raporu referans raporla karşılaştırır. Süre veya tepe RSS'i tolerans oranından fazla
+        artan aşamalar gerileme sayılır; min_seconds'tan kısa aşamaların süresi gürültü
+        olarak değerlendirilmez.
+        
+        Args:
+            report: Güncel rapor
+            baseline: Referans rapor
+            time_tolerance: İzin verilen göreli süre artışı (örn. 0.2 = %20)
+            memory_tolerance: İzin verilen göreli tepe RSS artışı
+            min_seconds: Süre karşılaştırması için en kısa aşama süresi
+            
+        Returns:
+            list: Gerilemeler (size, stage, metric, baseline, current, ratio)
+        """
+        time_tolerance = BENCHMARK_PARAMS['time_tolerance'] if time_tolerance is None else time_tolerance
+        memory_tolerance = BENCHMARK_PARAMS['memory_tolerance'] if memory_tolerance is None else memory_tolerance
+        min_seconds = BENCHMARK_PARAMS['min_seconds'] if min_seconds is None else min_seconds
+        
+        regressions = []
+        rows = []
+        for size, result in report['results'].items():
+            baseline_result = baseline['results'].get(size)
+            if baseline_result is None:
+                continue
+            for stage, current in result['stages'].items():
+                reference = baseline_result['stages'].get(stage)
+                if reference is None:
+                    continue
+                
+                time_ratio = current['seconds'] / reference['seconds'] if reference['seconds'] > 0 else 1.0
+                # RSS ölçülemeyen sistemlerde bellek karşılaştırılmaz
+                memory_ratio = (current['peak_rss_mb'] / reference['peak_rss_mb']
+                                if current['peak_rss_mb'] is not None and reference['peak_rss_mb'] else 1.0)
+                rows.append((size, stage, reference['seconds'], current['seconds'], time_ratio, memory_ratio))
+                
+                if time_ratio > 1 + time_tolerance and max(current['seconds'], reference['seconds']) >= min_seconds:
+                    regressions.append({'size': int(size), 'stage': stage, 'metric': 'seconds',
+                                        'baseline': reference['seconds'], 'current': current['seconds'],
+                                        'ratio': time_ratio})
+                if memory_ratio > 1 + memory_tolerance:
+                    regressions.append({'size': int(size), 'stage': stage, 'metric': 'peak_rss_mb',
+                                        'baseline': reference['peak_rss_mb'], 'current': current['peak_rss_mb'],
+                                        'ratio': memory_ratio})
+        
+        print("\nReferansla karşılaştırma:")
+        print(f"{'Boyut':<10}{'Aşama':<24}{'Referans (sn)':>14}{'Güncel (sn)':>14}{'Süre':>8}{'RSS':>8}")
+        print("-" * 78)
+        for size, stage, reference_seconds, current_seconds, time_ratio, memory_ratio in rows:
+            print(f"{size:<10}{stage:<24}{reference_seconds:>14.3f}{current_seconds:>14.3f}"
+                  f"{time_ratio:>7.2f}x{memory_ratio:>7.2f}x")
+        
+        if regressions:
+            print(f"\n{len(regressions)} gerileme bulundu:")
+            for regression in regressions:
+                print(f"  {regression['size']} satır / {regression['stage']} / {regression['metric']}: "
+                      f"{regression['baseline']:.3f} -> {regression['current']:.3f} (x{regression['ratio']:.2f})")
+        else:
+            print("\nGerileme bulunmadı.")
+        
+        return regressions
+
+
+def print_stage_table(result: Dict[str, Any]):
+    """Bir boyutun aşama ölçümlerini tablo olarak yazdırır"""
+    print(f"{'Aşama':<24}{'Süre (sn)':>12}{'Tepe RSS (MB)':>16}{'Satır/sn':>14}")
+    print("-" * 66)
+    for stage in _ordered_stages(result['stages']):
+        values = result['stages'][stage]
+        rows_per_sec = f"{values['rows_per_sec']:.0f}" if values['rows_per_sec'] else '-'
+        print(f"{stage:<24}{values['seconds']:>12.3f}{_format_mb(values['peak_rss_mb'], 16)}{rows_per_sec:>14}")
+    print(f"{'toplam':<24}{result['total_seconds']:>12.3f}{_format_mb(result['process_peak_rss_mb'], 16)}")
+    training_modes = result.get('training_modes') or {'one_class_svm': result.get('svm_training_mode')}
+    for model_name, training_mode in training_modes.items():
+        if training_mode not in (None, 'full'):
+            print(f"Not: {model_name} '{training_mode}' moduyla eğitildi.")
+
+
+def _ordered_stages(stages: Dict[str, Any]) -> List[str]:
+    """Aşama adlarını STAGES sırasına dizer (fit_* ve score_* model aşamalarını kapsar)"""
+    import fnmatch
+    
+    return [stage for pattern in STAGES for stage in stages if fnmatch.fnmatchcase(stage, pattern)]
+
+
+def _environment() -> Dict[str, Any]:
+    """Sonuçların karşılaştırılabilirliği için çalışma ortamı bilgisi"""
+    import pandas as pd
+    import sklearn
+    
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
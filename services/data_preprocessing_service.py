@@ -1,10 +1,18 @@
 """
 Veri ön işleme servisi
 """
+import os
+import tempfile
+import time
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-from config.config import DATA_PATH, TRAIN_TEST_SPLIT
+from config.config import DATA_PATH, DATA_CACHE_PARAMS, COMPACT_DATA_PARAMS, TRAIN_TEST_SPLIT
+from utils.data_cache_utils import (file_fingerprint, get_cache_path, load_column_cache,
+                                    write_column_cache, build_column_cache_chunked,
+                                    columns_to_dataframe)
+from utils.metrics_utils import instrument
 
 
 class DataPreprocessingService:
@@ -13,21 +21,32 @@ class DataPreprocessingService:
     def __init__(self):
         self.scaler = StandardScaler()
         self.is_fitted = False
+        self.feature_columns = None
     
-    def load_data(self, data_path=None):
+    @instrument('preprocessing.load_data', rows='result')
+    def load_data(self, data_path=None, use_cache=None):
         """
         Veri setini yükler
         
+        Önbellek açıksa CSV ilk okumada sütun başına .npy dosyalarına dönüştürülür ve
+        sonraki çalıştırmalarda metin ayrıştırması yapılmadan bu dosyalardan okunur.
+        
         Args:
             data_path (str, optional): Veri dosyası yolu. Varsayılan olarak config'den alınır.
+            use_cache (bool, optional): İkili önbellek kullanılsın mı. Varsayılan olarak config'den alınır.
             
         Returns:
             pandas.DataFrame: Yüklenen veri seti
         """
         if data_path is None:
             data_path = DATA_PATH
+        if use_cache is None:
+            use_cache = DATA_CACHE_PARAMS['enabled']
         
         try:
+            if use_cache:
+                return self._load_data_cached(data_path)
+            
             df = pd.read_csv(data_path)
             print("Veri seti başarıyla yüklendi.")
             return df
@@ -35,6 +54,73 @@ class DataPreprocessingService:
             print(f"Hata: '{data_path}' dosyası bulunamadı. Lütfen dosya yolunu kontrol edin.")
             raise
     
+    def _load_data_cached(self, data_path):
+        """
+        Veri setini sütun önbelleğinden yükler; önbellek yoksa veya kaynak dosya
+        değişmişse CSV'yi okuyup önbelleği yeniden oluşturur.
+        
+        Args:
+            data_path (str): Veri dosyası yolu
+            
+        Returns:
+            pandas.DataFrame: Yüklenen veri seti
+        """
+        start = time.perf_counter()
+        cache_dir = DATA_CACHE_PARAMS['cache_dir']
+        fingerprint = file_fingerprint(data_path, DATA_CACHE_PARAMS['hash_mode'])
+        cache_path = get_cache_path(data_path, cache_dir, fingerprint)
+        
+        columns = load_column_cache(cache_path)
+        if columns is not None:
+            df = columns_to_dataframe(columns)
+            print(f"Veri seti önbellekten yüklendi ({(time.perf_counter() - start) * 1000:.1f} ms).")
+            return df
+        
+        df = pd.read_csv(data_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_column_cache(df, data_path, cache_dir, fingerprint)
+        except (OSError, ValueError) as e:
+            # Önbellek yazılamazsa (salt okunur disk vb.) veri yine de kullanılabilir
+            print(f"Uyarı: Veri önbelleği yazılamadı: {e}")
+        
+        print(f"Veri seti başarıyla yüklendi ve önbelleğe alındı ({time.perf_counter() - start:.2f} sn).")
+        return df
+    
+    @instrument('preprocessing.load_columns', rows=None)
+    def load_columns(self, data_path=None):
+        """
+        Veri setini DataFrame oluşturmadan, bellek eşlemeli sütunlar olarak açar.
+        Önbellek yoksa CSV parça parça okunarak oluşturulur; böylece bellekten büyük
+        dosyalar da işlenebilir.
+        
+        Args:
+            data_path (str, optional): Veri dosyası yolu. Varsayılan olarak config'den alınır.
+            
+        Returns:
+            dict: Sütun adı -> salt okunur numpy.memmap
+        """
+        if data_path is None:
+            data_path = DATA_PATH
+        
+        if not os.path.exists(data_path):
+            print(f"Hata: '{data_path}' dosyası bulunamadı. Lütfen dosya yolunu kontrol edin.")
+            raise FileNotFoundError(data_path)
+        
+        cache_dir = DATA_CACHE_PARAMS['cache_dir']
+        fingerprint = file_fingerprint(data_path, DATA_CACHE_PARAMS['hash_mode'])
+        cache_path = get_cache_path(data_path, cache_dir, fingerprint)
+        
+        columns = load_column_cache(cache_path, mmap_mode='r')
+        if columns is None:
+            os.makedirs(cache_dir, exist_ok=True)
+            build_column_cache_chunked(data_path, cache_dir, fingerprint, COMPACT_DATA_PARAMS['chunk_size'])
+            columns = load_column_cache(cache_path, mmap_mode='r')
+        
+        print("Veri seti sütunları bellek eşlemeli olarak açıldı.")
+        return columns
+    
+    @instrument('preprocessing.preprocess_data')
     def preprocess_data(self, df):
         """
         Veriyi ön işler
@@ -53,19 +139,26 @@ class DataPreprocessingService:
         if 'Time' in X.columns:
             X = X.drop('Time', axis=1)
         
+        self.feature_columns = list(X.columns)
         return X, y
     
-    def scale_features(self, X_train, X_test=None):
+    @instrument('preprocessing.scale_features')
+    def scale_features(self, X_train, X_test=None, inplace=False):
         """
         Özellikleri normalleştirir
         
         Args:
             X_train (pandas.DataFrame): Eğitim verisi
             X_test (pandas.DataFrame, optional): Test verisi
-            
+            inplace (bool): True ise numpy dizileri parça parça, yerinde dönüştürülür
+                (prepare_compact_data çıktıları için; ek kopya oluşturmaz)
+                
         Returns:
             tuple: (X_train_scaled, X_test_scaled) veya (X_train_scaled, None)
         """
+        if inplace:
+            return self._scale_features_inplace(X_train, X_test)
+        
         # Eğitim verisini fit et ve dönüştür
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_train_scaled = pd.DataFrame(X_train_scaled, columns=X_train.columns)
@@ -79,6 +172,91 @@ class DataPreprocessingService:
         
         return X_train_scaled, None
     
+    def _scale_features_inplace(self, X_train, X_test=None):
+        """
+        Scaler'ı eğitim verisi üzerinde parça parça fit eder ve her iki diziyi yerinde
+        normalleştirir. Bellek kullanımı parça boyutuyla sınırlıdır.
+        """
+        for X in (X_train, X_test):
+            if X is not None and not isinstance(X, np.ndarray):
+                raise ValueError("Yerinde ölçekleme yalnızca numpy dizileri için desteklenir.")
+        
+        chunk_size = COMPACT_DATA_PARAMS['chunk_size']
+        
+        self.scaler = StandardScaler()
+        for start in range(0, X_train.shape[0], chunk_size):
+            self.scaler.partial_fit(X_train[start:start + chunk_size])
+        self.is_fitted = True
+        
+        mean = self.scaler.mean_.astype(X_train.dtype)
+        scale = self.scaler.scale_.astype(X_train.dtype)
+        for X in (X_train, X_test):
+            if X is None:
+                continue
+            for start in range(0, X.shape[0], chunk_size):
+                chunk = X[start:start + chunk_size]
+                chunk -= mean
+                chunk /= scale
+        
+        return X_train, X_test
+    
+    @instrument('preprocessing.prepare_compact_data', rows=None)
+    def prepare_compact_data(self, data, mmap_path=None, **split_params):
+        """
+        Özellikleri tek bir bellek eşlemeli float32 matrise yazar ve veriyi eğitim/test
+        olarak ayırır. Satırlar matrise önce eğitim, sonra test sırasıyla yazıldığından
+        X_train ve X_test kopya değil, aynı matrisin dilim görünümleridir.
+        
+        Args:
+            data: pandas.DataFrame veya load_columns() çıktısı (sütun adı -> dizi)
+            mmap_path (str, optional): Matris dosyası. None ise config'den alınır;
+                o da None ise geçici dosya kullanılır
+            **split_params: train_test_split parametreleri
+            
+        Returns:
+            tuple: (X_train, X_test, y_train, y_test) - X'ler numpy.memmap görünümleri
+        """
+        if mmap_path is None:
+            mmap_path = COMPACT_DATA_PARAMS['mmap_path']
+        dtype = np.dtype(COMPACT_DATA_PARAMS['dtype'])
+        chunk_size = COMPACT_DATA_PARAMS['chunk_size']
+        
+        # 'Class' etiket, 'Time' anomali tespiti için kullanılmıyor
+        self.feature_columns = [str(column) for column in data.keys() if column not in ('Class', 'Time')]
+        y = np.asarray(data['Class'])
+        n_rows, n_features = len(y), len(self.feature_columns)
+        
+        # Satır indeksleri üzerinde bölme yap, veriyi kopyalama
+        params = TRAIN_TEST_SPLIT.copy()
+        params.update(split_params)
+        if params.get('stratify') is True:
+            params['stratify'] = y
+        train_idx, test_idx = train_test_split(np.arange(n_rows), **params)
+        # Sıralı indeksler kaynağın ardışık okunmasını sağlar
+        order = np.concatenate([np.sort(train_idx), np.sort(test_idx)])
+        n_train = len(train_idx)
+        
+        if mmap_path is None:
+            os.makedirs(DATA_CACHE_PARAMS['cache_dir'], exist_ok=True)
+            mmap_file = tempfile.TemporaryFile(dir=DATA_CACHE_PARAMS['cache_dir'])
+            X = np.memmap(mmap_file, dtype=dtype, mode='w+', shape=(n_rows, n_features))
+        else:
+            X = np.memmap(mmap_path, dtype=dtype, mode='w+', shape=(n_rows, n_features))
+        
+        sources = [np.asarray(data[column]) for column in self.feature_columns]
+        for start in range(0, n_rows, chunk_size):
+            rows = order[start:start + chunk_size]
+            for j, source in enumerate(sources):
+                X[start:start + len(rows), j] = source[rows]
+        X.flush()
+        
+        y_ordered = y[order]
+        print(f"Kompakt özellik matrisi oluşturuldu: {X.shape}, {dtype}, "
+              f"{X.nbytes / 1024 ** 2:.1f} MB")
+        
+        return X[:n_train], X[n_train:], y_ordered[:n_train], y_ordered[n_train:]
+    
+    @instrument('preprocessing.split_data')
     def split_data(self, X, y, **split_params):
         """
         Veriyi eğitim ve test setlerine ayırır
@@ -3,12 +3,39 @@ Model eğitimi ve karşılaştırma servisi
 """
 import pandas as pd
 import numpy as np
+import os
+import time
 from typing import Tuple, List, Dict, Any
 
-from models.isolation_forest_model import IsolationForestModel
 from models.one_class_svm_model import OneClassSVMModel
-from config.config import ISOLATION_FOREST_PARAMS, ONE_CLASS_SVM_PARAMS
-from utils.evaluation_utils import evaluate_model, print_model_summary
+from models.registry import model_title, registered_models, resolve_models
+from config.config import (ONE_CLASS_SVM_PARAMS, ONE_CLASS_SVM_APPROX_PARAMS, ONE_CLASS_SVM_SUBSET_PARAMS,
+                           SVM_COMPRESSION_PARAMS, TRAINING_PARAMS, BUNDLE_PARAMS, SCORING_ARTIFACT_PARAMS,
+                           THRESHOLD_PARAMS, CASCADE_PARAMS, ENSEMBLE_PARAMS)
+from utils.evaluation_utils import EvaluationResult, apply_threshold, print_model_summary, print_threshold_table
+from utils.metrics_utils import instrument
+
+
+# Çıkarım paketi biçim sürümü; paket içeriği değiştiğinde artırılır
+BUNDLE_FORMAT_VERSION = 1
+
+
+def _fit_model(model_name: str, model, X) -> Tuple[str, Any, float]:
+    """
+    Tek bir modeli eğitir ve süresini ölçer. Süreç havuzunda çalışabilmesi için
+    modül seviyesinde tanımlıdır.
+    
+    Args:
+        model_name: Model adı
+        model: Eğitilecek model nesnesi
+        X: Eğitim verisi
+        
+    Returns:
+        tuple: (model_name, eğitilmiş model, eğitim süresi)
+    """
+    start = time.perf_counter()
+    model.fit(X)
+    return model_name, model, time.perf_counter() - start
 
 
 class ModelTrainerService:
@@ -17,75 +44,496 @@ class ModelTrainerService:
     def __init__(self):
         self.models = {}
         self.results = {}
+        self.feature_columns = None
+        self.bundle_metadata = {}
+        self.projection = None
+        self.cascade = None
     
-    def train_models(self, X_train, X_test, y_train, y_test) -> Dict[str, Any]:
+    @instrument('trainer.train_models')
+    def train_models(self, X_train, X_test, y_train, y_test, parallel: bool = None,
+                     model_names: List[str] = None) -> Dict[str, Any]:
         """
-        Tüm modelleri eğitir ve değerlendirir.
+        Kayıtlı modelleri (models.registry) eğitir ve değerlendirir.
         
         Args:
             X_train: Eğitim özellikleri
             X_test: Test özellikleri
             y_train: Eğitim etiketleri
             y_test: Test etiketleri
-            
+            parallel: True ise modeller süreç havuzunda aynı anda eğitilir
+                (None ise TRAINING_PARAMS['parallel'] kullanılır)
+            model_names: Eğitilecek modeller (None ise TRAINING_PARAMS['models'], o da None
+                ise kayıtlı tüm modeller)
+                
         Returns:
             dict: Model sonuçları
         """
+        if parallel is None:
+            parallel = TRAINING_PARAMS['parallel']
+        specs = resolve_models(model_names or TRAINING_PARAMS['models'])
+        
         print("Modeller eğitiliyor...")
         
-        # Isolation Forest modeli
-        print("Isolation Forest modeli eğitiliyor...")
-        iso_model = IsolationForestModel(**ISOLATION_FOREST_PARAMS)
-        iso_model.fit(X_train)
-        y_pred_iso = iso_model.predict(X_test)
-        y_pred_iso_scores = iso_model.decision_function(X_test)
-        
-        # One-Class SVM modeli
-        print("One-Class SVM modeli eğitiliyor...")
-        svm_model = OneClassSVMModel(**ONE_CLASS_SVM_PARAMS)
-        # OCSVM normalde sadece normal verilerle eğitilir
         # DataFrame'i numpy array'e çevir
         X_train_array = X_train.values if hasattr(X_train, 'values') else X_train
         X_test_array = X_test.values if hasattr(X_test, 'values') else X_test
         y_train_array = y_train.values if hasattr(y_train, 'values') else y_train
         
-        normal_indices = y_train_array == 0
-        svm_model.fit(X_train_array[normal_indices])
-        y_pred_svm = svm_model.predict(X_test_array)
-        y_pred_svm_scores = svm_model.decision_function(X_test_array)
+        # Model adı: (model, eğitim verisi). OCSVM gibi modeller yalnızca normal verilerle eğitilir
+        training_jobs = {}
+        for spec in specs:
+            rows = spec.training_rows(y_train_array)
+            training_jobs[spec.name] = (spec.create(), X_train_array if rows is None else X_train_array[rows])
         
-        # Modelleri sakla
-        self.models = {
-            'isolation_forest': iso_model,
-            'one_class_svm': svm_model
-        }
+        # Çekirdek bütçesini modeller arasında paylaştır
+        core_budget = self._allocate_cores({name: model for name, (model, _) in training_jobs.items()},
+                                           TRAINING_PARAMS['n_jobs'], parallel)
+        for model_name, (model, _) in training_jobs.items():
+            model.set_n_jobs(core_budget[model_name])
+        
+        self.models = {}
+        if parallel:
+            print(f"Modeller paralel eğitiliyor (çekirdek dağılımı: {core_budget})...")
+            fit_times = self._fit_models_parallel(training_jobs)
+        else:
+            fit_times = {}
+            for model_name, (model, X) in training_jobs.items():
+                print(f"{model_title(model_name)} modeli eğitiliyor...")
+                _, self.models[model_name], fit_times[model_name] = _fit_model(model_name, model, X)
+        
+        for model_name, fit_time in fit_times.items():
+            print(f"{model_name} eğitim süresi: {fit_time:.2f} sn")
         
         # Model değerlendirme
         print("\nModellerin performans metrikleri hesaplanıyor...")
-        metrics_iso = evaluate_model(y_test, y_pred_iso, y_pred_iso_scores, "Isolation Forest")
-        metrics_svm = evaluate_model(y_test, y_pred_svm, y_pred_svm_scores, "One-Class SVM")
-        
-        # Sonuçları sakla
-        self.results = {
-            'isolation_forest': {
-                'model': iso_model,
-                'predictions': y_pred_iso,
-                'scores': y_pred_iso_scores,
-                'metrics': metrics_iso
-            },
-            'one_class_svm': {
-                'model': svm_model,
-                'predictions': y_pred_svm,
-                'scores': y_pred_svm_scores,
-                'metrics': metrics_svm
+        self.results = {}
+        for model_name in training_jobs:
+            model = self.models[model_name]
+            start = time.perf_counter()
+            scores, predictions = model.score_and_predict(X_test_array)
+            score_time = time.perf_counter() - start
+            # Skorlar model başına bir kez sıralanır; eğriler ve metrikler bu sonuçtan türetilir
+            evaluation = EvaluationResult(y_test, predictions, scores).print_report(model_title(model_name))
+            self.results[model_name] = {
+                'model': model,
+                'predictions': predictions,
+                'scores': scores,
+                'metrics': evaluation.metrics,
+                'evaluation': evaluation,
+                'fit_time': fit_times[model_name],
+                'score_time': score_time
             }
-        }
         
         # Özet yazdır
-        print_model_summary([metrics_iso, metrics_svm], ['Isolation Forest', 'One-Class SVM'])
+        print_model_summary([results['metrics'] for results in self.results.values()],
+                            [model_title(model_name) for model_name in self.results])
         
         return self.results
     
+    def _allocate_cores(self, models: Dict[str, Any], n_jobs: int, parallel: bool) -> Dict[str, int]:
+        """
+        Toplam çekirdek bütçesini modeller arasında paylaştırır.
+        
+        Sıralı eğitimde her model tüm bütçeyi kullanabilir. Paralel eğitimde tek çekirdekle
+        sınırlı modeller (max_n_jobs) önce kendi paylarını alır, kalan çekirdekler çok
+        çekirdekli modellere eşit dağıtılır; böylece makine aşırı yüklenmez.
+        
+        Args:
+            models: Model adı -> model nesnesi
+            n_jobs: Toplam çekirdek bütçesi (-1: tüm çekirdekler)
+            parallel: Modellerin aynı anda eğitilip eğitilmeyeceği
+            
+        Returns:
+            dict: Model adı -> çekirdek sayısı
+        """
+        total_cores = os.cpu_count() or 1
+        if n_jobs is not None and n_jobs > 0:
+            total_cores = min(n_jobs, total_cores)
+        
+        if not parallel:
+            return {name: min(total_cores, model.max_n_jobs or total_cores) for name, model in models.items()}
+        
+        budget = {}
+        for name, model in models.items():
+            if model.max_n_jobs is not None:
+                budget[name] = model.max_n_jobs
+        
+        scalable = [name for name in models if name not in budget]
+        remaining = max(total_cores - sum(budget.values()), len(scalable))
+        for i, name in enumerate(scalable):
+            # Kalan çekirdekleri eşit böl, artanı ilk modellere ver
+            budget[name] = remaining // len(scalable) + (1 if i < remaining % len(scalable) else 0)
+        
+        return budget
+    
+    def _fit_models_parallel(self, training_jobs: Dict[str, Tuple[Any, Any]]) -> Dict[str, float]:
+        """
+        Modelleri süreç havuzunda aynı anda eğitir ve self.models'e yerleştirir.
+        
+        Args:
+            training_jobs: Model adı -> (model, eğitim verisi)
+            
+        Returns:
+            dict: Model adı -> eğitim süresi (saniye)
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        fit_times = {}
+        with ProcessPoolExecutor(max_workers=len(training_jobs)) as executor:
+            futures = [executor.submit(_fit_model, name, model, X)
+                       for name, (model, X) in training_jobs.items()]
+            for future in futures:
+                model_name, model, fit_time = future.result()
+                self.models[model_name] = model
+                fit_times[model_name] = fit_time
+        
+        return fit_times
+    
+    def compare_svm_backends(self, X_train, X_test, y_train, y_test) -> pd.DataFrame:
+        """
+        Tam çekirdekli ve yaklaşık çekirdekli One-Class SVM'i aynı veride eğitip
+        eğitim süresi, skorlama süresi ve ROC AUC değerlerini yan yana raporlar.
+        
+        Args:
+            X_train: Eğitim özellikleri
+            X_test: Test özellikleri
+            y_train: Eğitim etiketleri
+            y_test: Test etiketleri
+            
+        Returns:
+            pandas.DataFrame: Backend karşılaştırma tablosu
+        """
+        X_train_array = X_train.values if hasattr(X_train, 'values') else X_train
+        X_test_array = X_test.values if hasattr(X_test, 'values') else X_test
+        y_train_array = y_train.values if hasattr(y_train, 'values') else y_train
+        X_normal = X_train_array[y_train_array == 0]
+        
+        params = ONE_CLASS_SVM_PARAMS.copy()
+        params.pop('backend', None)
+        params.pop('training_mode', None)
+        params.pop('compare_backends', None)
+        
+        rows = []
+        for backend in ('exact', 'approx'):
+            print(f"One-Class SVM ({backend}) eğitiliyor...")
+            model = OneClassSVMModel(backend=backend, approx_params=ONE_CLASS_SVM_APPROX_PARAMS, **params)
+            
+            start = time.perf_counter()
+            model.fit(X_normal)
+            fit_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            scores = model.decision_function(X_test_array)
+            score_time = time.perf_counter() - start
+            
+            rows.append({
+                'Backend': backend,
+                'Fit_Time_s': fit_time,
+                'Score_Time_s': score_time,
+                'ROC_AUC': EvaluationResult(y_test, None, scores).roc_auc
+            })
+        
+        comparison = pd.DataFrame(rows)
+        comparison['AUC_Delta'] = comparison['ROC_AUC'] - comparison['ROC_AUC'].iloc[0]
+        comparison['Fit_Speedup'] = comparison['Fit_Time_s'].iloc[0] / comparison['Fit_Time_s']
+        
+        print("\nOne-Class SVM backend karşılaştırması:")
+        print(comparison.to_string(index=False))
+        
+        return comparison
+    
+    def svm_training_tradeoff(self, X_train, X_test, y_train, y_test, sample_sizes: List[int] = None,
+                              shard_counts: List[int] = None) -> pd.DataFrame:
+        """
+        One-Class SVM'i tüm normal verilerle ve alt küme eğitim modlarıyla eğitip eğitim
+        süresi - ROC AUC dengesini raporlar. Veri setinden büyük örneklem boyutları atlanır.
+        
+        Args:
+            X_train: Eğitim özellikleri
+            X_test: Test özellikleri
+            y_train: Eğitim etiketleri
+            y_test: Test etiketleri
+            sample_sizes: 'sample' ve 'coreset' için denenecek satır sayıları (None ise config'den)
+            shard_counts: 'shards' için denenecek parça sayıları (None ise config'den)
+            
+        Returns:
+            pandas.DataFrame: Mod, boyut, eğitim süresi, ROC AUC ve tam eğitime göre farklar
+        """
+        X_train_array = X_train.values if hasattr(X_train, 'values') else X_train
+        X_test_array = X_test.values if hasattr(X_test, 'values') else X_test
+        y_train_array = y_train.values if hasattr(y_train, 'values') else y_train
+        X_normal = X_train_array[y_train_array == 0]
+        
+        sample_sizes = sample_sizes or ONE_CLASS_SVM_SUBSET_PARAMS['tradeoff_sample_sizes']
+        shard_counts = shard_counts or ONE_CLASS_SVM_SUBSET_PARAMS['tradeoff_shard_counts']
+        
+        params = ONE_CLASS_SVM_PARAMS.copy()
+        params.pop('backend', None)
+        params.pop('training_mode', None)
+        params.pop('compare_backends', None)
+        
+        # (mod, boyut, alt küme parametreleri)
+        configurations = [('full', len(X_normal), {})]
+        for size in sample_sizes:
+            if size < len(X_normal):
+                configurations.append(('sample', size, {'sample_size': size}))
+                configurations.append(('coreset', size, {'sample_size': size}))
+        for n_shards in shard_counts:
+            if n_shards <= len(X_normal):
+                configurations.append(('shards', n_shards, {'n_shards': n_shards}))
+        
+        rows = []
+        for mode, size, overrides in configurations:
+            print(f"One-Class SVM ({mode}, {size}) eğitiliyor...")
+            subset_params = dict(ONE_CLASS_SVM_SUBSET_PARAMS, **overrides)
+            model = OneClassSVMModel(training_mode=mode, subset_params=subset_params, **params)
+            model.set_n_jobs(TRAINING_PARAMS['n_jobs'])
+            
+            _, model, fit_time = _fit_model(mode, model, X_normal)
+            rows.append({
+                'Mode': mode,
+                'Size': size,
+                'Fit_Time_s': fit_time,
+                'ROC_AUC': EvaluationResult(y_test, None, model.decision_function(X_test_array)).roc_auc
+            })
+        
+        tradeoff = pd.DataFrame(rows)
+        tradeoff['AUC_Delta'] = tradeoff['ROC_AUC'] - tradeoff['ROC_AUC'].iloc[0]
+        tradeoff['Fit_Speedup'] = tradeoff['Fit_Time_s'].iloc[0] / tradeoff['Fit_Time_s']
+        
+        print("\nOne-Class SVM eğitim süresi - ROC AUC dengesi:")
+        print(tradeoff.to_string(index=False))
+        
+        return tradeoff
+    
+    def compress_svm(self, X_test, y_test, n_vectors: int = None,
+                     model_name: str = 'one_class_svm') -> Dict[str, Any]:
+        """
+        Eğitilmiş One-Class SVM'in destek vektörlerini indirgenmiş kümeyle sıkıştırır ve
+        sıkıştırmanın test setindeki etkisini raporlar. Sonuçlar sıkıştırılmış modelin
+        skorlarıyla güncellenir; kaydedilen paket de sıkıştırılmış açılımı taşır.
+        
+        Args:
+            X_test: Test özellikleri
+            y_test: Test etiketleri
+            n_vectors: İndirgenmiş küme boyutu (None ise config'den alınır)
+            model_name: Sıkıştırılacak model
+            
+        Returns:
+            dict: Sıkıştırma oranı, skorlama hızlanması, AUC değişimi ve skor hatası
+        """
+        if model_name not in self.models:
+            raise ValueError(f"Model '{model_name}' bulunamadı.")
+        
+        model = self.models[model_name]
+        n_vectors = n_vectors or SVM_COMPRESSION_PARAMS['n_vectors']
+        X_test_array = X_test.values if hasattr(X_test, 'values') else X_test
+        
+        model.decompress()
+        start = time.perf_counter()
+        original_scores = model.decision_function(X_test_array)
+        original_time = time.perf_counter() - start
+        
+        print(f"One-Class SVM destek vektörleri {n_vectors} vektöre sıkıştırılıyor...")
+        start = time.perf_counter()
+        info = model.compress(n_vectors, max_iter=SVM_COMPRESSION_PARAMS['max_iter'],
+                              random_state=SVM_COMPRESSION_PARAMS['random_state'])
+        compress_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        scores, predictions = model.score_and_predict(X_test_array)
+        compressed_time = time.perf_counter() - start
+        
+        evaluation = EvaluationResult(y_test, predictions, scores)
+        original_auc = EvaluationResult(y_test, None, original_scores).roc_auc
+        compressed_auc = evaluation.roc_auc
+        score_error = np.abs(scores - original_scores)
+        
+        report = dict(info, **{
+            'compress_time_s': compress_time,
+            'score_speedup': original_time / compressed_time if compressed_time > 0 else float('inf'),
+            'roc_auc': compressed_auc,
+            'auc_delta': compressed_auc - original_auc,
+            'max_score_error': float(score_error.max()),
+            'mean_score_error': float(score_error.mean()),
+            'prediction_agreement': float(np.mean((original_scores < 0) == (scores < 0)))
+        })
+        
+        print(f"Destek vektörü: {info['n_support']} -> {info['n_vectors']} "
+              f"(x{info['compression_ratio']:.1f} sıkıştırma, {compress_time:.2f} sn)")
+        print(f"Skorlama hızlanması: x{report['score_speedup']:.1f}")
+        print(f"ROC AUC: {original_auc:.4f} -> {compressed_auc:.4f} (değişim: {report['auc_delta']:+.4f})")
+        print(f"Skor hatası: en fazla {report['max_score_error']:.4f}, ortalama {report['mean_score_error']:.4f} "
+              f"(teorik sınır: {info['error_bound']:.4f})")
+        print(f"Tahmin uyumu: {report['prediction_agreement']:.4f}")
+        
+        if model_name in self.results:
+            self.results[model_name].update({
+                'scores': scores,
+                'predictions': predictions,
+                'metrics': evaluation.print_report(model_title(model_name) + " (sıkıştırılmış)").metrics,
+                'evaluation': evaluation,
+                'compression': report
+            })
+        
+        return report
+    
+    def train_ensemble(self, X_train, X_test, y_test, model_names: List[str] = None, method: str = None,
+                       weights: Dict[str, float] = None, model_name: str = 'ensemble') -> pd.DataFrame:
+        """
+        Eğitilmiş modellerin skorlarını birleştiren ensemble'ı kurar, değerlendirir ve
+        self.models / self.results'a ekler; sonraki adımlar (eşik seçimi, en iyi model,
+        grafikler, paketler) ensemble'ı diğer modeller gibi ele alır.
+        
+        Üye skorları eğitim skorlarından kurulan yüzdelik tablolarıyla ortak ölçeğe çekilir
+        ve ağırlıklı ortalama veya en alarm veren üye ile birleştirilir (bkz. ScoreFusion).
+        
+        Args:
+            X_train: Eğitim özellikleri (yüzdelik tabloları için)
+            X_test: Test özellikleri
+            y_test: Test etiketleri
+            model_names: Üye modeller (None ise ENSEMBLE_PARAMS['models'], o da None ise
+                eğitilmiş tüm modeller)
+            method: 'mean' veya 'max' (None ise config'den alınır)
+            weights: Model adı -> ağırlık (None ise config'den alınır)
+            model_name: Ensemble'ın sonuçlardaki adı
+        
+        Returns:
+            pandas.DataFrame: Üyelerin ve ensemble'ın ROC AUC ve ortalama kesinlik değerleri
+        """
+        from models.ensemble_model import EnsembleModel
+        
+        model_names = model_names or ENSEMBLE_PARAMS['models'] or [
+            name for name, model in self.models.items() if not isinstance(model, EnsembleModel)]
+        for name in model_names:
+            if name not in self.models:
+                raise ValueError(f"Model '{name}' bulunamadı.")
+        
+        params = {key: value for key, value in ENSEMBLE_PARAMS.items() if key not in ('enabled', 'models')}
+        if method is not None:
+            params['method'] = method
+        if weights is not None:
+            params['weights'] = weights
+        
+        X_train_array = X_train.values if hasattr(X_train, 'values') else X_train
+        X_test_array = X_test.values if hasattr(X_test, 'values') else X_test
+        
+        ensemble = EnsembleModel({name: self.models[name] for name in model_names}, **params)
+        print(f"\nEnsemble kuruluyor ({params['method']}): {', '.join(model_title(name) for name in model_names)}")
+        _, ensemble, fit_time = _fit_model(model_name, ensemble, X_train_array)
+        
+        start = time.perf_counter()
+        scores, predictions = ensemble.score_and_predict(X_test_array)
+        score_time = time.perf_counter() - start
+        evaluation = EvaluationResult(y_test, predictions, scores).print_report(model_title(model_name))
+        
+        self.models[model_name] = ensemble
+        self.results[model_name] = {
+            'model': ensemble,
+            'predictions': predictions,
+            'scores': scores,
+            'metrics': evaluation.metrics,
+            'evaluation': evaluation,
+            'fit_time': fit_time,
+            'score_time': score_time
+        }
+        
+        comparison = pd.DataFrame([{
+            'Model': model_title(name),
+            'ROC_AUC': self.results[name]['evaluation'].roc_auc,
+            'Avg_Precision': self.results[name]['evaluation'].average_precision
+        } for name in list(model_names) + [model_name] if name in self.results])
+        
+        print("\nEnsemble ve üyeler (test seti):")
+        print(comparison.to_string(index=False))
+        
+        return comparison
+    
+    def select_threshold(self, model_name: str, alert_budget_per_10k: float = None, min_precision: float = None,
+                         X=None, y=None, show_table: bool = False) -> Dict[str, Any]:
+        """
+        Modelin çalışma noktası eşiğini seçer ve modele yazar; sonraki tahminler
+        (predict_anomalies, score_file, paketler) bu eşiği kullanır.
+        
+        Skorlar bir kez sıralanır ve her aday eşik için kesinlik, duyarlılık, F1 ve 10 bin
+        satırdaki alarm sayısı kümülatif sayımlardan vektörize hesaplanır (bkz.
+        EvaluationResult.threshold_table). Kısıtları sağlayan eşikler arasından duyarlılığı
+        en yüksek olan seçilir.
+        
+        Args:
+            model_name: Model adı
+            alert_budget_per_10k: 10 bin satırda en fazla alarm (None ise config'den alınır)
+            min_precision: En düşük kesinlik (None ise config'den alınır)
+            X: Kalibrasyon verisi, ör. eğitim setinden ayrılan doğrulama seti (None ise
+                eğitimde hesaplanan test skorları kullanılır; bu durumda raporlanan test
+                metrikleri ve en iyi model seçimi iyimserdir)
+            y: Kalibrasyon etiketleri
+            show_table: True ise kalibrasyon verisinin eşik tablosu yazdırılır
+            
+        Returns:
+            dict: Seçilen çalışma noktası (threshold, alerts_per_10k, precision, recall, f1, ...)
+        """
+        if model_name not in self.models:
+            raise ValueError(f"Model '{model_name}' bulunamadı.")
+        if alert_budget_per_10k is None:
+            alert_budget_per_10k = THRESHOLD_PARAMS['alert_budget_per_10k']
+        if min_precision is None:
+            min_precision = THRESHOLD_PARAMS['min_precision']
+        
+        model = self.models[model_name]
+        if X is not None:
+            if y is None:
+                raise ValueError("Kalibrasyon verisi için etiketler (y) gerekli.")
+            X_array = X.values if hasattr(X, 'values') else X
+            evaluation = EvaluationResult(y, None, model.decision_function(X_array))
+        elif model_name in self.results:
+            evaluation = self.results[model_name]['evaluation']
+        else:
+            raise ValueError("Eşik seçimi için kalibrasyon verisi (X, y) veya eğitim sonuçları gerekli.")
+        
+        if show_table:
+            print_threshold_table(evaluation, model_title(model_name))
+        operating_point = evaluation.select_operating_point(alert_budget_per_10k, min_precision)
+        model.threshold = operating_point['threshold']
+        
+        print(f"{model_title(model_name)} eşiği: {model.threshold:.6f} "
+              f"(10 bin satırda {operating_point['alerts_per_10k']:.1f} alarm, "
+              f"kesinlik {operating_point['precision']:.4f}, duyarlılık {operating_point['recall']:.4f}, "
+              f"F1 {operating_point['f1']:.4f})")
+        
+        # Test sonuçlarını yeni eşiğe göre güncelle (skorlar yeniden hesaplanmaz)
+        if model_name in self.results:
+            results = self.results[model_name]
+            evaluation = results['evaluation'].at_threshold(model.threshold)
+            results.update({
+                'predictions': apply_threshold(results['scores'], model.threshold),
+                'metrics': evaluation.metrics,
+                'evaluation': evaluation,
+                'operating_point': operating_point
+            })
+        
+        return operating_point
+    
+    def select_thresholds(self, alert_budget_per_10k: float = None, min_precision: float = None,
+                          X=None, y=None) -> Dict[str, Dict[str, Any]]:
+        """
+        Tüm modeller için çalışma noktası seçer ve eşik tablolarını yazdırır
+        (bkz. select_threshold).
+        
+        Returns:
+            dict: Model adı -> seçilen çalışma noktası
+        """
+        print("\nÇalışma noktaları seçiliyor...")
+        operating_points = {}
+        for model_name in self.models:
+            operating_points[model_name] = self.select_threshold(model_name, alert_budget_per_10k, min_precision,
+                                                                 X, y, show_table=True)
+        
+        if self.results:
+            print_model_summary([results['metrics'] for results in self.results.values()],
+                                [model_title(name) for name in self.results])
+        return operating_points
+    
     def get_best_model(self) -> Tuple[str, Any]:
         """
         En iyi performans gösteren modeli döner.
@@ -108,17 +556,24 @@ class ModelTrainerService:
         
         return best_model_name, self.results[best_model_name]
     
-    def predict_anomalies(self, X, model_name: str = None) -> Tuple[np.ndarray, np.ndarray]:
+    @instrument('trainer.predict_anomalies')
+    def predict_anomalies(self, X, model_name: str = None, cascade: bool = False) -> Tuple[np.ndarray, np.ndarray]:
         """
         Yeni veri için anomali tahmini yapar.
         
         Args:
             X: Tahmin edilecek veri
             model_name: Kullanılacak model adı (None ise en iyi model)
+            cascade: True ise kalibre edilmiş iki aşamalı skorlama kullanılır
+                (bkz. cascade_score_and_predict; model_name yok sayılır)
             
         Returns:
             tuple: (predictions, scores)
         """
+        if cascade:
+            scores, predictions, _ = self.cascade_score_and_predict(X)
+            return predictions, scores
+        
         if not self.results:
             raise ValueError("Henüz model eğitimi yapılmamış.")
         
@@ -129,11 +584,194 @@ class ModelTrainerService:
             raise ValueError(f"Model '{model_name}' bulunamadı.")
         
         model = self.results[model_name]['model']
-        predictions = model.predict(X)
-        scores = model.decision_function(X)
+        scores, predictions = model.score_and_predict(X)
         
         return predictions, scores
     
+    def calibrate_cascade(self, X, forward_rate: float = None, prefilter_model: str = None,
+                          model: str = None) -> Dict[str, Any]:
+        """
+        İki aşamalı skorlamayı kalibre eder: ucuz ön filtre modelinin kalibrasyon verisindeki
+        skorlarının forward_rate yüzdeliği ön filtre eşiği olur; skoru bu eşiğin altında
+        kalan (en şüpheli) satırlar pahalı modele iletilir.
+        
+        İletilmeyen satırlar normal (0) etiketlenir ve sabit bir skor alır: pahalı modelin
+        iletilen kalibrasyon satırlarındaki en yüksek skoru (en az 0). Böylece bu satırlar
+        ikinci aşamanın skor ölçeğinde en normal uçta yer alır.
+        
+        Args:
+            X: Kalibrasyon verisi (ör. ölçeklenmiş eğitim verisi)
+            forward_rate: Pahalı modele iletilecek satır oranı (None ise config'den alınır)
+            prefilter_model: Ön filtre modeli (None ise config'den alınır)
+            model: Pahalı model (None ise config'den alınır)
+        
+        Returns:
+            dict: Kaskad ayarları (prefilter_model, model, forward_rate, prefilter_threshold,
+                cleared_score)
+        """
+        forward_rate = forward_rate if forward_rate is not None else CASCADE_PARAMS['forward_rate']
+        prefilter_model = prefilter_model or CASCADE_PARAMS['prefilter_model']
+        model = model or CASCADE_PARAMS['model']
+        if not 0 < forward_rate <= 1:
+            raise ValueError(f"forward_rate (0, 1] aralığında olmalı: {forward_rate}")
+        for model_name in (prefilter_model, model):
+            if model_name not in self.models:
+                raise ValueError(f"Model '{model_name}' bulunamadı.")
+        
+        X_array = X.values if hasattr(X, 'values') else X
+        prefilter_scores = self.models[prefilter_model].decision_function(X_array)
+        prefilter_threshold = float(np.quantile(prefilter_scores, forward_rate))
+        forwarded = prefilter_scores <= prefilter_threshold
+        stage_scores = self.models[model].decision_function(X_array[forwarded])
+        
+        self.cascade = {
+            'prefilter_model': prefilter_model,
+            'model': model,
+            'forward_rate': float(forward_rate),
+            'prefilter_threshold': prefilter_threshold,
+            'cleared_score': max(float(stage_scores.max()), 0.0) if stage_scores.size else 0.0
+        }
+        print(f"Kaskad kalibre edildi: {model_title(prefilter_model)} -> {model_title(model)} "
+              f"(ön filtre eşiği {prefilter_threshold:.6f}, kalibrasyonda iletilen "
+              f"{forwarded.mean():.2%})")
+        
+        return self.cascade
+    
+    @instrument('trainer.cascade_score_and_predict')
+    def cascade_score_and_predict(self, X) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        İki aşamalı skorlama: tüm satırlar ön filtre modeliyle skorlanır, yalnızca ön filtre
+        eşiğini geçen satırlar pahalı modele iletilir. Sonuçlar orijinal sırayla birleştirilir.
+        
+        Args:
+            X: Skorlanacak veri
+        
+        Returns:
+            tuple: (scores, predictions, forwarded) - skorlar, etiketler ve pahalı modele
+                iletilen satırların maskesi
+        """
+        if self.cascade is None:
+            raise ValueError("Kaskad kalibre edilmemiş. Önce calibrate_cascade() metodunu çağırın.")
+        
+        cascade = self.cascade
+        X_array = X.values if hasattr(X, 'values') else X
+        forwarded = self.models[cascade['prefilter_model']].decision_function(X_array) <= cascade['prefilter_threshold']
+        
+        scores = np.full(X_array.shape[0], cascade['cleared_score'])
+        predictions = np.zeros(X_array.shape[0], dtype=int)
+        if forwarded.any():
+            scores[forwarded], predictions[forwarded] = self.models[cascade['model']].score_and_predict(
+                X_array[forwarded])
+        
+        return scores, predictions, forwarded
+    
+    def evaluate_cascade(self, X_test, y_test) -> Dict[str, Any]:
+        """
+        Kaskadı pahalı modelin tüm satırlarda çalışmasıyla karşılaştırır: uçtan uca
+        skorlama hızı ve kaskadın kaçırdığı duyarlılık.
+        
+        Args:
+            X_test: Test özellikleri
+            y_test: Test etiketleri
+        
+        Returns:
+            dict: İletilen oran, iki yolun saniyede satır sayısı, hızlanma, duyarlılık ve
+                ROC AUC değerleri, duyarlılık kaybı ve pahalı modelin yakalayıp kaskadın
+                kaçırdığı anomaliler
+        """
+        if self.cascade is None:
+            raise ValueError("Kaskad kalibre edilmemiş. Önce calibrate_cascade() metodunu çağırın.")
+        
+        X_array = X_test.values if hasattr(X_test, 'values') else X_test
+        y_array = np.asarray(y_test)
+        model_name = self.cascade['model']
+        
+        start = time.perf_counter()
+        full_scores, full_predictions = self.models[model_name].score_and_predict(X_array)
+        full_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        scores, predictions, forwarded = self.cascade_score_and_predict(X_array)
+        cascade_time = time.perf_counter() - start
+        
+        full_evaluation = EvaluationResult(y_array, full_predictions, full_scores)
+        evaluation = EvaluationResult(y_array, predictions, scores)
+        full_detected = (full_predictions == 1) & (y_array == 1)
+        n_rows = X_array.shape[0]
+        
+        report = {
+            'forwarded_rate': float(forwarded.mean()),
+            'full_rows_per_s': n_rows / full_time if full_time > 0 else float('inf'),
+            'cascade_rows_per_s': n_rows / cascade_time if cascade_time > 0 else float('inf'),
+            'throughput_gain': full_time / cascade_time if cascade_time > 0 else float('inf'),
+            'full_recall': full_evaluation.recall,
+            'cascade_recall': evaluation.recall,
+            'recall_lost': full_evaluation.recall - evaluation.recall,
+            'missed_detections': int(np.sum(full_detected & ~forwarded)),
+            'full_roc_auc': full_evaluation.roc_auc,
+            'cascade_roc_auc': evaluation.roc_auc
+        }
+        
+        title = f"{model_title(self.cascade['prefilter_model'])} -> {model_title(model_name)}"
+        print(f"\nKaskad ({title}):")
+        print(f"İletilen satır: {report['forwarded_rate']:.2%}")
+        print(f"Skorlama hızı: {report['full_rows_per_s']:.0f} -> {report['cascade_rows_per_s']:.0f} satır/sn "
+              f"(x{report['throughput_gain']:.3g})")
+        if report['throughput_gain'] < 1:
+            print(f"Uyarı: Kaskad, {model_title(model_name)} modelini tüm satırlarda çalıştırmaktan yavaş. "
+                  f"Ön filtre ({model_title(self.cascade['prefilter_model'])}) pahalı modelden hızlı olmalı; "
+                  f"daha hızlı bir ön filtre seçin veya forward_rate değerini düşürün.")
+        print(f"Duyarlılık: {report['full_recall']:.4f} -> {report['cascade_recall']:.4f} "
+              f"(kayıp: {report['recall_lost']:.4f}, ön filtrenin elediği yakalanan anomali: "
+              f"{report['missed_detections']})")
+        print(f"ROC AUC: {report['full_roc_auc']:.4f} -> {report['cascade_roc_auc']:.4f}")
+        
+        return report
+    
+    def score_file(self, input_path: str, output_path: str, scaler, model_name: str = None,
+                   chunk_size: int = None, feature_columns: List[str] = None) -> Dict[str, Any]:
+        """
+        Büyük bir işlem dosyasını parça parça skorlar (bkz. StreamingScoringService).
+        
+        Args:
+            input_path: Girdi dosyası (.csv, .npy veya sütun önbelleği klasörü)
+            output_path: Çıktı CSV dosyası
+            scaler: Eğitimde fit edilmiş scaler
+            model_name: Kullanılacak model adı (None ise en iyi model)
+            chunk_size: Parça başına satır sayısı
+            feature_columns: Özellik sütunları (None ise yüklenen paketteki şema)
+            
+        Returns:
+            dict: Skorlama istatistikleri (rows, anomalies, seconds, rows_per_sec)
+        """
+        from services.streaming_scoring_service import StreamingScoringService
+        
+        model_name = self.resolve_model_name(model_name)
+        
+        if feature_columns is None:
+            feature_columns = self.feature_columns
+        
+        service = StreamingScoringService(scaler, self.models[model_name], feature_columns, chunk_size)
+        return service.score_file(input_path, output_path)
+    
+    def resolve_model_name(self, model_name: str = None) -> str:
+        """
+        Skorlamada kullanılacak modeli belirler. Ad verilmezse eğitim sonuçlarından,
+        yoksa yüklenen paketin meta verisinden en iyi model seçilir.
+        """
+        if model_name is None:
+            if self.results:
+                model_name, _ = self.get_best_model()
+            else:
+                model_name = self.bundle_metadata.get('best_model')
+        
+        if model_name is None:
+            raise ValueError("Henüz model eğitimi yapılmamış.")
+        if model_name not in self.models:
+            raise ValueError(f"Model '{model_name}' bulunamadı.")
+        
+        return model_name
+    
     def get_model_performance_summary(self) -> pd.DataFrame:
         """
         Tüm modellerin performans özetini DataFrame olarak döner.
@@ -147,13 +785,20 @@ class ModelTrainerService:
         data = []
         for model_name, results in self.results.items():
             metrics = results['metrics']
+            evaluation = results.get('evaluation')
             data.append({
-                'Model': model_name.replace('_', ' ').title(),
+                'Model': model_title(model_name),
                 'Accuracy': metrics[0],
                 'Precision': metrics[1],
                 'Recall': metrics[2],
                 'F1_Score': metrics[3],
-                'ROC_AUC': metrics[4]
+                'ROC_AUC': metrics[4],
+                'Avg_Precision': evaluation.average_precision if evaluation is not None else None,
+                'Alerts_per_10k': float(np.mean(results['predictions'])) * 10000,
+                'Fit_Time_s': results.get('fit_time'),
+                # Test setinde saniyede skorlanan satır (skorlama + etiketleme)
+                'Rows_per_s': (len(results['scores']) / results['score_time']
+                               if results.get('score_time') else None)
             })
         
         return pd.DataFrame(data)
@@ -175,20 +820,26 @@ class ModelTrainerService:
             joblib.dump(model, filename)
             print(f"Model kaydedildi: {filename}")
     
-    def load_models(self, filepath_prefix: str = "models"):
+    def load_models(self, filepath_prefix: str = "models", model_names: List[str] = None):
         """
         Kaydedilmiş modelleri yükler.
         
         Args:
             filepath_prefix: Dosya yolu öneki
+            model_names: Yüklenecek modeller (None ise kayıtlı tüm modeller ve önekle kaydedilmiş
+                kayıt dışı modeller, örn. ensemble)
         """
+        import glob
         import joblib
-        import os
         
-        model_files = {
-            'isolation_forest': f"{filepath_prefix}_isolation_forest.joblib",
-            'one_class_svm': f"{filepath_prefix}_one_class_svm.joblib"
-        }
+        if not model_names:
+            model_names = list(registered_models())
+            # save_models kayıt dışı modelleri (ensemble) de aynı önekle yazar
+            saved = sorted(os.path.basename(path)[len(os.path.basename(filepath_prefix)) + 1:-len('.joblib')]
+                           for path in glob.glob(f"{glob.escape(filepath_prefix)}_*.joblib"))
+            model_names += [model_name for model_name in saved if model_name not in model_names]
+        
+        model_files = {model_name: f"{filepath_prefix}_{model_name}.joblib" for model_name in model_names}
         
         loaded_models = {}
         for model_name, filepath in model_files.items():
@@ -201,3 +852,160 @@ class ModelTrainerService:
         
         self.models = loaded_models
         return loaded_models
+    
+    def fit_projection(self, X_train, method: str = None):
+        """
+        Anomali dağılımı grafiklerinin 2-B PCA izdüşümünü eğitim verisinin bir örnekleminde
+        bir kez fit eder. İzdüşüm çıkarım paketine kaydedilir; raporlar yeniden fit etmez.
+        
+        Args:
+            X_train: Eğitim özellikleri (ölçeklenmiş)
+            method: 'auto', 'full', 'randomized' veya 'incremental' (None ise config'den alınır)
+            
+        Returns:
+            PCAProjection: Fit edilmiş izdüşüm
+        """
+        from utils.projection_utils import PCAProjection
+        
+        start = time.perf_counter()
+        self.projection = PCAProjection(method=method).fit(X_train)
+        explained = self.projection.explained_variance_ratio_.sum()
+        print(f"2-B izdüşüm fit edildi: {self.projection.n_fit_rows} satır, "
+              f"açıklanan varyans {explained:.1%} ({time.perf_counter() - start:.2f} sn)")
+        
+        return self.projection
+    
+    def save_bundle(self, scaler, feature_columns: List[str], filepath: str = None,
+                    metadata: Dict[str, Any] = None) -> str:
+        """
+        Skorlama için gereken her şeyi (scaler, tüm modeller, özellik şeması ve meta veri)
+        sürümlü tek bir çıkarım paketine kaydeder. Dosya sıkıştırılmadan yazılır ki
+        load_bundle() numpy dizilerini bellek eşlemeli açabilsin.
+        
+        Args:
+            scaler: Eğitimde fit edilmiş scaler
+            feature_columns: Modellerin beklediği özellik sütunları (sıralı)
+            filepath: Paket dosyası. Varsayılan olarak config'den alınır
+            metadata: Pakete eklenecek ek bilgiler
+            
+        Returns:
+            str: Kaydedilen dosya yolu
+        """
+        if not self.models:
+            raise ValueError("Kaydedilecek model bulunamadı.")
+        
+        import joblib
+        import sklearn
+        from datetime import datetime, timezone
+        
+        if filepath is None:
+            filepath = BUNDLE_PARAMS['path']
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        
+        bundle_metadata = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'sklearn_version': sklearn.__version__,
+            'numpy_version': np.__version__,
+            'metrics': {name: list(map(float, results['metrics'])) for name, results in self.results.items()},
+            'best_model': self.get_best_model()[0] if self.results else self.bundle_metadata.get('best_model'),
+            'thresholds': {name: getattr(model, 'threshold', None) for name, model in self.models.items()},
+            'cascade': self.cascade
+        }
+        bundle_metadata.update(metadata or {})
+        
+        bundle = {
+            'format_version': BUNDLE_FORMAT_VERSION,
+            'scaler': scaler,
+            'models': self.models,
+            'feature_columns': list(feature_columns),
+            'projection': self.projection,
+            'metadata': bundle_metadata
+        }
+        joblib.dump(bundle, filepath)
+        self.feature_columns = bundle['feature_columns']
+        print(f"Çıkarım paketi kaydedildi: {filepath}")
+        
+        return filepath
+    
+    def load_bundle(self, filepath: str = None, mmap_mode: str = 'r') -> Dict[str, Any]:
+        """
+        Çıkarım paketini yükler ve modelleri self.models'e yerleştirir.
+        
+        mmap_mode='r' ile yalnızca model özniteliği olarak doğrudan tutulan numpy dizileri
+        (destek vektörleri, dual katsayılar, histogramlar, scaler istatistikleri) salt okunur
+        bellek eşlemeli açılır. Isolation Forest ağaçlarının düğüm dizileri eşlenmez: sklearn
+        Tree.__setstate__ bunları kopyalar, her işçi süreç ormanın kendi kopyasını tutar.
+        Süreçler arasında tam paylaşım için numpy skorlama paketi (save_scoring_artifact)
+        kullanılmalıdır.
+        
+        Args:
+            filepath: Paket dosyası. Varsayılan olarak config'den alınır
+            mmap_mode: joblib mmap_mode (None: belleğe kopyala)
+            
+        Returns:
+            dict: scaler, models, feature_columns, projection, metadata ve load_time (saniye)
+        """
+        import joblib
+        
+        if filepath is None:
+            filepath = BUNDLE_PARAMS['path']
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Çıkarım paketi bulunamadı: {filepath}")
+        
+        start = time.perf_counter()
+        bundle = joblib.load(filepath, mmap_mode=mmap_mode)
+        load_time = time.perf_counter() - start
+        
+        if not isinstance(bundle, dict) or bundle.get('format_version') != BUNDLE_FORMAT_VERSION:
+            version = bundle.get('format_version') if isinstance(bundle, dict) else None
+            raise ValueError(f"Desteklenmeyen paket sürümü: {version} (beklenen {BUNDLE_FORMAT_VERSION})")
+        
+        self.models = bundle['models']
+        self.feature_columns = bundle['feature_columns']
+        self.bundle_metadata = bundle['metadata']
+        self.cascade = self.bundle_metadata.get('cascade')
+        # İzdüşüm içermeyen eski paketlerde grafikler test verisi üzerinde fit eder
+        self.projection = bundle.get('projection')
+        bundle['load_time'] = load_time
+        print(f"Çıkarım paketi yüklendi: {filepath} ({load_time * 1000:.1f} ms, "
+              f"modeller: {', '.join(self.models)})")
+        
+        return bundle
+    
+    def save_scoring_artifact(self, scaler, feature_columns: List[str], path: str = None) -> str:
+        """
+        Modelleri sklearn gerektirmeyen numpy dizilerine çevirip skorlama paketine kaydeder
+        (score.py tarafından kullanılır). Dışa aktarılamayan modeller uyarıyla atlanır.
+        
+        Args:
+            scaler: Eğitimde fit edilmiş scaler
+            feature_columns: Modellerin beklediği özellik sütunları (sıralı)
+            path: Paket klasörü. Varsayılan olarak config'den alınır
+            
+        Returns:
+            str: Kaydedilen paket klasörü
+        """
+        from utils.scoring_artifact_utils import save_scoring_artifact
+        
+        if not self.models:
+            raise ValueError("Kaydedilecek model bulunamadı.")
+        
+        engines = {}
+        for model_name, model in self.models.items():
+            try:
+                engines[model_name] = model.export_scoring_engine()
+                # Motor, modelin çalışma noktası eşiğiyle etiketler
+                engines[model_name].decision_threshold = getattr(model, 'threshold', None)
+            except ValueError as e:
+                print(f"Uyarı: '{model_name}' skorlama paketine eklenemedi. {e}")
+        
+        path = path or SCORING_ARTIFACT_PARAMS['path']
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        best_model = self.get_best_model()[0] if self.results else self.bundle_metadata.get('best_model')
+        save_scoring_artifact(path, scaler, engines, feature_columns, {
+            'best_model': best_model if best_model in engines else next(iter(engines), None),
+            'metrics': {name: list(map(float, results['metrics'])) for name, results in self.results.items()}
+        })
+        print(f"Skorlama paketi kaydedildi: {path} (modeller: {', '.join(engines)})")
+        
+        return path
@@ -0,0 +1,289 @@
+"""
+Düşük gecikmeli çevrimiçi skorlama servisi
+"""
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
+
+import numpy as np
+
+from config.config import SERVER_PARAMS
+from services.model_trainer_service import ModelTrainerService
+from services.streaming_scoring_service import StreamingScoringService
+from utils.batching_utils import RequestCoalescer
+from utils.metrics_utils import get_registry
+
+
+class LatencyStats:
+    """İstek gecikmeleri ve işlem hacmi sayaçları (thread-safe)"""
+    
+    def __init__(self, window: int = 10000):
+        """
+        Args:
+            window: Yüzdelik hesabında tutulacak son istek sayısı
+        """
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batched_rows = 0
+        self.errors = 0
+    
+    def record_request(self, latency: float, n_rows: int):
+        """Tamamlanan bir isteği kaydeder"""
+        with self._lock:
+            self._latencies.append(latency)
+            self.requests += 1
+            self.rows += n_rows
+    
+    def record_batch(self, n_rows: int):
+        """Modele gönderilen bir vektörize batch'i kaydeder"""
+        with self._lock:
+            self.batches += 1
+            self.batched_rows += n_rows
+    
+    def record_error(self):
+        """Hatalı bir isteği kaydeder"""
+        with self._lock:
+            self.errors += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Sayaçların anlık görüntüsünü döner.
+        
+        Returns:
+            dict: p50/p99 gecikme (ms), istek/satır sayıları, satır/sn ve ortalama batch boyutu
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            uptime = time.perf_counter() - self.started_at
+            return {
+                'requests': self.requests,
+                'rows': self.rows,
+                'errors': self.errors,
+                'batches': self.batches,
+                'avg_batch_rows': self.batched_rows / self.batches if self.batches else 0.0,
+                'p50_ms': float(np.percentile(latencies, 50) * 1000) if len(latencies) else None,
+                'p99_ms': float(np.percentile(latencies, 99) * 1000) if len(latencies) else None,
+                'rows_per_sec': self.rows / uptime if uptime > 0 else 0.0,
+                'uptime_s': uptime
+            }
+
+
+class OnlineScoringService:
+    """Modelleri bir kez yükleyip tekil işlemleri ve mikro-batch'leri HTTP üzerinden skorlayan servis"""
+    
+    def __init__(self, trainer: ModelTrainerService, scaler, feature_columns: List[str],
+                 model_name: str = None, max_batch_size: int = None, max_wait_us: float = None):
+        """
+        Args:
+            trainer: Modelleri yüklenmiş ModelTrainerService
+            scaler: Eğitimde fit edilmiş scaler
+            feature_columns: Özellik sütunları (sıralı)
+            model_name: Kullanılacak model (None ise en iyi model)
+            max_batch_size: Bir vektörize çağrıdaki en fazla satır sayısı
+            max_wait_us: Batch doldurmak için en fazla bekleme süresi (mikrosaniye)
+        """
+        self.model_name = trainer.resolve_model_name(model_name)
+        self.feature_columns = list(feature_columns)
+        self.stats = LatencyStats()
+        self._scorer = StreamingScoringService(scaler, trainer.models[self.model_name], self.feature_columns)
+        # Model yalnızca birleştiricinin thread'inde, vektörize batch'lerle çağrılır
+        self._coalescer = RequestCoalescer(
+            self._scorer.score_chunk,
+            max_batch_size or SERVER_PARAMS['max_batch_size'],
+            SERVER_PARAMS['max_wait_us'] if max_wait_us is None else max_wait_us,
+            on_batch=self.stats.record_batch,
+            name='scoring-coalescer'
+        )
+        self._server = None
+    
+    @classmethod
+    def from_bundle(cls, bundle_path: str = None, model_name: str = None, **kwargs) -> 'OnlineScoringService':
+        """
+        Çıkarım paketinden servis oluşturur.
+        
+        Args:
+            bundle_path: Paket dosyası (None ise config'den alınır)
+            model_name: Kullanılacak model
+            
+        Returns:
+            OnlineScoringService: Hazır servis
+        """
+        trainer = ModelTrainerService()
+        bundle = trainer.load_bundle(bundle_path)
+        return cls(trainer, bundle['scaler'], bundle['feature_columns'], model_name, **kwargs)
+    
+    def score(self, transactions) -> Dict[str, Any]:
+        """
+        Tek bir işlemi veya işlem listesini skorlar. Eşzamanlı çağrılar mikro-batch'lerde
+        birleştirilir.
+        
+        Args:
+            transactions: Özellik adı -> değer sözlüğü, özellik listesi ya da bunların listesi
+            
+        Returns:
+            dict: scores, predictions ve model adı
+        """
+        start = time.perf_counter()
+        X = self._to_matrix(transactions)
+        scores, predictions = self._coalescer.submit(X)
+        self.stats.record_request(time.perf_counter() - start, len(X))
+        return {
+            'model': self.model_name,
+            'scores': scores.tolist(),
+            'predictions': predictions.tolist()
+        }
+    
+    def _to_matrix(self, transactions) -> np.ndarray:
+        """
+        İstek gövdesini (n_rows, n_features) boyutlu matrise çevirir. Geçersiz değerler
+        istek düzeyinde reddedilir; birleştiriciye ulaşsalar aynı batch'teki diğer
+        isteklerin skorlamasını da düşürürler.
+        """
+        if isinstance(transactions, dict) or (
+                isinstance(transactions, list) and transactions and not isinstance(transactions[0], (dict, list))):
+            transactions = [transactions]
+        if not transactions:
+            raise ValueError("Skorlanacak işlem bulunamadı.")
+        
+        rows = []
+        for transaction in transactions:
+            if isinstance(transaction, dict):
+                missing = [column for column in self.feature_columns if column not in transaction]
+                if missing:
+                    raise ValueError(f"Eksik özellikler: {missing}")
+                rows.append([transaction[column] for column in self.feature_columns])
+            else:
+                if len(transaction) != len(self.feature_columns):
+                    raise ValueError(f"{len(self.feature_columns)} özellik bekleniyordu, "
+                                     f"{len(transaction)} geldi.")
+                rows.append(transaction)
+        
+        try:
+            X = np.asarray(rows, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("Özellik değerleri sayısal olmalı.")
+        
+        invalid = ~np.isfinite(X).all(axis=1)
+        if invalid.any():
+            raise ValueError(f"Sonlu olmayan (NaN/inf) değer içeren satırlar: {np.flatnonzero(invalid).tolist()}")
+        return X
+    
+    def start(self, host: str = None, port: int = None) -> ThreadingHTTPServer:
+        """
+        HTTP sunucusunu arka plan thread'inde başlatır.
+        
+        Uç noktalar:
+            POST /score   {"transaction": {...}} veya {"transactions": [{...}, ...]}
+            GET  /metrics gecikme yüzdelikleri ve işlem hacmi
+            GET  /metrics/stages     aşama başına süre/satır/bellek sayaçları (JSON)
+            GET  /metrics/prometheus aynı sayaçlar Prometheus metin biçiminde
+            GET  /health  servis durumu
+            
+        Args:
+            host: Dinlenecek adres
+            port: Dinlenecek port (0: boş bir port seç)
+            
+        Returns:
+            ThreadingHTTPServer: Çalışan sunucu
+        """
+        host = host or SERVER_PARAMS['host']
+        port = SERVER_PARAMS['port'] if port is None else port
+        self._server = _ScoringHTTPServer((host, port), _make_handler(self), SERVER_PARAMS['request_queue_size'])
+        threading.Thread(target=self._server.serve_forever, name='scoring-server', daemon=True).start()
+        print(f"Skorlama sunucusu çalışıyor: http://{host}:{self._server.server_address[1]} "
+              f"(model: {self.model_name})")
+        return self._server
+    
+    def serve_forever(self, host: str = None, port: int = None):
+        """Sunucuyu başlatır ve Ctrl+C gelene kadar bekler"""
+        self.start(host, port)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\nSunucu kapatılıyor...")
+        finally:
+            self.shutdown()
+    
+    def shutdown(self):
+        """HTTP sunucusunu ve istek birleştiriciyi durdurur"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._coalescer.close()
+
+
+class _ScoringHTTPServer(ThreadingHTTPServer):
+    """
+    Bağlantı kuyruğu yapılandırılabilen HTTP sunucusu. socketserver'ın varsayılan listen()
+    kuyruğu 5 bağlantıdır; eşzamanlı istemci patlamalarında fazlası ConnectionResetError
+    ile reddedilir.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, server_address, handler_class, request_queue_size: int):
+        # listen() üst sınıfın __init__'inde çağrılır; kuyruk boyutu ondan önce ayarlanmalı
+        self.request_queue_size = request_queue_size
+        super().__init__(server_address, handler_class)
+
+
+def _make_handler(service: OnlineScoringService):
+    """Servise bağlı HTTP istek işleyicisini oluşturur"""
+    
+    class ScoringRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            if self.path == '/metrics':
+                self._send_json(200, service.stats.snapshot())
+            elif self.path == '/metrics/stages':
+                self._send_json(200, get_registry().snapshot())
+            elif self.path == '/metrics/prometheus':
+                self._send_body(200, get_registry().to_prometheus().encode(), 'text/plain; version=0.0.4')
+            elif self.path == '/health':
+                self._send_json(200, {'status': 'ok', 'model': service.model_name})
+            else:
+                self._send_json(404, {'error': 'Bulunamadı'})
+        
+        def do_POST(self):
+            if self.path != '/score':
+                self._send_json(404, {'error': 'Bulunamadı'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                transactions = body.get('transactions', body.get('transaction'))
+                if transactions is None:
+                    raise ValueError("'transaction' veya 'transactions' alanı gerekli.")
+                self._send_json(200, service.score(transactions))
+            except (ValueError, TypeError) as e:
+                service.stats.record_error()
+                self._send_json(400, {'error': str(e)})
+            except Exception as e:
+                service.stats.record_error()
+                self._send_json(500, {'error': str(e)})
+        
+        def _send_json(self, status: int, payload: Dict[str, Any]):
+            self._send_body(status, json.dumps(payload).encode(), 'application/json')
+        
+        def _send_body(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            # Her istek için satır yazdırma gecikmeyi artırır
+            pass
+    
+    return ScoringRequestHandler
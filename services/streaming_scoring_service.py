@@ -0,0 +1,152 @@
+"""
+Parça parça (streaming) skorlama servisi
+"""
+import os
+import time
+import numpy as np
+from typing import Dict, Any, Iterator, List, Tuple
+
+from config.config import STREAMING_PARAMS
+
+
+class StreamingScoringService:
+    """Belleğe sığmayan işlem dosyalarını sabit boyutlu parçalar halinde skorlayan servis"""
+    
+    def __init__(self, scaler, model, feature_columns: List[str] = None, chunk_size: int = None):
+        """
+        Args:
+            scaler: Eğitimde fit edilmiş scaler (DataPreprocessingService.get_scaler())
+            model: Eğitilmiş model (score_and_predict metodu olan)
+            feature_columns: Modelin beklediği özellik sütunları (sıralı). None ise
+                'Class' ve 'Time' dışındaki tüm sütunlar kullanılır
+            chunk_size: Parça başına satır sayısı. Varsayılan olarak config'den alınır
+        """
+        self.scaler = scaler
+        self.model = model
+        self.chunk_size = chunk_size or STREAMING_PARAMS['chunk_size']
+        
+        # DataFrame ile fit edilmiş scaler/model sütun adlarını bekler
+        self._scaler_columns = getattr(scaler, 'feature_names_in_', None)
+        self._model_columns = getattr(getattr(model, 'model', None), 'feature_names_in_', None)
+        if feature_columns is None and self._scaler_columns is not None:
+            feature_columns = list(self._scaler_columns)
+        self.feature_columns = feature_columns
+    
+    def score_file(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        """
+        Girdi dosyasını parça parça skorlar ve sonuçları çıktı dosyasına ekleyerek yazar.
+        Bellek kullanımı dosya boyutundan bağımsız olarak parça boyutuyla sınırlıdır.
+        
+        Desteklenen girdiler:
+            - .csv: Ham işlem dosyası
+            - .npy: Özellik sırasına göre 2 boyutlu matris (bellek eşlemeli okunur)
+            - Klasör: load_columns() tarafından oluşturulan sütun önbelleği
+            
+        Args:
+            input_path: Girdi dosyası
+            output_path: Çıktı CSV dosyası (row, score, prediction)
+            
+        Returns:
+            dict: rows, anomalies, seconds, rows_per_sec
+        """
+        import pandas as pd
+        
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"'{input_path}' dosyası bulunamadı.")
+        
+        start = time.perf_counter()
+        n_rows = 0
+        n_anomalies = 0
+        
+        with open(output_path, 'w', newline='') as output:
+            output.write('row,score,prediction\n')
+            for X_chunk in self._iter_chunks(input_path):
+                scores, predictions = self.score_chunk(X_chunk)
+                
+                chunk_df = pd.DataFrame({
+                    'row': np.arange(n_rows, n_rows + len(scores)),
+                    'score': scores,
+                    'prediction': predictions
+                })
+                chunk_df.to_csv(output, header=False, index=False)
+                
+                n_rows += len(scores)
+                n_anomalies += int(predictions.sum())
+        
+        elapsed = time.perf_counter() - start
+        stats = {
+            'rows': n_rows,
+            'anomalies': n_anomalies,
+            'seconds': elapsed,
+            'rows_per_sec': n_rows / elapsed if elapsed > 0 else float('inf')
+        }
+        
+        print(f"Skorlama tamamlandı: {n_rows} satır, {n_anomalies} anomali, "
+              f"{elapsed:.2f} sn ({stats['rows_per_sec']:.0f} satır/sn)")
+        print(f"Sonuçlar kaydedildi: {output_path}")
+        
+        return stats
+    
+    def score_chunk(self, X_chunk) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ham özellik matrisini ölçekler ve tek bir çıkarımla skorlar.
+        
+        Args:
+            X_chunk: (n_rows, n_features) boyutlu ham özellikler (feature_columns sırasıyla)
+            
+        Returns:
+            tuple: (scores, predictions)
+        """
+        if self._scaler_columns is not None or self._model_columns is not None:
+            import pandas as pd
+        if self._scaler_columns is not None:
+            X_chunk = pd.DataFrame(X_chunk, columns=self._scaler_columns)
+        X_scaled = self.scaler.transform(X_chunk)
+        if self._model_columns is not None:
+            X_scaled = pd.DataFrame(X_scaled, columns=self._model_columns)
+        return self.model.score_and_predict(X_scaled)
+    
+    def _iter_chunks(self, input_path: str) -> Iterator[np.ndarray]:
+        """
+        Girdiyi özellik matrisi parçaları olarak üretir.
+        
+        Args:
+            input_path: Girdi dosyası veya sütun önbelleği klasörü
+            
+        Yields:
+            numpy.ndarray: (chunk_size, n_features) boyutlu parça
+        """
+        if os.path.isdir(input_path):
+            from utils.data_cache_utils import load_column_cache
+            columns = load_column_cache(input_path, mmap_mode='r')
+            if columns is None:
+                raise ValueError(f"'{input_path}' geçerli bir sütun önbelleği değil.")
+            features = [columns[column] for column in self._resolve_columns(list(columns))]
+            n_rows = len(features[0]) if features else 0
+            for start in range(0, n_rows, self.chunk_size):
+                yield np.column_stack([column[start:start + self.chunk_size] for column in features])
+        
+        elif input_path.endswith('.npy'):
+            X = np.load(input_path, mmap_mode='r')
+            if X.ndim != 2:
+                raise ValueError(f"'{input_path}' 2 boyutlu bir özellik matrisi olmalı.")
+            for start in range(0, X.shape[0], self.chunk_size):
+                yield np.asarray(X[start:start + self.chunk_size])
+        
+        else:
+            import pandas as pd
+            feature_columns = None
+            for chunk in pd.read_csv(input_path, chunksize=self.chunk_size):
+                if feature_columns is None:
+                    feature_columns = self._resolve_columns(list(chunk.columns))
+                yield chunk[feature_columns].to_numpy()
+    
+    def _resolve_columns(self, available: List[str]) -> List[str]:
+        """Kullanılacak özellik sütunlarını belirler ve eksik sütunları kontrol eder"""
+        if self.feature_columns is None:
+            return [column for column in available if column not in ('Class', 'Time')]
+        
+        missing = [column for column in self.feature_columns if column not in available]
+        if missing:
+            raise ValueError(f"Girdide eksik özellik sütunları: {missing}")
+        return list(self.feature_columns)
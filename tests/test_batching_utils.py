@@ -0,0 +1,63 @@
+"""
+RequestCoalescer testleri
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from utils.batching_utils import RequestCoalescer
+
+
+def test_on_batch_error_fails_futures_and_keeps_worker_alive():
+    def on_batch(n_rows):
+        raise RuntimeError("on_batch")
+    
+    coalescer = RequestCoalescer(lambda X: X.sum(axis=1), on_batch=on_batch, max_wait_us=0)
+    with pytest.raises(RuntimeError, match="on_batch"):
+        coalescer.submit(np.ones(3))
+    
+    coalescer.on_batch = None
+    assert coalescer.submit(np.ones(3)) == 3.0
+    coalescer.close()
+
+
+def test_submit_racing_close_never_hangs():
+    for _ in range(50):
+        coalescer = RequestCoalescer(lambda X: X.sum(axis=1), max_wait_us=0)
+        outcomes = []
+        
+        def submit():
+            try:
+                outcomes.append(coalescer.submit(np.ones(2)))
+            except RuntimeError:
+                outcomes.append('closed')
+        
+        threads = [threading.Thread(target=submit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        coalescer.close()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert not any(thread.is_alive() for thread in threads)
+        assert len(outcomes) == 4
+
+
+def test_max_batch_size_is_never_exceeded():
+    batch_sizes = []
+    
+    def score(X):
+        batch_sizes.append(len(X))
+        return X[:, 0].copy()
+    
+    coalescer = RequestCoalescer(score, max_batch_size=8, max_wait_us=200000)
+    sizes = [3, 3, 3, 5, 1, 20, 2]
+    futures = [coalescer.submit_future(np.full((size, 1), i, dtype=float)) for i, size in enumerate(sizes)]
+    results = [future.result(timeout=10) for future in futures]
+    coalescer.close()
+    
+    assert max(batch_sizes) <= 8
+    assert sum(batch_sizes) == sum(sizes)
+    for i, (size, result) in enumerate(zip(sizes, results)):
+        np.testing.assert_array_equal(result, np.full(size, i))
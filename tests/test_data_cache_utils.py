@@ -0,0 +1,70 @@
+"""
+Sütun önbelleği testleri
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.data_cache_utils as data_cache_utils
+from utils.data_cache_utils import (build_column_cache_chunked, file_fingerprint, load_column_cache,
+                                    write_column_cache)
+
+
+def _write_csv(path, values):
+    path.write_text('a,b\n' + ''.join(f"{value},{i}.0\n" for i, value in enumerate(values)))
+    return str(path)
+
+
+def _build(file_path, cache_dir, chunk_size=3):
+    return build_column_cache_chunked(file_path, str(cache_dir), file_fingerprint(file_path), chunk_size=chunk_size)
+
+
+def test_chunked_cache_rejects_lossy_dtype_in_later_chunk(tmp_path):
+    # İlk parça tamsayı, sonraki parçada ondalık değer: önbellek tamsayı olarak kırpmamalı
+    file_path = _write_csv(tmp_path / 'data.csv', ['1', '2', '3', '4', '5.5', '6'])
+    
+    with pytest.raises(ValueError, match="uyumsuz"):
+        _build(file_path, tmp_path / 'cache')
+
+
+def test_chunked_cache_accepts_safe_dtype_in_later_chunk(tmp_path):
+    file_path = _write_csv(tmp_path / 'data.csv', ['1.5', '2.5', '3.5', '4', '5', '6'])
+    
+    cache_path = _build(file_path, tmp_path / 'cache')
+    
+    np.testing.assert_array_equal(load_column_cache(cache_path)['a'], [1.5, 2.5, 3.5, 4, 5, 6])
+
+
+@pytest.mark.parametrize('values, n_rows', [
+    (['1', '2', '3', '4', '5.5', '6'], None),   # tip uyuşmazlığı
+    (['x', 'y', 'z', 'w', 'v', 'u'], None),     # metin sütunu
+    (['1', '2', '3', '4', '5', '6'], 4)          # satır sayısı uyuşmazlığı
+])
+def test_failed_chunked_build_leaves_no_temporary_files(tmp_path, monkeypatch, values, n_rows):
+    file_path = _write_csv(tmp_path / 'data.csv', values)
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    if n_rows is not None:
+        monkeypatch.setattr(data_cache_utils, '_count_data_rows', lambda path: n_rows)
+    
+    with pytest.raises(ValueError):
+        _build(file_path, cache_dir)
+    
+    assert os.listdir(cache_dir) == []
+
+
+def test_failed_dataframe_write_leaves_no_temporary_files(tmp_path, monkeypatch):
+    file_path = _write_csv(tmp_path / 'data.csv', ['1', '2'])
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    
+    def fail(*args):
+        raise OSError("disk dolu")
+    monkeypatch.setattr(data_cache_utils, '_finalize_cache', fail)
+    
+    with pytest.raises(OSError):
+        write_column_cache(pd.DataFrame({'a': [1.0, 2.0]}), file_path, str(cache_dir), file_fingerprint(file_path))
+    
+    assert os.listdir(cache_dir) == []
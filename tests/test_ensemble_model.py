@@ -0,0 +1,72 @@
+"""
+EnsembleModel ve ScoreFusion testleri
+"""
+import pickle
+
+import numpy as np
+import pytest
+
+from models.ensemble_model import EnsembleModel, ScoreFusion
+from models.hbos_model import HBOSModel
+from models.knn_model import KNNModel
+
+
+def test_arrays_round_trip_keeps_scores_and_thread_count():
+    rng = np.random.RandomState(0)
+    X = rng.randn(1000, 4)
+    hbos = HBOSModel()
+    hbos.fit(X)
+    knn = KNNModel(n_neighbors=3, n_lists=10, n_jobs=2)
+    knn.fit(X)
+    ensemble = EnsembleModel({'hbos': hbos, 'knn': knn}, n_quantiles=200, n_jobs=2)
+    ensemble.fit(X)
+    
+    engine = ScoreFusion.from_arrays(*ensemble.export_scoring_engine().to_arrays())
+    
+    assert engine.n_jobs == 2
+    assert engine.members['knn'].n_jobs == 2
+    X_query = rng.randn(200, 4) * 2
+    np.testing.assert_allclose(engine.decision_function(X_query), ensemble.decision_function(X_query))
+
+
+@pytest.mark.parametrize('method', ['mean', 'max'])
+def test_held_out_false_alarm_rate_matches_contamination(method):
+    rng = np.random.RandomState(4)
+    X_train = rng.randn(5000, 4)
+    X_held_out = rng.randn(5000, 4)
+    hbos = HBOSModel()
+    hbos.fit(X_train)
+    knn = KNNModel(n_neighbors=5)
+    knn.fit(X_train)
+    ensemble = EnsembleModel({'hbos': hbos, 'knn': knn}, method=method, contamination=0.1)
+    ensemble.fit(X_train)
+    
+    # Tablolar k-NN'in eğitim satırlarına verdiği 0 uzaklıkla kurulsaydı oran ~0.15-0.20 olurdu
+    assert abs(ensemble.predict(X_held_out).mean() - 0.1) < 0.02
+
+
+def test_fusion_reuses_thread_pool_until_n_jobs_changes():
+    rng = np.random.RandomState(5)
+    X = rng.randn(1000, 4)
+    hbos = HBOSModel()
+    hbos.fit(X)
+    knn = KNNModel(n_neighbors=3, n_lists=10)
+    knn.fit(X)
+    ensemble = EnsembleModel({'hbos': hbos, 'knn': knn}, n_quantiles=200, n_jobs=2)
+    ensemble.fit(X)
+    
+    expected = ensemble.decision_function(X[:100])
+    pool = ensemble.fusion._pool
+    assert pool is not None
+    ensemble.decision_function(X[:100])
+    assert ensemble.fusion._pool is pool
+    
+    ensemble.set_n_jobs(3)
+    assert ensemble.fusion._pool is None
+    np.testing.assert_allclose(ensemble.decision_function(X[:100]), expected)
+    assert ensemble.fusion._pool is not pool
+    
+    # Havuz kaydedilmez; yüklenen model ilk skorlamada yeni havuz açar
+    restored = pickle.loads(pickle.dumps(ensemble))
+    assert restored.fusion._pool is None
+    np.testing.assert_allclose(restored.decision_function(X[:100]), expected)
@@ -0,0 +1,43 @@
+"""
+HBOSModel testleri
+"""
+import numpy as np
+import pandas as pd
+
+from models.hbos_model import HBOSModel, HistogramScorer
+
+
+def test_fit_accepts_dataframe_with_row_sampling():
+    rng = np.random.RandomState(0)
+    # Karışık indeks: konumsal örneklem etiket ile seçilseydi satırlar kayardı
+    X = pd.DataFrame(rng.randn(500, 3), index=rng.permutation(500) + 1000)
+    
+    from_frame = HBOSModel(sample_size=200)
+    from_frame.fit(X)
+    from_array = HBOSModel(sample_size=200)
+    from_array.fit(X.values)
+    
+    np.testing.assert_allclose(from_frame.decision_function(X), from_array.decision_function(X.values))
+
+
+def test_arrays_round_trip_keeps_scores():
+    rng = np.random.RandomState(1)
+    X = rng.randn(2000, 4)
+    model = HBOSModel(n_bins=20)
+    model.fit(X)
+    
+    engine = HistogramScorer.from_arrays(*model.export_scoring_engine().to_arrays())
+    
+    np.testing.assert_array_equal(engine.decision_function(X[:300]), model.decision_function(X[:300]))
+
+
+def test_held_out_false_alarm_rate_matches_contamination():
+    rng = np.random.RandomState(2)
+    X_train = rng.randn(20000, 5)
+    X_held_out = rng.randn(20000, 5)
+    model = HBOSModel(contamination=0.1)
+    model.fit(X_train)
+    
+    # Offset eğitim skorlarından belirlenir; aynı dağılımdan gelen yeni normal satırların
+    # yaklaşık contamination oranı işaretlenmeli
+    assert abs(model.predict(X_held_out).mean() - 0.1) < 0.02
@@ -0,0 +1,55 @@
+"""
+IsolationForestModel ve FlatIsolationForest testleri
+"""
+import numpy as np
+import pytest
+
+from models.isolation_forest_model import FlatIsolationForest, IsolationForestModel
+
+
+def _trained_model(**params):
+    rng = np.random.RandomState(0)
+    X = rng.randn(2000, 6)
+    model = IsolationForestModel(random_state=0, n_estimators=50, **params)
+    model.fit(X)
+    return model, rng.randn(1500, 6) * 1.5
+
+
+@pytest.mark.parametrize('n_jobs', [1, 3])
+def test_flat_forest_matches_sklearn(n_jobs):
+    model, X_test = _trained_model()
+    engine = model.export_flat_forest()
+    # Küçük parçalar: parça sınırları ve iş parçacıkları arasında bölme de sınanır
+    engine.chunk_size = 100
+    engine.n_jobs = n_jobs
+    
+    np.testing.assert_allclose(engine.decision_function(X_test), model.model.decision_function(X_test),
+                               atol=1e-6)
+
+
+def test_flat_forest_round_trip():
+    model, X_test = _trained_model()
+    engine = model.export_flat_forest()
+    engine.n_jobs = 2
+    
+    restored = FlatIsolationForest.from_arrays(*engine.to_arrays())
+    
+    assert restored.n_jobs == 2
+    np.testing.assert_array_equal(restored.decision_function(X_test), engine.decision_function(X_test))
+
+
+def test_large_single_thread_batches_fall_back_to_sklearn(monkeypatch):
+    model, X_test = _trained_model(flat_engine=True, flat_max_rows=1000)
+    model.set_n_jobs(1)
+    calls = []
+    monkeypatch.setattr(model.flat_forest, 'decision_function',
+                        lambda X: calls.append(len(X)) or model.model.decision_function(X))
+    
+    model.decision_function(X_test[:500])
+    model.decision_function(X_test)
+    assert calls == [500]
+    
+    # Birden çok iş parçacığıyla düz motor her boyutta kullanılır
+    model.set_n_jobs(2)
+    model.decision_function(X_test)
+    assert calls == [500, 1500]
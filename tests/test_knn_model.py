@@ -0,0 +1,62 @@
+"""
+KNNModel ve IVFIndex testleri
+"""
+import numpy as np
+import pandas as pd
+
+from models.knn_model import IVFIndex, KNNModel
+
+
+def _brute_force_mean_distance(X_train, X_query, n_neighbors):
+    distances = np.sqrt(((X_query[:, None, :] - X_train[None, :, :]) ** 2).sum(axis=2))
+    return np.sort(distances, axis=1)[:, :n_neighbors].mean(axis=1)
+
+
+def test_full_probe_matches_brute_force():
+    rng = np.random.RandomState(0)
+    X_train = rng.randn(1500, 6)
+    X_query = rng.randn(300, 6) * 1.5
+    
+    model = KNNModel(n_neighbors=5, n_lists=20, n_probe=20, chunk_size=64, n_jobs=2)
+    model.fit(X_train)
+    
+    assert model.index.n_probe == model.index.centroids.shape[0]
+    np.testing.assert_allclose(model.index.kneighbors_distance(X_query),
+                               _brute_force_mean_distance(X_train, X_query, 5), rtol=1e-4, atol=1e-4)
+
+
+def test_fit_accepts_dataframe():
+    rng = np.random.RandomState(1)
+    X = rng.randn(800, 4)
+    
+    from_frame = KNNModel(n_neighbors=3, n_lists=10, kmeans_sample_size=200, offset_sample_size=100)
+    from_frame.fit(pd.DataFrame(X))
+    from_array = KNNModel(n_neighbors=3, n_lists=10, kmeans_sample_size=200, offset_sample_size=100)
+    from_array.fit(X)
+    
+    np.testing.assert_allclose(from_frame.decision_function(pd.DataFrame(X[:50])),
+                               from_array.decision_function(X[:50]), rtol=1e-3, atol=1e-3)
+
+
+def test_arrays_round_trip_keeps_thread_count():
+    rng = np.random.RandomState(2)
+    X = rng.randn(600, 3)
+    model = KNNModel(n_neighbors=3, n_lists=8, n_jobs=4)
+    model.fit(X)
+    
+    engine = IVFIndex.from_arrays(*model.export_scoring_engine().to_arrays())
+    
+    assert engine.n_jobs == 4
+    np.testing.assert_allclose(engine.decision_function(X[:100]), model.decision_function(X[:100]))
+
+
+def test_held_out_false_alarm_rate_matches_contamination():
+    rng = np.random.RandomState(3)
+    X_train = rng.randn(5000, 4)
+    X_held_out = rng.randn(3000, 4)
+    model = KNNModel(n_neighbors=5, contamination=0.1, offset_sample_size=2000)
+    model.fit(X_train)
+    
+    # Eğitim satırları kendilerine 0 uzaklıkta olduğundan offset en yakın komşu atlanarak
+    # hesaplanır; aksi halde yeni normal satırlar contamination oranından çok daha sık işaretlenir
+    assert abs(model.predict(X_held_out).mean() - 0.1) < 0.03
@@ -0,0 +1,64 @@
+"""
+Ölçüm ve profil yardımcıları testleri
+"""
+import os
+import threading
+
+import pytest
+
+from config.config import METRICS_PARAMS
+from utils.metrics_utils import REGISTRY, instrument
+
+
+@pytest.fixture(autouse=True)
+def metrics(monkeypatch):
+    monkeypatch.setitem(METRICS_PARAMS, 'enabled', True)
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+def test_nested_stages_are_profiled_once(monkeypatch, tmp_path):
+    monkeypatch.setitem(METRICS_PARAMS, 'profile', 'cprofile')
+    monkeypatch.setitem(METRICS_PARAMS, 'profile_stages', ['*'])
+    monkeypatch.setitem(METRICS_PARAMS, 'profile_dir', str(tmp_path))
+    
+    @instrument('test.inner', rows=None)
+    def inner():
+        return sum(range(1000))
+    
+    @instrument('test.outer', rows=None)
+    def outer():
+        return inner() + inner()
+    
+    assert outer() == 2 * sum(range(1000))
+    profiles = [name for name in os.listdir(tmp_path) if name.endswith('.prof')]
+    assert len(profiles) == 1 and profiles[0].startswith('test.outer')
+    assert REGISTRY.snapshot()['test.inner']['calls'] == 2
+
+
+def test_overlapping_stages_report_no_peak(monkeypatch):
+    monkeypatch.setitem(METRICS_PARAMS, 'profile', None)
+    monkeypatch.setitem(METRICS_PARAMS, 'track_allocations', True)
+    inside = threading.Barrier(2)
+    
+    @instrument('test.concurrent', rows=None)
+    def allocate():
+        inside.wait(timeout=5)
+        data = bytearray(1 << 20)
+        inside.wait(timeout=5)
+        return len(data)
+    
+    threads = [threading.Thread(target=allocate) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    
+    stats = REGISTRY.snapshot()['test.concurrent']
+    assert stats['calls'] == 2
+    assert stats['allocated_bytes_max'] == 0
+    
+    allocate_alone = instrument('test.alone', rows=None)(lambda: len(bytearray(1 << 20)))
+    allocate_alone()
+    assert REGISTRY.snapshot()['test.alone']['allocated_bytes_max'] >= 1 << 20
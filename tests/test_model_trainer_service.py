@@ -0,0 +1,86 @@
+"""
+ModelTrainerService testleri
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.model_trainer_service import ModelTrainerService
+from utils.evaluation_utils import EvaluationResult
+
+
+def _data(n_rows, seed):
+    rng = np.random.RandomState(seed)
+    y = (rng.rand(n_rows) < 0.05).astype(int)
+    X = rng.randn(n_rows, 4) + 4 * y[:, None]
+    return pd.DataFrame(X, columns=list('abcd')), pd.Series(y)
+
+
+@pytest.fixture
+def trainer():
+    X_train, y_train = _data(2000, 0)
+    X_test, y_test = _data(1000, 1)
+    trainer = ModelTrainerService()
+    trainer.train_models(X_train, X_test, y_train, y_test, model_names=['hbos'])
+    return trainer
+
+
+def test_threshold_is_selected_on_calibration_data_not_test_scores(trainer):
+    X_val, y_val = _data(1000, 2)
+    test_scores = trainer.results['hbos']['scores'].copy()
+    
+    operating_point = trainer.select_threshold('hbos', alert_budget_per_10k=500, X=X_val, y=y_val)
+    
+    expected = EvaluationResult(y_val, None, trainer.models['hbos'].decision_function(X_val.values))
+    assert operating_point['threshold'] == expected.select_operating_point(500)['threshold']
+    assert trainer.models['hbos'].threshold == operating_point['threshold']
+    # Test skorları yeniden hesaplanmaz; yalnızca etiketler yeni eşiğe göre güncellenir
+    np.testing.assert_array_equal(trainer.results['hbos']['scores'], test_scores)
+    np.testing.assert_array_equal(trainer.results['hbos']['predictions'],
+                                  (test_scores <= operating_point['threshold']).astype(int))
+
+
+def test_calibration_data_requires_labels(trainer):
+    X_val, _ = _data(100, 3)
+    with pytest.raises(ValueError):
+        trainer.select_threshold('hbos', X=X_val)
+
+
+def test_load_models_reloads_saved_ensemble(trainer, tmp_path):
+    X_train, _ = _data(500, 3)
+    X_test, y_test = _data(300, 4)
+    trainer.train_ensemble(X_train, X_test, y_test, model_names=['hbos'])
+    prefix = str(tmp_path / 'models')
+    trainer.save_models(prefix)
+    
+    loaded = ModelTrainerService().load_models(prefix)
+    
+    assert set(loaded) == {'hbos', 'ensemble'}
+    np.testing.assert_allclose(loaded['ensemble'].decision_function(X_test.values),
+                               trainer.models['ensemble'].decision_function(X_test.values))
+
+
+def test_cascade_keeps_row_order_and_forward_rate():
+    X_train, y_train = _data(3000, 5)
+    X_test, y_test = _data(2000, 6)
+    trainer = ModelTrainerService()
+    trainer.train_models(X_train, X_test, y_train, y_test, model_names=['hbos', 'knn'])
+    trainer.calibrate_cascade(X_train, forward_rate=0.2, prefilter_model='hbos', model='knn')
+    
+    scores, predictions, forwarded = trainer.cascade_score_and_predict(X_test)
+    
+    # İletilen satırlar pahalı modelin kendi skorlarını, diğerleri sabit skoru orijinal sırada alır
+    full_scores, full_predictions = trainer.models['knn'].score_and_predict(X_test.values)
+    np.testing.assert_allclose(scores[forwarded], full_scores[forwarded], atol=1e-5)
+    np.testing.assert_array_equal(predictions[forwarded], full_predictions[forwarded])
+    assert np.all(scores[~forwarded] == trainer.cascade['cleared_score'])
+    assert np.all(predictions[~forwarded] == 0)
+    
+    permutation = np.random.RandomState(7).permutation(len(X_test))
+    shuffled_scores, _, shuffled_forwarded = trainer.cascade_score_and_predict(X_test.iloc[permutation])
+    np.testing.assert_allclose(shuffled_scores, scores[permutation], atol=1e-5)
+    np.testing.assert_array_equal(shuffled_forwarded, forwarded[permutation])
+    
+    report = trainer.evaluate_cascade(X_test, y_test)
+    assert abs(report['forwarded_rate'] - 0.2) < 0.03
+    assert report['missed_detections'] == int(np.sum((full_predictions == 1) & (y_test.values == 1) & ~forwarded))
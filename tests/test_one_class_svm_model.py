@@ -0,0 +1,41 @@
+"""
+OneClassSVMModel testleri
+"""
+import numpy as np
+import pytest
+
+from models.one_class_svm_model import OneClassSVMModel, _stratified_sample
+
+
+def test_stratified_sample_smaller_than_strata_still_returns_rows():
+    rng = np.random.RandomState(0)
+    X = rng.randn(1000, 3)
+    
+    indices = _stratified_sample(X, 3, 10, np.random.RandomState(1))
+    
+    assert len(indices) == 3
+    assert len(np.unique(indices)) == 3
+
+
+def test_stratified_sample_rejects_empty_sample():
+    with pytest.raises(ValueError):
+        _stratified_sample(np.random.RandomState(0).randn(100, 3), 0, 10, np.random.RandomState(1))
+
+
+@pytest.mark.parametrize('gamma', ['scale', 'auto', 0.3])
+@pytest.mark.parametrize('training_mode', ['full', 'sample', 'shards'])
+def test_exported_expansion_matches_sklearn_scores(gamma, training_mode):
+    rng = np.random.RandomState(0)
+    X = (rng.randn(400, 4) * [1.0, 2.0, 0.5, 3.0]).astype(np.float32)
+    model = OneClassSVMModel(training_mode=training_mode, subset_params={'sample_size': 200, 'n_shards': 2},
+                             nu=0.1, gamma=gamma)
+    model.fit(X)
+    
+    engine = model.export_scoring_engine()
+    
+    np.testing.assert_allclose(engine.decision_function(X), model.decision_function(X), rtol=1e-6, atol=1e-6)
+
+
+def test_approx_backend_rejects_non_rbf_kernel():
+    with pytest.raises(ValueError):
+        OneClassSVMModel(backend='approx', kernel='linear')
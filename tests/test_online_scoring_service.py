@@ -0,0 +1,68 @@
+"""
+OnlineScoringService testleri
+"""
+import json
+import threading
+import urllib.request
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from models.hbos_model import HBOSModel
+from services.model_trainer_service import ModelTrainerService
+from services.online_scoring_service import OnlineScoringService
+
+
+@pytest.fixture
+def service():
+    rng = np.random.RandomState(0)
+    X = rng.randn(500, 3)
+    scaler = StandardScaler().fit(X)
+    model = HBOSModel()
+    model.fit(scaler.transform(X))
+    
+    trainer = ModelTrainerService()
+    trainer.models = {'hbos': model}
+    service = OnlineScoringService(trainer, scaler, ['a', 'b', 'c'], model_name='hbos', max_wait_us=0)
+    yield service
+    service.shutdown()
+
+
+def test_non_finite_request_is_rejected_alone(service):
+    with pytest.raises(ValueError, match="NaN/inf"):
+        service.score([{'a': 0.0, 'b': float('nan'), 'c': 1.0}, {'a': 0.0, 'b': 0.0, 'c': 0.0}])
+    
+    result = service.score({'a': 0.0, 'b': 0.0, 'c': 0.0})
+    assert len(result['scores']) == 1 and np.isfinite(result['scores'][0])
+
+
+def test_non_numeric_request_is_rejected(service):
+    with pytest.raises(ValueError, match="sayısal"):
+        service.score([0.0, 'x', 1.0])
+
+
+def test_server_handles_burst_of_concurrent_clients(service):
+    server = service.start(host='127.0.0.1', port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/score"
+    body = json.dumps({'transaction': {'a': 0.1, 'b': -0.2, 'c': 0.3}}).encode()
+    statuses, errors = [], []
+    barrier = threading.Barrier(200)
+    
+    def post():
+        barrier.wait()
+        try:
+            request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(request, timeout=30) as response:
+                statuses.append(response.status)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=post) for _ in range(200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert statuses == [200] * 200
@@ -0,0 +1,29 @@
+"""
+PCAProjection testleri
+"""
+import numpy as np
+import pandas as pd
+
+from utils.projection_utils import PCAProjection
+
+
+def test_fit_samples_rows_of_large_dataframe():
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.randn(600, 5), columns=[f"V{i}" for i in range(5)])
+    
+    projection = PCAProjection(method='full', sample_size=200).fit(X)
+    
+    assert projection.n_fit_rows == 200
+    assert projection.components_.shape == (2, 5)
+    assert projection.transform(X).shape == (600, 2)
+
+
+def test_dataframe_and_array_inputs_give_same_projection():
+    rng = np.random.RandomState(1)
+    values = rng.randn(500, 4)
+    
+    from_frame = PCAProjection(method='full', sample_size=100, random_state=3).fit(pd.DataFrame(values))
+    from_array = PCAProjection(method='full', sample_size=100, random_state=3).fit(values)
+    
+    np.testing.assert_allclose(from_frame.components_, from_array.components_)
+    np.testing.assert_allclose(from_frame.mean_, from_array.mean_)
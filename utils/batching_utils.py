@@ -0,0 +1,190 @@
+"""
+İstek birleştirme (micro-batching) yardımcıları
+
+Tek satırlık skor isteklerinde sklearn'ün çağrı başına sabit maliyeti (girdi doğrulama,
+ağaç başına Python dağıtımı, dizi ayırma) satır başına maliyetin çok üstündedir. Bu
+modüldeki birleştirici, eşzamanlı gelen istekleri kısa bir süre biriktirip tek bir
+vektörize çağrıyla skorlar ve sonuçları çağıranlara dağıtır.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from config.config import COALESCER_PARAMS
+
+
+class RequestCoalescer:
+    """
+    Skor isteklerini batch'lere toplayan, thread'lerden ve asyncio'dan güvenle
+    kullanılabilen birleştirici. Skor fonksiyonu yalnızca birleştiricinin kendi
+    thread'inde çağrılır, bu yüzden modelin thread-safe olması gerekmez.
+    
+    Örnek:
+        coalescer = RequestCoalescer(model.decision_function)
+        score = coalescer.submit(x_row)                # thread'den
+        score = await coalescer.submit_async(x_row)    # asyncio'dan
+    """
+    
+    def __init__(self, score_fn, max_batch_size: int = None, max_wait_us: float = None,
+                 on_batch=None, name: str = 'request-coalescer'):
+        """
+        Args:
+            score_fn: (n_rows, n_features) matrisi alıp dizi ya da dizi tuple'ı döndüren fonksiyon
+                (örn. model.decision_function veya model.score_and_predict)
+            max_batch_size: Bir çağrıdaki en fazla satır sayısı
+            max_wait_us: İlk istekten sonra batch doldurmak için en fazla bekleme (mikrosaniye)
+            on_batch: Her batch sonrası satır sayısıyla çağrılan isteğe bağlı fonksiyon
+            name: Arka plan thread'inin adı
+        """
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size or COALESCER_PARAMS['max_batch_size']
+        if max_wait_us is None:
+            max_wait_us = COALESCER_PARAMS['max_wait_us']
+        self.max_wait = max_wait_us / 1e6
+        self.on_batch = on_batch
+        
+        self.batches = 0
+        self.rows = 0
+        
+        self._queue = queue.Queue()
+        self._closed = False
+        # Kapanış kontrolü ve kuyruğa ekleme birlikte yapılır; durdurma işaretinden sonra istek eklenmez
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    def submit(self, X):
+        """
+        İsteği kuyruğa ekler ve sonucu bekler (bloklayan, thread-safe).
+        
+        Args:
+            X: Tek satır (1 boyutlu) veya satırlar (2 boyutlu)
+            
+        Returns:
+            Tek satır için satırın sonucu, çok satır için sonuç dilimleri
+        """
+        return self.submit_future(X).result()
+    
+    async def submit_async(self, X):
+        """
+        İsteği kuyruğa ekler ve olay döngüsünü bloklamadan sonucu bekler.
+        
+        Args:
+            X: Tek satır (1 boyutlu) veya satırlar (2 boyutlu)
+            
+        Returns:
+            submit() ile aynı
+        """
+        return await asyncio.wrap_future(self.submit_future(X))
+    
+    def submit_future(self, X) -> Future:
+        """
+        İsteği kuyruğa ekler ve sonucu taşıyacak Future nesnesini döner.
+        
+        Args:
+            X: Tek satır (1 boyutlu) veya satırlar (2 boyutlu)
+            
+        Returns:
+            concurrent.futures.Future: Sonuç
+        """
+        X = np.asarray(X)
+        single = X.ndim == 1
+        if single:
+            X = X.reshape(1, -1)
+        
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Birleştirici kapatılmış.")
+            self._queue.put((X, single, future))
+        return future
+    
+    def close(self):
+        """Yeni istekleri reddeder ve kuyruktaki istekler bittikten sonra thread'i durdurur"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+    
+    def _run(self):
+        # Batch'e sığmayıp bir sonraki batch'i başlatacak istek
+        carried = None
+        while True:
+            first = carried if carried is not None else self._queue.get()
+            carried = None
+            if first is None:
+                return
+            
+            items = [first]
+            n_rows = len(first[0])
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            
+            # Süre dolana ya da batch dolana kadar yeni istekleri topla
+            while n_rows < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                if n_rows + len(item[0]) > self.max_batch_size:
+                    carried = item
+                    break
+                items.append(item)
+                n_rows += len(item[0])
+            
+            self._score_batch(items, n_rows)
+            if stop:
+                return
+    
+    def _score_batch(self, items, n_rows: int):
+        """
+        Toplanan istekleri tek çağrıyla skorlar ve sonuçları Future'lara dağıtır. Tek başına
+        max_batch_size'ı aşan istek max_batch_size satırlık çağrılara bölünür. Hata thread'i
+        durdurmaz; sonuç almamış tüm Future'lar hatayla tamamlanır.
+        """
+        try:
+            X = items[0][0] if len(items) == 1 else np.vstack([item[0] for item in items])
+            if n_rows > self.max_batch_size:
+                result = _concat_results([self.score_fn(X[start:start + self.max_batch_size])
+                                          for start in range(0, n_rows, self.max_batch_size)])
+            else:
+                result = self.score_fn(X)
+            
+            self.batches += 1
+            self.rows += n_rows
+            if self.on_batch is not None:
+                self.on_batch(n_rows)
+            
+            offset = 0
+            for X_item, single, future in items:
+                end = offset + len(X_item)
+                future.set_result(_slice_result(result, offset, end, single))
+                offset = end
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def _concat_results(results):
+    """Parça sonuçlarını birleştirir (tuple sonuçlar eleman bazında)"""
+    if isinstance(results[0], tuple):
+        return tuple(_concat_results([result[i] for result in results]) for i in range(len(results[0])))
+    return np.concatenate(results)
+
+
+def _slice_result(result, start: int, end: int, single: bool):
+    """Batch sonucundan bir isteğe ait dilimi çıkarır (tuple sonuçlar eleman bazında)"""
+    if isinstance(result, tuple):
+        return tuple(_slice_result(part, start, end, single) for part in result)
+    return result[start] if single else result[start:end]
@@ -0,0 +1,278 @@
+"""
+Veri seti önbelleği yardımcı fonksiyonları
+
+CSV dosyaları ilk okumada sütun başına bir .npy dosyasına dönüştürülür. Sonraki
+çalıştırmalar metin ayrıştırması yapmadan ikili dosyaları okur. Önbellek anahtarı
+kaynak dosyanın boyutu, değiştirilme zamanı ve içerik özetinden oluşur; bunlardan
+biri değiştiğinde önbellek geçersiz sayılır ve yeniden oluşturulur.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+
+CACHE_FORMAT_VERSION = 1
+
+# 'sample' modunda özet için okunan blok boyutu (baş, orta ve son)
+_SAMPLE_BLOCK_SIZE = 1 << 20
+
+
+def file_fingerprint(file_path, hash_mode='sample'):
+    """
+    Kaynak dosyanın önbellek anahtarını hesaplar.
+    
+    Args:
+        file_path: Kaynak dosya yolu
+        hash_mode: 'sample' (baş/orta/son 1 MB) veya 'full' (tüm dosya)
+        
+    Returns:
+        dict: size, mtime_ns, hash ve bunlardan türetilen key
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    
+    with open(file_path, 'rb') as f:
+        if hash_mode == 'full':
+            for block in iter(lambda: f.read(_SAMPLE_BLOCK_SIZE * 8), b''):
+                digest.update(block)
+        elif hash_mode == 'sample':
+            for offset in (0, stat.st_size // 2, max(stat.st_size - _SAMPLE_BLOCK_SIZE, 0)):
+                f.seek(offset)
+                digest.update(f.read(_SAMPLE_BLOCK_SIZE))
+        else:
+            raise ValueError(f"Geçersiz hash_mode: '{hash_mode}'. 'sample' veya 'full' olmalı.")
+    
+    content_hash = digest.hexdigest()
+    key = hashlib.blake2b(
+        f"{stat.st_size}:{stat.st_mtime_ns}:{content_hash}:{CACHE_FORMAT_VERSION}".encode(),
+        digest_size=8
+    ).hexdigest()
+    
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': content_hash,
+        'key': key
+    }
+
+
+def get_cache_path(file_path, cache_dir, fingerprint):
+    """
+    Kaynak dosya ve anahtar için önbellek klasörünün yolunu döner.
+    
+    Args:
+        file_path: Kaynak dosya yolu
+        cache_dir: Önbellek kök klasörü
+        fingerprint: file_fingerprint() çıktısı
+        
+    Returns:
+        str: Önbellek klasörü yolu
+    """
+    return os.path.join(cache_dir, f"{_cache_prefix(file_path)}-{fingerprint['key']}")
+
+
+def _cache_prefix(file_path):
+    """Aynı adlı farklı kaynakların karışmaması için dosya adı + yol özeti"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    path_hash = hashlib.blake2b(os.path.abspath(file_path).encode(), digest_size=4).hexdigest()
+    return f"{stem}-{path_hash}"
+
+
+def load_column_cache(cache_path, mmap_mode=None):
+    """
+    Sütun önbelleğini yükler.
+    
+    Args:
+        cache_path: Önbellek klasörü
+        mmap_mode: None ise sütunlar belleğe okunur, 'r' ise bellek eşlemeli açılır
+        
+    Returns:
+        dict or None: Sütun adı -> numpy.ndarray (sıralı), önbellek yoksa None
+    """
+    meta_path = os.path.join(cache_path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    
+    with open(meta_path) as f:
+        meta = json.load(f)
+    
+    if meta.get('version') != CACHE_FORMAT_VERSION:
+        return None
+    
+    return {
+        column: np.load(os.path.join(cache_path, f"{i}.npy"), mmap_mode=mmap_mode)
+        for i, column in enumerate(meta['columns'])
+    }
+
+
+def write_column_cache(df, file_path, cache_dir, fingerprint):
+    """
+    DataFrame'i sütun başına .npy dosyası olarak önbelleğe yazar. Aynı kaynağa ait
+    eski önbellekler silinir. Yazma geçici klasörde yapılıp tek adımda taşındığından
+    yarım kalan bir önbellek okunmaz; hata durumunda geçici klasör silinir.
+    
+    Args:
+        df: Yazılacak DataFrame
+        file_path: Kaynak dosya yolu
+        cache_dir: Önbellek kök klasörü
+        fingerprint: file_fingerprint() çıktısı
+        
+    Returns:
+        str: Oluşturulan önbellek klasörü
+    """
+    object_columns = [str(column) for column in df.columns if not _is_numeric(df[column])]
+    if object_columns:
+        raise ValueError(f"Metin sütunları önbelleğe alınamaz: {object_columns}")
+    
+    cache_path = get_cache_path(file_path, cache_dir, fingerprint)
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+    os.makedirs(tmp_path, exist_ok=True)
+    
+    try:
+        for i, column in enumerate(df.columns):
+            np.save(os.path.join(tmp_path, f"{i}.npy"), np.ascontiguousarray(df[column].to_numpy()))
+        
+        _finalize_cache(tmp_path, cache_path, file_path, cache_dir, fingerprint,
+                        [str(column) for column in df.columns], len(df))
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return cache_path
+
+
+def build_column_cache_chunked(file_path, cache_dir, fingerprint, chunk_size=100000):
+    """
+    CSV'yi belleğe tamamen almadan, parça parça okuyarak sütun önbelleği oluşturur.
+    Satır sayısı önce satır sonları sayılarak bulunur, sütunlar diskte önceden ayrılmış
+    .npy dosyalarına doğrudan yazılır. Sütun tipleri ilk parçadan belirlenir; sonraki
+    parçalardaki tipler bu tiplere güvenle dönüşmüyorsa (örn. tamsayı sütunda ondalık
+    veya boş değer) sessizce kırpmak yerine hata verilir. Hata durumunda yarım yazılmış
+    geçici klasör silinir.
+    
+    Args:
+        file_path: Kaynak CSV dosyası
+        cache_dir: Önbellek kök klasörü
+        fingerprint: file_fingerprint() çıktısı
+        chunk_size: Parça başına satır sayısı
+        
+    Returns:
+        str: Oluşturulan önbellek klasörü
+    """
+    n_rows = _count_data_rows(file_path)
+    
+    cache_path = get_cache_path(file_path, cache_dir, fingerprint)
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+    os.makedirs(tmp_path, exist_ok=True)
+    
+    try:
+        columns = _write_csv_columns(file_path, tmp_path, n_rows, chunk_size)
+        _finalize_cache(tmp_path, cache_path, file_path, cache_dir, fingerprint, columns, n_rows)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return cache_path
+
+
+def _write_csv_columns(file_path, tmp_path, n_rows, chunk_size):
+    """CSV'yi parça parça okuyup sütunları tmp_path'teki önceden ayrılmış .npy dosyalarına yazar"""
+    import pandas as pd
+    
+    outputs = None
+    columns = None
+    offset = 0
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+        if outputs is None:
+            columns = [str(column) for column in chunk.columns]
+            object_columns = [column for column in chunk.columns if not _is_numeric(chunk[column])]
+            if object_columns:
+                raise ValueError(f"Metin sütunları önbelleğe alınamaz: {object_columns}")
+            outputs = [
+                np.lib.format.open_memmap(os.path.join(tmp_path, f"{i}.npy"), mode='w+',
+                                          dtype=chunk[column].dtype, shape=(n_rows,))
+                for i, column in enumerate(chunk.columns)
+            ]
+        else:
+            _check_chunk_dtypes(chunk, outputs, file_path, offset)
+        end = offset + len(chunk)
+        if end > n_rows:
+            raise ValueError(f"'{file_path}' satır sayısı beklenenden fazla ({n_rows}).")
+        for output, column in zip(outputs, chunk.columns):
+            output[offset:end] = chunk[column].to_numpy()
+        offset = end
+    
+    if offset != n_rows:
+        raise ValueError(f"'{file_path}' için {n_rows} satır beklendi, {offset} satır okundu.")
+    
+    for output in outputs or []:
+        output.flush()
+    return columns or []
+
+
+def _is_numeric(column):
+    """Sütun .npy olarak yazılabilir mi (pandas 3 metin sütunları object değil 'str' tipindedir)"""
+    import pandas as pd
+    return pd.api.types.is_numeric_dtype(column.dtype)
+
+
+def _check_chunk_dtypes(chunk, outputs, file_path, offset):
+    """Parçanın sütun tiplerinin ilk parçadan belirlenen önbellek tiplerine güvenle dönüştüğünü doğrular"""
+    mismatched = [f"{column} ({chunk[column].dtype} -> {output.dtype})"
+                  for output, column in zip(outputs, chunk.columns)
+                  if not np.can_cast(chunk[column].dtype, output.dtype, casting='safe')]
+    if mismatched:
+        raise ValueError(f"'{file_path}' satır {offset} sonrasında sütun tipleri ilk parçayla uyumsuz: "
+                         f"{mismatched}. Tiplerin doğru belirlenmesi için chunk_size değerini artırın.")
+
+
+def _finalize_cache(tmp_path, cache_path, file_path, cache_dir, fingerprint, columns, n_rows):
+    """Meta veriyi yazar, aynı kaynağın eski önbelleklerini siler ve geçici klasörü yerine taşır"""
+    meta = {
+        'version': CACHE_FORMAT_VERSION,
+        'source': os.path.abspath(file_path),
+        'size': fingerprint['size'],
+        'mtime_ns': fingerprint['mtime_ns'],
+        'hash': fingerprint['hash'],
+        'columns': columns,
+        'n_rows': n_rows
+    }
+    with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    
+    # Aynı kaynağın eski anahtarlı önbelleklerini temizle
+    stale_pattern = re.compile(re.escape(_cache_prefix(file_path)) + r'-[0-9a-f]{16}')
+    for name in os.listdir(cache_dir):
+        if stale_pattern.fullmatch(name):
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+    
+    os.replace(tmp_path, cache_path)
+
+
+def _count_data_rows(file_path):
+    """CSV'deki veri satırı sayısını (başlık hariç) satır sonlarını sayarak bulur"""
+    n_newlines = 0
+    last_byte = b'\n'
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_SAMPLE_BLOCK_SIZE * 8), b''):
+            n_newlines += block.count(b'\n')
+            last_byte = block[-1:]
+    # Son satır satır sonu ile bitmiyorsa o da bir satırdır
+    n_lines = n_newlines + (0 if last_byte == b'\n' else 1)
+    return max(n_lines - 1, 0)
+
+
+def columns_to_dataframe(columns):
+    """
+    Sütun sözlüğünü ek kopya yapmadan DataFrame'e çevirir.
+    
+    Args:
+        columns: Sütun adı -> numpy.ndarray
+        
+    Returns:
+        pandas.DataFrame: Veri seti
+    """
+    import pandas as pd
+    return pd.DataFrame(columns, copy=False)
@@ -1,7 +1,259 @@
 """
 Model değerlendirme yardımcı fonksiyonları
 """
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+import copy
+
+import numpy as np
+
+from utils.metrics_utils import instrument
+
+
+def apply_threshold(scores, threshold=None):
+    """
+    Skorları etiketlere çevirir (1: anomali, 0: normal).
+    
+    Args:
+        scores: Karar fonksiyonu skorları (düşük skor daha anormal)
+        threshold: Çalışma noktası eşiği; skoru eşiğe eşit veya daha düşük satırlar anomali
+            sayılır. None ise modelin varsayılan kuralı (negatif skor anomali) kullanılır
+            
+    Returns:
+        numpy.ndarray: Etiketler
+    """
+    if threshold is None:
+        return np.where(scores < 0, 1, 0)
+    return np.where(scores <= threshold, 1, 0)
+
+
+class EvaluationResult:
+    """
+    Bir modelin test sonuçlarından türetilen tüm değerlendirme çıktıları.
+    
+    Skorlar bir kez sıralanır; ROC ve Precision-Recall eğrileri, ROC AUC, ortalama kesinlik
+    (average precision) ve eşik tablosu aynı kümülatif geçişten türetilir. Confusion
+    matrix ve etiket metrikleri tek bir bincount ile hesaplanır. Grafikler eğrileri
+    yeniden hesaplamak yerine bu nesneyi kullanır.
+    
+    Skor kuralı modellerdeki gibidir: düşük skor daha anormaldir (anomali skoru = -skor).
+    """
+    
+    @instrument('evaluation.evaluate', rows=1)
+    def __init__(self, y_true, y_pred, y_scores=None):
+        """
+        Args:
+            y_true: Gerçek etiketler (1: anomali, 0: normal)
+            y_pred: Tahmin edilen etiketler (None ise yalnızca skor tabanlı çıktılar hesaplanır)
+            y_scores: Anomali skorları (karar fonksiyonu; None ise yalnızca tahmin tabanlı metrikler)
+        """
+        y_true = np.asarray(y_true).astype(np.int64).ravel()
+        
+        self.n_samples = y_true.shape[0]
+        self.n_positive = int(y_true.sum())
+        self.n_negative = self.n_samples - self.n_positive
+        
+        # Tahmin tabanlı metrikler: [[tn, fp], [fn, tp]]
+        self.confusion_matrix = None
+        if y_pred is not None:
+            y_pred = np.asarray(y_pred).astype(np.int64).ravel()
+            self.confusion_matrix = np.bincount(2 * y_true + y_pred, minlength=4).reshape(2, 2)
+        
+        self.thresholds = self.tps = self.fps = None
+        if y_scores is None:
+            return
+        
+        y_scores = np.asarray(y_scores, dtype=np.float64).ravel()
+        if y_true.shape != y_scores.shape:
+            raise ValueError(f"Etiket ve skor sayısı farklı: {y_true.shape[0]} != {y_scores.shape[0]}")
+        
+        # Tek sıralama: en anormal skordan başlayarak eşik başına kümülatif TP/FP
+        order = np.argsort(y_scores, kind='stable')
+        sorted_scores = y_scores[order]
+        sorted_true = y_true[order]
+        last_of_value = np.r_[np.flatnonzero(np.diff(sorted_scores)), self.n_samples - 1]
+        self.thresholds = sorted_scores[last_of_value]
+        self.tps = np.cumsum(sorted_true)[last_of_value]
+        self.fps = last_of_value + 1 - self.tps
+    
+    def _require_both_classes(self):
+        """Skor tabanlı eğriler için skorların verildiğini ve iki sınıfın da bulunduğunu doğrular"""
+        if self.thresholds is None:
+            raise ValueError("Skor tabanlı eğriler için y_scores gerekli.")
+        if self.n_positive == 0 or self.n_negative == 0:
+            raise ValueError("ROC/PR eğrileri için etiketlerde iki sınıf da bulunmalı.")
+    
+    def _require_predictions(self):
+        """Tahmin tabanlı metrikler için y_pred verildiğini doğrular"""
+        if self.confusion_matrix is None:
+            raise ValueError("Tahmin tabanlı metrikler için y_pred gerekli.")
+    
+    @property
+    def roc_curve(self):
+        """(fpr, tpr, thresholds); ilk nokta (0, 0) için eşik -inf'tir"""
+        self._require_both_classes()
+        fpr = np.r_[0.0, self.fps / self.n_negative]
+        tpr = np.r_[0.0, self.tps / self.n_positive]
+        return fpr, tpr, np.r_[-np.inf, self.thresholds]
+    
+    @property
+    def pr_curve(self):
+        """(precision, recall, thresholds); son nokta (kesinlik 1, duyarlılık 0) için eşik yoktur"""
+        self._require_both_classes()
+        precision = self.tps / (self.tps + self.fps)
+        recall = self.tps / self.n_positive
+        return np.r_[precision[::-1], 1.0], np.r_[recall[::-1], 0.0], self.thresholds[::-1]
+    
+    @property
+    def roc_auc(self) -> float:
+        """ROC eğrisi altındaki alan (eşit skorlar yamuk kuralıyla)"""
+        fpr, tpr, _ = self.roc_curve
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+    
+    @property
+    def average_precision(self) -> float:
+        """Ortalama kesinlik: sum((R_n - R_n-1) * P_n)"""
+        self._require_both_classes()
+        precision = self.tps / (self.tps + self.fps)
+        recall = self.tps / self.n_positive
+        return float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+    
+    @property
+    def accuracy(self) -> float:
+        """Doğruluk"""
+        self._require_predictions()
+        return float(np.trace(self.confusion_matrix) / self.n_samples)
+    
+    @property
+    def precision(self) -> float:
+        """Kesinlik (precision)"""
+        self._require_predictions()
+        (_, fp), (_, tp) = self.confusion_matrix
+        return float(tp / (tp + fp)) if tp + fp > 0 else 0.0
+    
+    @property
+    def recall(self) -> float:
+        """Duyarlılık (recall)"""
+        self._require_predictions()
+        (_, _), (fn, tp) = self.confusion_matrix
+        return float(tp / (tp + fn)) if tp + fn > 0 else 0.0
+    
+    @property
+    def f1(self) -> float:
+        """F1 skoru"""
+        self._require_predictions()
+        (_, fp), (fn, tp) = self.confusion_matrix
+        return float(2 * tp / (2 * tp + fp + fn)) if tp + fp + fn > 0 else 0.0
+    
+    @property
+    def metrics(self) -> list:
+        """[accuracy, precision, recall, f1, roc_auc] (evaluate_model ile aynı sıra)"""
+        return [self.accuracy, self.precision, self.recall, self.f1, self.roc_auc]
+    
+    def threshold_table(self, max_rows: int = None) -> dict:
+        """
+        Eşik başına işaretlenen satır, 10 bin satırdaki alarm sayısı, TP, FP, kesinlik,
+        duyarlılık, F1 ve FPR tablosu. Skoru eşiğe eşit veya daha düşük olan satırlar
+        anomali sayılır.
+        
+        Args:
+            max_rows: En fazla satır sayısı (eşikler işaretlenen satır sayısına göre eşit
+                aralıklarla seçilir, None ise tüm eşikler)
+                
+        Returns:
+            dict: threshold, n_flagged, alerts_per_10k, tp, fp, precision, recall, f1, fpr dizileri
+        """
+        if self.thresholds is None:
+            raise ValueError("Eşik tablosu için y_scores gerekli.")
+        
+        index = np.arange(self.thresholds.shape[0])
+        if max_rows is not None and index.shape[0] > max_rows:
+            index = np.unique(np.linspace(0, index.shape[0] - 1, max_rows).round().astype(np.int64))
+        
+        tps, fps = self.tps[index], self.fps[index]
+        return {
+            'threshold': self.thresholds[index],
+            'n_flagged': tps + fps,
+            'alerts_per_10k': (tps + fps) * (10000 / self.n_samples),
+            'tp': tps,
+            'fp': fps,
+            'precision': tps / (tps + fps),
+            'recall': tps / self.n_positive if self.n_positive else np.zeros(index.shape[0]),
+            # 2TP / (2TP + FP + FN), FN = P - TP
+            'f1': 2 * tps / (tps + fps + self.n_positive),
+            'fpr': fps / self.n_negative if self.n_negative else np.zeros(index.shape[0])
+        }
+    
+    def select_operating_point(self, alert_budget_per_10k: float = None, min_precision: float = None) -> dict:
+        """
+        Eşik tablosundan bir çalışma noktası seçer. Kısıtları sağlayan eşikler arasından
+        duyarlılığı en yüksek olan (eşitlikte daha az alarm üreten) seçilir; kısıt
+        verilmezse F1'i en yüksek eşik seçilir.
+        
+        Args:
+            alert_budget_per_10k: 10 bin satırda izin verilen en fazla alarm sayısı
+            min_precision: En düşük kesinlik
+            
+        Returns:
+            dict: Seçilen satırın threshold_table() değerleri (tek değerler)
+        """
+        self._require_both_classes()
+        table = self.threshold_table()
+        
+        feasible = np.ones(table['threshold'].shape[0], dtype=bool)
+        if alert_budget_per_10k is not None:
+            feasible &= table['alerts_per_10k'] <= alert_budget_per_10k
+        if min_precision is not None:
+            feasible &= table['precision'] >= min_precision
+        if not feasible.any():
+            raise ValueError(f"Kısıtları sağlayan eşik yok (alarm bütçesi: {alert_budget_per_10k}/10k, "
+                             f"en düşük kesinlik: {min_precision}).")
+        
+        # Tablo eşiğe göre artan sıralı: alarm sayısı ve duyarlılık eşikle birlikte artar
+        candidates = np.flatnonzero(feasible)
+        if alert_budget_per_10k is None and min_precision is None:
+            best = candidates[np.argmax(table['f1'][candidates])]
+        else:
+            best = candidates[np.argmax(table['recall'][candidates])]
+        return {key: values[best].item() for key, values in table.items()}
+    
+    def at_threshold(self, threshold: float):
+        """
+        Aynı eğrileri paylaşan, etiket metrikleri verilen eşiğe göre hesaplanmış yeni sonuç
+        döner. Confusion matrix kümülatif sayımlardan okunur; skorlar yeniden sıralanmaz.
+        
+        Args:
+            threshold: Çalışma noktası eşiği (skoru eşiğe eşit veya daha düşük satırlar anomali)
+            
+        Returns:
+            EvaluationResult: Eşiğe göre güncellenmiş sonuç
+        """
+        if self.thresholds is None:
+            raise ValueError("Eşik değerlendirmesi için y_scores gerekli.")
+        
+        index = int(np.searchsorted(self.thresholds, threshold, side='right')) - 1
+        tp, fp = (int(self.tps[index]), int(self.fps[index])) if index >= 0 else (0, 0)
+        
+        result = copy.copy(self)
+        result.confusion_matrix = np.array([[self.n_negative - fp, fp], [self.n_positive - tp, tp]])
+        return result
+    
+    def print_report(self, model_name):
+        """
+        Metrikleri yazdırır.
+        
+        Args:
+            model_name: Model adı
+            
+        Returns:
+            EvaluationResult: self
+        """
+        print(f"--- {model_name} Performansı ---")
+        print(f"Doğruluk: {self.accuracy:.4f}")
+        print(f"Kesinlik (Precision): {self.precision:.4f}")
+        print(f"Duyarlılık (Recall): {self.recall:.4f}")
+        print(f"F1 Skoru: {self.f1:.4f}")
+        print(f"ROC AUC Skoru: {self.roc_auc:.4f}")
+        print()
+        return self
 
 
 def evaluate_model(y_true, y_pred, y_scores, model_name):
@@ -17,21 +269,7 @@ def evaluate_model(y_true, y_pred, y_scores, model_name):
     Returns:
         list: [accuracy, precision, recall, f1, roc_auc] metrikleri
     """
-    accuracy = accuracy_score(y_true, y_pred)
-    precision = precision_score(y_true, y_pred, zero_division=0)
-    recall = recall_score(y_true, y_pred, zero_division=0)
-    f1 = f1_score(y_true, y_pred, zero_division=0)
-    roc_auc = roc_auc_score(y_true, -y_scores)
-    
-    print(f"--- {model_name} Performansı ---")
-    print(f"Doğruluk: {accuracy:.4f}")
-    print(f"Kesinlik (Precision): {precision:.4f}")
-    print(f"Duyarlılık (Recall): {recall:.4f}")
-    print(f"F1 Skoru: {f1:.4f}")
-    print(f"ROC AUC Skoru: {roc_auc:.4f}")
-    print()
-    
-    return [accuracy, precision, recall, f1, roc_auc]
+    return EvaluationResult(y_true, y_pred, y_scores).print_report(model_name).metrics
 
 
 def calculate_confusion_matrix_metrics(y_true, y_pred):
@@ -62,6 +300,26 @@ def calculate_confusion_matrix_metrics(y_true, y_pred):
     return metrics
 
 
+def print_threshold_table(evaluation, model_name, max_rows=None):
+    """
+    Modelin çalışma noktası tablosunu yazdırır.
+    
+    Args:
+        evaluation: EvaluationResult
+        model_name: Model adı
+        max_rows: En fazla satır sayısı (None ise config'den alınır)
+    """
+    from config.config import THRESHOLD_PARAMS
+    
+    table = evaluation.threshold_table(max_rows or THRESHOLD_PARAMS['table_rows'])
+    print(f"--- {model_name} Çalışma Noktaları ---")
+    print(f"{'Eşik':>12}{'Alarm/10k':>12}{'Kesinlik':>12}{'Duyarlılık':>12}{'F1':>12}")
+    for i in range(table['threshold'].shape[0]):
+        print(f"{table['threshold'][i]:>12.4f}{table['alerts_per_10k'][i]:>12.1f}{table['precision'][i]:>12.4f}"
+              f"{table['recall'][i]:>12.4f}{table['f1'][i]:>12.4f}")
+    print()
+
+
 def print_model_summary(metrics_list, model_names):
     """
     Modellerin özet performansını yazdırır.
@@ -0,0 +1,343 @@
+"""
+Çalışma zamanı ölçüm (metrics) ve profil yardımcıları
+
+Servis ve model metotları @instrument ile işaretlenir. Her çağrının süresi, işlenen satır
+sayısı ve ayrılan bellek süreç içi bir kayıt defterine (registry) yazılır; kayıt defteri
+Prometheus metin biçiminde veya JSON olarak dışa aktarılabilir. İsteğe bağlı profil modu
+seçilen aşamaları cProfile veya tracemalloc ile sarar ve çıktıyı dosyaya yazar.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any
+
+from config.config import METRICS_PARAMS
+
+
+class MetricsRegistry:
+    """Aşama başına çağrı sayısı, süre histogramı, satır ve bellek sayaçlarını tutar (thread-safe)"""
+    
+    def __init__(self, buckets=None):
+        """
+        Args:
+            buckets: Süre histogramı üst sınırları (saniye)
+        """
+        self.buckets = tuple(sorted(buckets or METRICS_PARAMS['duration_buckets']))
+        self._stages = {}
+        self._lock = threading.Lock()
+    
+    def record(self, stage: str, seconds: float, rows: int = None, allocated_bytes: int = None,
+               error: bool = False):
+        """
+        Tamamlanan bir çağrıyı kaydeder.
+        
+        Args:
+            stage: Aşama adı (örn. 'preprocessing.load_data')
+            seconds: Çağrı süresi
+            rows: İşlenen satır sayısı
+            allocated_bytes: Çağrı sırasında ayrılan bellek (bayt)
+            error: Çağrı hata ile bittiyse True
+        """
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {
+                    'calls': 0,
+                    'errors': 0,
+                    'seconds_total': 0.0,
+                    'seconds_max': 0.0,
+                    'seconds_last': 0.0,
+                    'rows_total': 0,
+                    'allocated_bytes_total': 0,
+                    'allocated_bytes_max': 0,
+                    'bucket_counts': [0] * len(self.buckets)
+                }
+            
+            stats['calls'] += 1
+            stats['errors'] += int(error)
+            stats['seconds_total'] += seconds
+            stats['seconds_max'] = max(stats['seconds_max'], seconds)
+            stats['seconds_last'] = seconds
+            if rows is not None:
+                stats['rows_total'] += int(rows)
+            if allocated_bytes is not None:
+                stats['allocated_bytes_total'] += int(allocated_bytes)
+                stats['allocated_bytes_max'] = max(stats['allocated_bytes_max'], int(allocated_bytes))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats['bucket_counts'][i] += 1
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Sayaçların anlık görüntüsünü döner.
+        
+        Returns:
+            dict: Aşama adı -> sayaçlar (ortalama süre ve satır/sn dahil)
+        """
+        with self._lock:
+            snapshot = {}
+            for stage, stats in self._stages.items():
+                values = {key: value for key, value in stats.items() if key != 'bucket_counts'}
+                values['seconds_avg'] = stats['seconds_total'] / stats['calls']
+                values['rows_per_sec'] = (stats['rows_total'] / stats['seconds_total']
+                                          if stats['seconds_total'] > 0 else None)
+                values['buckets'] = dict(zip(map(str, self.buckets), stats['bucket_counts']))
+                snapshot[stage] = values
+            return snapshot
+    
+    def to_json(self, indent: int = 2) -> str:
+        """Kayıt defterini JSON metni olarak döner"""
+        return json.dumps(self.snapshot(), indent=indent)
+    
+    def to_prometheus(self, prefix: str = None) -> str:
+        """
+        Kayıt defterini Prometheus metin biçiminde (text exposition format) döner.
+        
+        Args:
+            prefix: Metrik adı öneki (None ise config'den alınır)
+            
+        Returns:
+            str: Prometheus metni
+        """
+        prefix = prefix or METRICS_PARAMS['prometheus_prefix']
+        with self._lock:
+            stages = {stage: dict(stats, bucket_counts=list(stats['bucket_counts']))
+                      for stage, stats in self._stages.items()}
+        
+        lines = []
+        counters = (
+            ('calls_total', 'calls', 'Çağrı sayısı'),
+            ('errors_total', 'errors', 'Hata ile biten çağrı sayısı'),
+            ('rows_total', 'rows_total', 'İşlenen satır sayısı'),
+            ('allocated_bytes_total', 'allocated_bytes_total', 'Ayrılan bellek (bayt)')
+        )
+        for metric, key, description in counters:
+            lines.append(f"# HELP {prefix}_{metric} {description}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for stage, stats in stages.items():
+                lines.append(f'{prefix}_{metric}{{stage="{stage}"}} {stats[key]}')
+        
+        metric = f"{prefix}_duration_seconds"
+        lines.append(f"# HELP {metric} Çağrı süresi (saniye)")
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, stats in stages.items():
+            for bound, count in zip(self.buckets, stats['bucket_counts']):
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {stats["calls"]}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {stats["seconds_total"]}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {stats["calls"]}')
+        
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, filepath: str, fmt: str = None) -> str:
+        """
+        Kayıt defterini dosyaya yazar.
+        
+        Args:
+            filepath: Hedef dosya
+            fmt: 'json' veya 'prometheus' (None ise uzantıdan: .prom -> prometheus)
+            
+        Returns:
+            str: Yazılan dosya yolu
+        """
+        fmt = fmt or ('prometheus' if filepath.endswith(('.prom', '.txt')) else 'json')
+        if fmt not in ('json', 'prometheus'):
+            raise ValueError(f"Geçersiz biçim: '{fmt}'. 'json' veya 'prometheus' olmalı.")
+        
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, 'w') as f:
+            f.write(self.to_json() if fmt == 'json' else self.to_prometheus())
+        print(f"Ölçümler kaydedildi: {filepath}")
+        return filepath
+    
+    def reset(self):
+        """Tüm sayaçları sıfırlar"""
+        with self._lock:
+            self._stages = {}
+
+
+# Süreç genelinde paylaşılan kayıt defteri
+REGISTRY = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Süreç genelindeki kayıt defterini döner"""
+    return REGISTRY
+
+
+def instrument(stage: str, rows=1):
+    """
+    Metodun her çağrısını süreç genelindeki kayıt defterine yazan dekoratör.
+    
+    Args:
+        stage: Aşama adı
+        rows: Satır sayısının kaynağı: konumsal argümanın sırası (varsayılan 1: metotlarda
+            self'ten sonraki ilk argüman), 'result' (dönen değer) veya None
+            
+    Örnek:
+        @instrument('preprocessing.split_data')
+        def split_data(self, X, y): ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS_PARAMS['enabled']:
+                return func(*args, **kwargs)
+            
+            track_allocations = METRICS_PARAMS['track_allocations']
+            if track_allocations:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(METRICS_PARAMS['tracemalloc_frames'])
+                frame = _AllocationFrame()
+            
+            start = time.perf_counter()
+            error = False
+            result = None
+            try:
+                # İç içe veya eşzamanlı aşamalarda yalnızca ilk aşama profillenir
+                if _should_profile(stage) and _profile_lock.acquire(blocking=False):
+                    try:
+                        result = _run_profiled(stage, func, args, kwargs)
+                    finally:
+                        _profile_lock.release()
+                else:
+                    result = func(*args, **kwargs)
+                return result
+            except Exception:
+                error = True
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                allocated = frame.close() if track_allocations else None
+                n_rows = None
+                if rows == 'result' and not error:
+                    n_rows = _count_rows(result)
+                elif isinstance(rows, int) and len(args) > rows:
+                    n_rows = _count_rows(args[rows])
+                REGISTRY.record(stage, seconds, n_rows, allocated, error)
+        return wrapper
+    return decorator
+
+
+def _count_rows(value):
+    """Dizi, DataFrame ya da (X, y) tuple'ının satır sayısını döner"""
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    shape = getattr(value, 'shape', None)
+    if shape:
+        return shape[0]
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+# Açık bellek çerçeveleri (tüm thread'ler); tracemalloc tepe değeri süreç geneli olduğundan
+# çerçeveler tek bir kilitle güncellenir
+_allocation_lock = threading.Lock()
+_open_frames = []
+
+# cProfile/tracemalloc profilleri iç içe veya eşzamanlı çalıştırılmaz
+_profile_lock = threading.Lock()
+
+
+class _AllocationFrame:
+    """
+    tracemalloc ile bir çağrının tepe bellek kullanımını ölçer. İç içe çağrılar tepe
+    değeri sıfırladığından, sıfırlamadan önce açık çerçevelerin tepe değeri güncellenir.
+    
+    tracemalloc tepe değeri süreç genelidir: başka bir thread'de açık bir çerçeveyle
+    örtüşen çerçevelerin tepe değeri diğer aşamanın ayırmalarını da içerir. Bu
+    çerçeveler için tepe bellek raporlanmaz (close() None döner).
+    """
+    
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.overlapped = False
+        with _allocation_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            for frame in _open_frames:
+                frame.peak = max(frame.peak, peak)
+                if frame.thread != self.thread:
+                    frame.overlapped = self.overlapped = True
+            tracemalloc.reset_peak()
+            
+            self.start = current
+            self.peak = current
+            _open_frames.append(self)
+    
+    def close(self):
+        """Çerçeveyi kapatır ve ayrılan tepe belleği (bayt) döner (örtüşmede None)"""
+        with _allocation_lock:
+            _, peak = tracemalloc.get_traced_memory()
+            for frame in _open_frames:
+                frame.peak = max(frame.peak, peak)
+            _open_frames.remove(self)
+        return None if self.overlapped else max(self.peak - self.start, 0)
+
+
+def _should_profile(stage: str) -> bool:
+    """Aşamanın profil moduyla çalıştırılıp çalıştırılmayacağı"""
+    if not METRICS_PARAMS['profile']:
+        return False
+    stages = METRICS_PARAMS['profile_stages']
+    return '*' in stages or stage in stages
+
+
+def _run_profiled(stage: str, func, args, kwargs):
+    """Çağrıyı cProfile veya tracemalloc ile sarar ve çıktıyı profil klasörüne yazar"""
+    mode = METRICS_PARAMS['profile']
+    if mode not in ('cprofile', 'tracemalloc'):
+        raise ValueError(f"Geçersiz profil modu: '{mode}'. 'cprofile' veya 'tracemalloc' olmalı.")
+    
+    os.makedirs(METRICS_PARAMS['profile_dir'], exist_ok=True)
+    base_path = os.path.join(METRICS_PARAMS['profile_dir'],
+                             f"{stage}-{datetime.now():%Y%m%d-%H%M%S-%f}")
+    top_n = METRICS_PARAMS['profile_top_n']
+    
+    if mode == 'cprofile':
+        # Etkin bir profil aracı varken yenisi onu devralır (3.11) veya hata verir (3.12+)
+        if sys.getprofile() is not None:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{base_path}.prof")
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(top_n)
+            with open(f"{base_path}.txt", 'w') as f:
+                f.write(report.getvalue())
+            print(f"Profil kaydedildi: {base_path}.prof")
+    
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(METRICS_PARAMS['tracemalloc_frames'])
+    try:
+        before = tracemalloc.take_snapshot()
+        result = func(*args, **kwargs)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    
+    with open(f"{base_path}.tracemalloc.txt", 'w') as f:
+        for stat in after.compare_to(before, 'lineno')[:top_n]:
+            f.write(f"{stat}\n")
+    print(f"Bellek profili kaydedildi: {base_path}.tracemalloc.txt")
+    return result
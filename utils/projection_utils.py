@@ -0,0 +1,107 @@
+"""
+2 boyutlu izdüşüm (PCA) yardımcıları
+
+Anomali dağılımı grafikleri test verisini PCA ile 2 boyuta indirir. İzdüşüm eğitim
+verisinin bir örnekleminde bir kez fit edilir, modellerle birlikte çıkarım paketine
+kaydedilir ve tüm modellerin grafikleri aynı 2-B koordinatları kullanır.
+"""
+import numpy as np
+
+from config.config import PROJECTION_PARAMS
+from utils.metrics_utils import instrument
+
+
+PROJECTION_METHODS = ('auto', 'full', 'randomized', 'incremental')
+
+
+class PCAProjection:
+    """Fit edilmiş PCA'nın numpy karşılığı: (X - mean) @ components.T"""
+    
+    def __init__(self, n_components: int = 2, method: str = None, sample_size: int = None,
+                 random_state: int = None):
+        """
+        Args:
+            n_components: İzdüşüm boyutu
+            method: 'auto', 'full', 'randomized' veya 'incremental' (None ise config'den alınır)
+                'auto': örneklem büyükse randomized SVD, küçükse tam SVD
+                'incremental': tüm veri parça parça IncrementalPCA ile fit edilir (örneklem alınmaz)
+            sample_size: Fit için kullanılacak en fazla satır sayısı (None ise config'den alınır)
+            random_state: Örneklem ve randomized SVD için tohum
+        """
+        method = method or PROJECTION_PARAMS['method']
+        if method not in PROJECTION_METHODS:
+            raise ValueError(f"Geçersiz izdüşüm yöntemi: '{method}'. Seçenekler: {PROJECTION_METHODS}")
+        
+        self.n_components = n_components
+        self.method = method
+        self.sample_size = sample_size or PROJECTION_PARAMS['sample_size']
+        self.random_state = PROJECTION_PARAMS['random_state'] if random_state is None else random_state
+        self.mean_ = None
+        self.components_ = None
+        self.explained_variance_ratio_ = None
+        self.n_fit_rows = None
+    
+    @instrument('projection.fit')
+    def fit(self, X):
+        """
+        İzdüşümü fit eder.
+        
+        Args:
+            X: Eğitim verisi (ölçeklenmiş)
+            
+        Returns:
+            PCAProjection: self
+        """
+        from sklearn.decomposition import PCA, IncrementalPCA
+        
+        # DataFrame'de X[indisler] sütun seçer; satır örneklemi için numpy dizisine çevir
+        X = X.values if hasattr(X, 'values') else X
+        n_rows = X.shape[0]
+        if self.method == 'incremental':
+            # Bellek kullanımı batch boyutuyla sınırlı; bellek eşlemeli matrislerde de çalışır
+            batch_size = max(PROJECTION_PARAMS['batch_size'], self.n_components)
+            pca = IncrementalPCA(n_components=self.n_components, batch_size=batch_size)
+            for start in range(0, n_rows, batch_size):
+                batch = np.asarray(X[start:start + batch_size], dtype=np.float64)
+                if batch.shape[0] >= self.n_components:
+                    pca.partial_fit(batch)
+            self.n_fit_rows = n_rows
+        else:
+            if n_rows > self.sample_size:
+                rng = np.random.RandomState(self.random_state)
+                X = X[np.sort(rng.choice(n_rows, self.sample_size, replace=False))]
+            solver = self.method
+            if solver == 'auto':
+                solver = 'randomized' if X.shape[0] >= PROJECTION_PARAMS['randomized_min_rows'] else 'full'
+            pca = PCA(n_components=self.n_components, svd_solver=solver, random_state=self.random_state)
+            pca.fit(np.asarray(X, dtype=np.float64))
+            self.n_fit_rows = X.shape[0]
+        
+        self.mean_ = pca.mean_.astype(np.float64)
+        self.components_ = pca.components_.astype(np.float64)
+        self.explained_variance_ratio_ = pca.explained_variance_ratio_.astype(np.float64)
+        return self
+    
+    def transform(self, X):
+        """
+        Veriyi izdüşüm uzayına taşır. Büyük girdiler parça parça işlenir.
+        
+        Args:
+            X: Ölçeklenmiş veri
+            
+        Returns:
+            numpy.ndarray: (n_samples, n_components) koordinatlar
+        """
+        if self.components_ is None:
+            raise ValueError("İzdüşüm henüz fit edilmemiş. Önce fit() metodunu çağırın.")
+        
+        chunk_size = PROJECTION_PARAMS['batch_size']
+        coordinates = np.empty((X.shape[0], self.n_components))
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = np.asarray(X[start:start + chunk_size], dtype=np.float64)
+            coordinates[start:start + chunk.shape[0]] = (chunk - self.mean_) @ self.components_.T
+        return coordinates
+    
+    def fit_transform(self, X):
+        """İzdüşümü fit eder ve aynı veriyi dönüştürür"""
+        return self.fit(X).transform(X)
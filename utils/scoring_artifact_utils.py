@@ -0,0 +1,148 @@
+"""
+Skorlama paketi (scoring artifact) yardımcı fonksiyonları
+
+Çıkarım paketi (joblib) sklearn nesnelerini içerdiğinden yüklenmesi sklearn, scipy ve
+pandas'ın içe aktarılmasını gerektirir; bu da süreç başına saniyeler sürer. Skorlama
+paketi aynı modelleri yalnızca numpy dizileri olarak tutar: her dizi ayrı bir .npy
+dosyasıdır ve bellek eşlemeli açılır, şema ile sayısal parametreler meta.json'dadır.
+Paketi okuyan süreç sklearn yüklemeden skorlama yapar.
+"""
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+SCORING_ARTIFACT_FORMAT_VERSION = 1
+
+
+class ArrayScaler:
+    """StandardScaler'ın transform adımının numpy karşılığı: (X - mean) / scale"""
+    
+    def __init__(self, mean, scale):
+        self.mean = mean
+        self.scale = scale
+    
+    @classmethod
+    def from_scaler(cls, scaler):
+        """
+        Fit edilmiş sklearn StandardScaler'dan oluşturur.
+        
+        Args:
+            scaler: Fit edilmiş StandardScaler
+            
+        Returns:
+            ArrayScaler: Eşdeğer dönüşüm
+        """
+        n_features = scaler.n_features_in_
+        mean = scaler.mean_ if scaler.with_mean and scaler.mean_ is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std and scaler.scale_ is not None else np.ones(n_features)
+        return cls(np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64))
+    
+    def transform(self, X):
+        """Özellikleri ölçekler"""
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+
+def _engine_types():
+    """Paket içindeki motor tipi adı -> sınıf (kayıtlı modellerin motorları)"""
+    from models.registry import engine_types
+    
+    return engine_types()
+
+
+def save_scoring_artifact(path, scaler, engines, feature_columns, metadata=None):
+    """
+    Scaler'ı ve skorlama motorlarını numpy dizileri olarak kaydeder. Yazma geçici klasörde
+    yapılıp tek adımda taşındığından yarım kalmış bir paket okunmaz.
+    
+    Args:
+        path: Paket klasörü
+        scaler: Fit edilmiş StandardScaler veya ArrayScaler
+        engines: Model adı -> skorlama motoru (kayıtlı modellerin motor tipleri, örn. FlatIsolationForest)
+        feature_columns: Özellik sütunları (sıralı)
+        metadata: Pakete eklenecek ek bilgiler
+        
+    Returns:
+        str: Paket klasörü
+    """
+    if not isinstance(scaler, ArrayScaler):
+        scaler = ArrayScaler.from_scaler(scaler)
+    type_names = {engine_class: name for name, engine_class in _engine_types().items()}
+    
+    tmp_path = f"{path.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    
+    np.save(os.path.join(tmp_path, 'scaler.mean.npy'), scaler.mean)
+    np.save(os.path.join(tmp_path, 'scaler.scale.npy'), scaler.scale)
+    
+    models = {}
+    for model_name, engine in engines.items():
+        if type(engine) not in type_names:
+            raise ValueError(f"'{model_name}' için desteklenmeyen skorlama motoru: {type(engine).__name__}")
+        arrays, meta = engine.to_arrays()
+        for array_name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{model_name}.{array_name}.npy"), np.ascontiguousarray(array))
+        models[model_name] = {
+            'type': type_names[type(engine)],
+            'arrays': list(arrays),
+            'meta': meta
+        }
+    
+    manifest = {
+        'format_version': SCORING_ARTIFACT_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'feature_columns': list(feature_columns),
+        'models': models,
+        'metadata': metadata or {}
+    }
+    with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_scoring_artifact(path, mmap_mode='r'):
+    """
+    Skorlama paketini yükler. Diziler bellek eşlemeli açılır; aynı paketi açan süreçler
+    sayfa önbelleğini paylaşır.
+    
+    Args:
+        path: Paket klasörü
+        mmap_mode: np.load için bellek eşleme modu (None: belleğe oku)
+        
+    Returns:
+        dict: scaler, models (model adı -> motor), feature_columns ve metadata
+    """
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"'{path}' geçerli bir skorlama paketi değil (meta.json yok).")
+    
+    with open(meta_path) as f:
+        manifest = json.load(f)
+    
+    version = manifest.get('format_version')
+    if version != SCORING_ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen skorlama paketi sürümü: {version} "
+                         f"(beklenen: {SCORING_ARTIFACT_FORMAT_VERSION})")
+    
+    def load(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+    
+    engine_types = _engine_types()
+    models = {}
+    for model_name, spec in manifest['models'].items():
+        arrays = {array_name: load(f"{model_name}.{array_name}") for array_name in spec['arrays']}
+        models[model_name] = engine_types[spec['type']].from_arrays(arrays, spec['meta'])
+    
+    return {
+        'scaler': ArrayScaler(load('scaler.mean'), load('scaler.scale')),
+        'models': models,
+        'feature_columns': manifest['feature_columns'],
+        'metadata': manifest['metadata']
+    }
@@ -1,35 +1,35 @@
 """
 Görselleştirme yardımcı fonksiyonları
 """
+import numpy as np
 import pandas as pd
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend kullan - popup açmaz
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import roc_curve, precision_recall_curve
-from sklearn.decomposition import PCA
-from config.config import PLOT_PARAMS
+from config.config import PLOT_PARAMS, REPORT_PARAMS, SCATTER_PARAMS
+from models.registry import model_title
 
 # Matplotlib ayarları
 plt.ioff()  # Interactive mode'u kapat - popup açmaz
 
 
-def plot_performance_comparison(metrics_iso, metrics_svm, ax=None):
+def plot_performance_comparison(results, ax=None):
     """
     Modellerin performans metriklerini karşılaştıran bar grafiği oluşturur.
     
     Args:
-        metrics_iso: Isolation Forest metrikleri
-        metrics_svm: One-Class SVM metrikleri
+        results: Model adı -> sonuç sözlüğü ('metrics' anahtarı ile)
         ax: Matplotlib axis (subplot için)
     """
+    import seaborn as sns
+    
     # Karşılaştırma için DataFrame oluştur
     metrics_df = pd.DataFrame({
-        'Model': ['Isolation Forest', 'One-Class SVM'],
-        'Doğruluk': [metrics_iso[0], metrics_svm[0]],
-        'Kesinlik': [metrics_iso[1], metrics_svm[1]],
-        'Duyarlılık': [metrics_iso[2], metrics_svm[2]],
-        'F1 Skoru': [metrics_iso[3], metrics_svm[3]]
+        'Model': [model_title(model_name) for model_name in results],
+        'Doğruluk': [model_results['metrics'][0] for model_results in results.values()],
+        'Kesinlik': [model_results['metrics'][1] for model_results in results.values()],
+        'Duyarlılık': [model_results['metrics'][2] for model_results in results.values()],
+        'F1 Skoru': [model_results['metrics'][3] for model_results in results.values()]
     })
     
     # DataFrame'i melt et
@@ -51,22 +51,23 @@ def plot_performance_comparison(metrics_iso, metrics_svm, ax=None):
     ax.grid(axis='y', linestyle='--', alpha=0.7)
 
 
-def plot_roc_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, auc_iso, auc_svm, ax=None):
+def _evaluation(y_test, model_results):
+    """Sonuçtaki değerlendirmeyi, yoksa etiket ve skorlardan yenisini döner"""
+    from utils.evaluation_utils import EvaluationResult
+    
+    if model_results.get('evaluation') is not None:
+        return model_results['evaluation']
+    return EvaluationResult(y_test, model_results.get('predictions'), model_results.get('scores'))
+
+
+def plot_roc_curves(results, ax=None):
     """
     ROC eğrilerini çizer.
     
     Args:
-        y_test: Test etiketleri
-        y_pred_iso_scores: Isolation Forest skorları
-        y_pred_svm_scores: One-Class SVM skorları
-        auc_iso: Isolation Forest AUC skoru
-        auc_svm: One-Class SVM AUC skoru
+        results: Model adı -> sonuç sözlüğü ('evaluation' anahtarı ile, bkz. report_data)
         ax: Matplotlib axis (subplot için)
     """
-    # ROC eğrilerini hesapla
-    fpr_iso, tpr_iso, _ = roc_curve(y_test, -y_pred_iso_scores)
-    fpr_svm, tpr_svm, _ = roc_curve(y_test, -y_pred_svm_scores)
-    
     # Grafik oluştur
     if ax is None:
         fig = plt.figure(figsize=PLOT_PARAMS['figsize'], dpi=PLOT_PARAMS['dpi'])
@@ -74,8 +75,11 @@ def plot_roc_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, auc_iso, auc_s
         # Figure'ı gizle ki popup olarak açılmasın
         plt.close(fig)
     
-    ax.plot(fpr_iso, tpr_iso, label=f'Isolation Forest (AUC = {auc_iso:.3f})', linewidth=2)
-    ax.plot(fpr_svm, tpr_svm, label=f'One-Class SVM (AUC = {auc_svm:.3f})', linewidth=2)
+    # ROC eğrileri (değerlendirmedeki sıralamadan)
+    for model_name, model_results in results.items():
+        evaluation = model_results['evaluation']
+        fpr, tpr, _ = evaluation.roc_curve
+        ax.plot(fpr, tpr, label=f'{model_title(model_name)} (AUC = {evaluation.roc_auc:.3f})', linewidth=2)
     ax.plot([0, 1], [0, 1], 'k--', label='Rastgele Tahmin', alpha=0.7)
     ax.set_xlabel('Yanlış Pozitif Oranı (FPR)', fontsize=10)
     ax.set_ylabel('Doğru Pozitif Oranı (TPR)', fontsize=10)
@@ -84,20 +88,14 @@ def plot_roc_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, auc_iso, auc_s
     ax.grid(True, alpha=0.3)
 
 
-def plot_precision_recall_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, ax=None):
+def plot_precision_recall_curves(results, ax=None):
     """
     Precision-Recall eğrilerini çizer.
     
     Args:
-        y_test: Test etiketleri
-        y_pred_iso_scores: Isolation Forest skorları
-        y_pred_svm_scores: One-Class SVM skorları
+        results: Model adı -> sonuç sözlüğü ('evaluation' anahtarı ile, bkz. report_data)
         ax: Matplotlib axis (subplot için)
     """
-    # Precision-Recall eğrilerini hesapla
-    precision_iso, recall_iso, _ = precision_recall_curve(y_test, -y_pred_iso_scores)
-    precision_svm, recall_svm, _ = precision_recall_curve(y_test, -y_pred_svm_scores)
-    
     # Grafik oluştur
     if ax is None:
         fig = plt.figure(figsize=PLOT_PARAMS['figsize'], dpi=PLOT_PARAMS['dpi'])
@@ -105,8 +103,12 @@ def plot_precision_recall_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, a
         # Figure'ı gizle ki popup olarak açılmasın
         plt.close(fig)
     
-    ax.plot(recall_iso, precision_iso, label='Isolation Forest', linewidth=2)
-    ax.plot(recall_svm, precision_svm, label='One-Class SVM', linewidth=2)
+    # Precision-Recall eğrileri (değerlendirmedeki sıralamadan)
+    for model_name, model_results in results.items():
+        evaluation = model_results['evaluation']
+        precision, recall, _ = evaluation.pr_curve
+        ax.plot(recall, precision, label=f'{model_title(model_name)} (AP = {evaluation.average_precision:.3f})',
+                linewidth=2)
     ax.set_xlabel('Duyarlılık (Recall)', fontsize=10)
     ax.set_ylabel('Kesinlik (Precision)', fontsize=10)
     ax.set_title('Modellerin Precision-Recall Eğrisi Karşılaştırması', fontsize=12, fontweight='bold')
@@ -114,7 +116,120 @@ def plot_precision_recall_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, a
     ax.grid(True, alpha=0.3)
 
 
-def plot_anomaly_distribution(X_test, y_pred, model_name):
+def project_2d(X_test, projection=None):
+    """
+    Test verisini anomali dağılımı grafikleri için 2 boyuta indirir.
+    
+    Args:
+        X_test: Test verisi (ölçeklenmiş)
+        projection: Eğitimde fit edilmiş PCAProjection (None ise X_test üzerinde fit edilir)
+        
+    Returns:
+        numpy.ndarray: (n_samples, 2) koordinatlar
+    """
+    from utils.projection_utils import PCAProjection
+    
+    if projection is None:
+        return PCAProjection().fit_transform(X_test)
+    return projection.transform(X_test)
+
+
+def _grid_cells(coordinates, gridsize):
+    """Noktaların gridsize x gridsize ızgaradaki hücre numaraları"""
+    cells = np.zeros(coordinates.shape[0], dtype=np.int64)
+    for axis in range(2):
+        values = coordinates[:, axis]
+        low, high = values.min(), values.max()
+        scale = gridsize / (high - low) if high > low else 0.0
+        index = np.minimum(((values - low) * scale).astype(np.int64), gridsize - 1)
+        cells = cells * gridsize + index
+    return cells
+
+
+def stratified_subsample(coordinates, max_points, gridsize, random_state=None):
+    """
+    Noktaları 2-B ızgara hücrelerine göre tabakalı örnekler: her dolu hücreden en az bir
+    nokta, yoğun hücrelerden boyutlarıyla orantılı sayıda nokta seçilir. Seyrek bölgeler
+    örneklemde korunur, seçilen nokta sayısı max_points + gridsize² ile sınırlıdır.
+    
+    Args:
+        coordinates: (n, 2) koordinatlar
+        max_points: Hedef örneklem boyutu
+        gridsize: Izgaranın eksen başına hücre sayısı
+        random_state: Tohum
+        
+    Returns:
+        numpy.ndarray: Seçilen indisler (sıralı)
+    """
+    n_points = coordinates.shape[0]
+    if n_points <= max_points:
+        return np.arange(n_points)
+    
+    rng = np.random.RandomState(random_state)
+    priority = rng.random_sample(n_points)
+    cells = _grid_cells(coordinates, gridsize)
+    # Hücredeki en küçük öncelikli nokta her zaman seçilir
+    cell_min = np.full(gridsize * gridsize, np.inf)
+    np.minimum.at(cell_min, cells, priority)
+    keep = (priority < max_points / n_points) | (priority == cell_min[cells])
+    return np.flatnonzero(keep)
+
+
+def draw_anomaly_scatter(ax, coordinates, y_pred, mode=None):
+    """
+    2-B koordinatları anomali etiketlerine göre çizer. Tahmin edilen anomalilerin hepsi
+    tek tek işaretlenir; büyük verilerde normal noktalar hexbin yoğunluk haritasında
+    toplanır ('hexbin') ya da ızgara tabakalı örneklemle seyreltilir ('subsample').
+    Çizim süresi normal nokta sayısından bağımsızdır ve toplanan nokta sayısı grafikte
+    belirtilir.
+    
+    Args:
+        ax: Matplotlib axis
+        coordinates: (n, 2) koordinatlar
+        y_pred: Tahmin edilen etiketler (1: anomali, 0: normal)
+        mode: 'auto', 'scatter', 'hexbin' veya 'subsample' (None ise config'den alınır)
+              'auto': nokta sayısı max_points'i aşarsa hexbin, aşmazsa tüm noktalar
+    """
+    mode = mode or SCATTER_PARAMS['mode']
+    if mode not in ('auto', 'scatter', 'hexbin', 'subsample'):
+        raise ValueError(f"Geçersiz çizim modu: '{mode}'. 'auto', 'scatter', 'hexbin' veya 'subsample' olmalı.")
+    
+    coordinates = np.asarray(coordinates)
+    y_pred = np.asarray(y_pred)
+    max_points = SCATTER_PARAMS['max_points']
+    if mode == 'auto':
+        mode = 'hexbin' if coordinates.shape[0] > max_points else 'scatter'
+    
+    if mode == 'scatter':
+        # Tüm noktalar (küçük veri setleri için önceki görünüm)
+        scatter = ax.scatter(coordinates[:, 0], coordinates[:, 1], c=y_pred, cmap='coolwarm', s=20, alpha=0.7)
+        ax.figure.colorbar(scatter, ax=ax, label='Anomali (1) / Normal (0)')
+        return
+    
+    anomalies = coordinates[y_pred == 1]
+    normals = coordinates[y_pred != 1]
+    gridsize = SCATTER_PARAMS['gridsize']
+    
+    if mode == 'hexbin' and normals.shape[0] > 0:
+        hexbin = ax.hexbin(normals[:, 0], normals[:, 1], gridsize=gridsize, bins='log', mincnt=1,
+                           cmap='Blues', linewidths=0)
+        ax.figure.colorbar(hexbin, ax=ax, label='Normal nokta sayısı (log)')
+        note = f"{normals.shape[0]:,} normal nokta {len(hexbin.get_offsets()):,} altıgende toplandı"
+    else:
+        shown = stratified_subsample(normals, max_points, gridsize, SCATTER_PARAMS['random_state'])
+        ax.scatter(normals[shown, 0], normals[shown, 1], color='#3b4cc0', s=8, alpha=0.5,
+                   linewidths=0, rasterized=True, label='Normal')
+        note = f"{normals.shape[0]:,} normal noktanın {shown.size:,} tanesi gösteriliyor"
+    
+    # Anomaliler her modda tek tek ve en üstte çizilir
+    ax.scatter(anomalies[:, 0], anomalies[:, 1], color='#b40426', s=12, alpha=0.8, linewidths=0,
+               rasterized=anomalies.shape[0] > max_points, label=f'Anomali ({anomalies.shape[0]:,})', zorder=3)
+    ax.legend(loc='upper right', fontsize=9)
+    ax.text(0.01, 0.01, note, transform=ax.transAxes, fontsize=9, va='bottom',
+            bbox={'boxstyle': 'round', 'facecolor': 'white', 'alpha': 0.8})
+
+
+def plot_anomaly_distribution(X_test, y_pred, model_name, projection=None, coordinates=None):
     """
     Anomali noktalarının dağılımını 2D olarak gösterir (PCA ile).
     
@@ -122,73 +237,181 @@ def plot_anomaly_distribution(X_test, y_pred, model_name):
         X_test: Test verisi
         y_pred: Tahmin edilen etiketler
         model_name: Model adı
+        projection: Eğitimde fit edilmiş PCAProjection (None ise X_test üzerinde fit edilir)
+        coordinates: Önceden hesaplanmış 2-B koordinatlar (verilirse X_test kullanılmaz)
     """
     # PCA ile 2 boyuta indir
-    pca = PCA(n_components=2)
-    X_test_pca = pca.fit_transform(X_test)
+    X_test_pca = coordinates if coordinates is not None else project_2d(X_test, projection)
     
     # Grafik oluştur
     fig = plt.figure(figsize=PLOT_PARAMS['figsize'], dpi=PLOT_PARAMS['dpi'])
     ax = fig.add_subplot(111)
-    scatter = ax.scatter(X_test_pca[:, 0], X_test_pca[:, 1], c=y_pred, cmap='coolwarm', s=20, alpha=0.7)
+    draw_anomaly_scatter(ax, X_test_pca, y_pred)
     ax.set_xlabel('Ana Bileşen 1', fontsize=12)
     ax.set_ylabel('Ana Bileşen 2', fontsize=12)
-    plt.colorbar(scatter, ax=ax, label='Anomali (1) / Normal (0)')
     ax.grid(True, alpha=0.3)
     # Figure'ı gizle ki popup olarak açılmasın
     plt.close(fig)
 
 
-def plot_confusion_matrices(y_test, y_pred_iso, y_pred_svm, ax1=None, ax2=None):
+def plot_confusion_matrices(results, axes=None):
     """
     Confusion matrix'leri yan yana gösterir.
     
     Args:
-        y_test: Test etiketleri
-        y_pred_iso: Isolation Forest tahminleri
-        y_pred_svm: One-Class SVM tahminleri
-        ax1: İlk confusion matrix için axis
-        ax2: İkinci confusion matrix için axis
+        results: Model adı -> sonuç sözlüğü ('evaluation' anahtarı ile, bkz. report_data)
+        axes: Model başına bir axis
     """
-    from sklearn.metrics import confusion_matrix
-    
-    # Confusion matrix'leri hesapla
-    cm_iso = confusion_matrix(y_test, y_pred_iso)
-    cm_svm = confusion_matrix(y_test, y_pred_svm)
+    import seaborn as sns
     
     # Grafik oluştur
-    if ax1 is None or ax2 is None:
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6), dpi=PLOT_PARAMS['dpi'])
+    if axes is None:
+        fig, axes = plt.subplots(1, len(results), figsize=(7.5 * len(results), 6), dpi=PLOT_PARAMS['dpi'],
+                                 squeeze=False)
+        axes = axes[0]
         # Figure'ı gizle ki popup olarak açılmasın
         plt.close(fig)
     
-    # Isolation Forest confusion matrix
-    sns.heatmap(cm_iso, annot=True, fmt='d', cmap='Blues', ax=ax1)
-    ax1.set_title('Isolation Forest Confusion Matrix', fontweight='bold', fontsize=10)
-    ax1.set_xlabel('Tahmin Edilen', fontsize=9)
-    ax1.set_ylabel('Gerçek', fontsize=9)
+    # Confusion matrix'ler (değerlendirmeden, etiketler yeniden taranmaz)
+    for ax, (model_name, model_results) in zip(axes, results.items()):
+        sns.heatmap(model_results['evaluation'].confusion_matrix, annot=True, fmt='d', cmap='Blues', ax=ax)
+        ax.set_title(f'{model_title(model_name)} Confusion Matrix', fontweight='bold', fontsize=10)
+        ax.set_xlabel('Tahmin Edilen', fontsize=9)
+        ax.set_ylabel('Gerçek', fontsize=9)
+
+
+# Rapor figürleri: (ad, sekme başlığı, boyut, çizim fonksiyonu). Etkileşimli pencere ve
+# başsız rapor aynı tanımları kullanır.
+def _draw_performance(fig, data):
+    """Performans metrikleri sekmesi"""
+    ax = fig.add_subplot(111)
+    plot_performance_comparison(data['models'], ax)
+    ax.set_title('Performans Metrikleri Karşılaştırması', fontsize=16, fontweight='bold', pad=20)
+
+
+def _draw_roc(fig, data):
+    """ROC eğrileri sekmesi"""
+    ax = fig.add_subplot(111)
+    plot_roc_curves(data['models'], ax)
+    ax.set_title('ROC Eğrileri Karşılaştırması', fontsize=16, fontweight='bold', pad=20)
+
+
+def _draw_precision_recall(fig, data):
+    """Precision-Recall sekmesi"""
+    ax = fig.add_subplot(111)
+    plot_precision_recall_curves(data['models'], ax)
+    ax.set_title('Precision-Recall Eğrileri Karşılaştırması', fontsize=16, fontweight='bold', pad=20)
+
+
+def _draw_confusion_matrices(fig, data):
+    """Confusion matrix sekmesi"""
+    axes = fig.subplots(1, len(data['models']), squeeze=False)[0]
+    plot_confusion_matrices(data['models'], axes)
+    fig.suptitle('Confusion Matrix Karşılaştırması', fontsize=16, fontweight='bold', y=0.95)
+
+
+def _draw_anomaly(fig, data, model_name):
+    """Modelin anomali dağılımı sekmesi"""
+    ax = fig.add_subplot(111)
+    title = model_title(model_name)
+    plot_anomaly_distribution_subplot(None, data['models'][model_name]['predictions'], title, ax,
+                                      coordinates=data['X_test_2d'])
+    ax.set_title(f'{title} - Anomali Dağılımı (PCA)', fontsize=16, fontweight='bold', pad=20)
+
+
+# Modellerden bağımsız figürler; confusion matrix ve model başına anomali dağılımı
+# figürleri report_figures() içinde eklenir
+REPORT_FIGURES = (
+    ('performance', "📊 Performans Metrikleri", (12, 8), _draw_performance),
+    ('roc', "📈 ROC Eğrileri", (12, 8), _draw_roc),
+    ('precision_recall', "📉 Precision-Recall", (12, 8), _draw_precision_recall)
+)
+
+
+def report_figures(data):
+    """
+    Rapordaki tüm figürlerin tanımları: REPORT_FIGURES, model sayısına göre genişleyen
+    confusion matrix ve her model için bir anomali dağılımı figürü.
     
-    # One-Class SVM confusion matrix
-    sns.heatmap(cm_svm, annot=True, fmt='d', cmap='Blues', ax=ax2)
-    ax2.set_title('One-Class SVM Confusion Matrix', fontweight='bold', fontsize=10)
-    ax2.set_xlabel('Tahmin Edilen', fontsize=9)
-    ax2.set_ylabel('Gerçek', fontsize=9)
+    Args:
+        data: report_data() ile hazırlanan girdiler
+        
+    Returns:
+        list: (ad, sekme başlığı, boyut, çizim fonksiyonu) tanımları
+    """
+    from functools import partial
+    
+    figures = list(REPORT_FIGURES)
+    figures.append(('confusion_matrix', "🔢 Confusion Matrix", (8 * len(data['models']), 6),
+                    _draw_confusion_matrices))
+    for model_name in data['models']:
+        figures.append((f'anomaly_{model_name}', f"🔍 {model_title(model_name)}", (12, 8),
+                        partial(_draw_anomaly, model_name=model_name)))
+    return figures
 
 
-def plot_all_visualizations(y_test, y_pred_iso, y_pred_svm, y_pred_iso_scores, y_pred_svm_scores, 
-                           metrics_iso, metrics_svm, X_test_scaled):
+def build_figure(name, data, dpi=100):
+    """
+    Rapor figürünü pyplot'a kaydetmeden oluşturur (arka uçtan bağımsız).
+    
+    Args:
+        name: report_figures() içindeki figür adı
+        data: report_data() ile hazırlanan girdiler
+        dpi: Çözünürlük
+        
+    Returns:
+        matplotlib.figure.Figure: Çizilmiş figür
+    """
+    from matplotlib.figure import Figure
+    
+    specs = {spec[0]: spec for spec in report_figures(data)}
+    if name not in specs:
+        raise ValueError(f"Geçersiz figür: '{name}'. Seçenekler: {list(specs)}")
+    _, _, figsize, draw = specs[name]
+    
+    fig = Figure(figsize=figsize, dpi=dpi)
+    draw(fig, data)
+    fig.tight_layout()
+    return fig
+
+
+def report_data(y_test, results, X_test_scaled, projection=None):
+    """
+    Figür çizim fonksiyonlarının ortak girdisi. Test verisinin 2-B izdüşümü ve model başına
+    değerlendirme sonucu (sıralanmış skorlardan eğriler) burada bir kez hesaplanır; işçi
+    süreçlere ham test verisi ve model nesneleri yerine yalnızca bunlar aktarılır.
+    
+    Args:
+        y_test: Test etiketleri
+        results: Model adı -> sonuç sözlüğü (ModelTrainerService.results biçiminde:
+            predictions, scores, metrics ve varsa evaluation)
+        X_test_scaled: Test verisi (anomali dağılımı için)
+        projection: Eğitimde fit edilmiş PCAProjection (None ise test verisi üzerinde fit edilir)
+    """
+    models = {}
+    for model_name, model_results in results.items():
+        evaluation = _evaluation(y_test, model_results)
+        models[model_name] = {
+            'predictions': model_results['predictions'],
+            'metrics': model_results.get('metrics') or evaluation.metrics,
+            'evaluation': evaluation
+        }
+    return {
+        'models': models,
+        'X_test_2d': project_2d(X_test_scaled, projection)
+    }
+
+
+def plot_all_visualizations(y_test, results, X_test_scaled, projection=None):
     """
     Tüm görselleştirmeleri tek bir uygulama penceresinde sekmeler halinde gösterir.
+    Figürler sekme ilk kez seçildiğinde çizilir; pencere yalnızca ilk sekme çizilerek açılır.
     
     Args:
         y_test: Test etiketleri
-        y_pred_iso: Isolation Forest tahminleri
-        y_pred_svm: One-Class SVM tahminleri
-        y_pred_iso_scores: Isolation Forest skorları
-        y_pred_svm_scores: One-Class SVM skorları
-        metrics_iso: Isolation Forest metrikleri
-        metrics_svm: One-Class SVM metrikleri
+        results: Model adı -> sonuç sözlüğü (bkz. report_data)
         X_test_scaled: Test verisi (anomali dağılımı için)
+        projection: Eğitimde fit edilmiş PCAProjection (None ise test verisi üzerinde fit edilir)
     """
     try:
         # Tkinter için TkAgg backend'ini kullan
@@ -199,10 +422,11 @@ def plot_all_visualizations(y_test, y_pred_iso, y_pred_svm, y_pred_iso_scores, y
         from tkinter import ttk
     except ImportError:
         print("Tkinter bulunamadı. Basit matplotlib penceresi kullanılıyor...")
-        plot_simple_visualizations(y_test, y_pred_iso, y_pred_svm, y_pred_iso_scores, y_pred_svm_scores, 
-                                  metrics_iso, metrics_svm, X_test_scaled)
+        plot_simple_visualizations(results)
         return
     
+    data = report_data(y_test, results, X_test_scaled, projection)
+    
     print("\n" + "="*60)
     print("ANOMALİ TESPİT UYGULAMASI AÇILIYOR")
     print("="*60)
@@ -220,107 +444,33 @@ def plot_all_visualizations(y_test, y_pred_iso, y_pred_svm, y_pred_iso_scores, y
     notebook = ttk.Notebook(root)
     notebook.pack(fill='both', expand=True, padx=10, pady=10)
     
-    # Sekme 1: Performans Metrikleri
-    frame1 = ttk.Frame(notebook)
-    notebook.add(frame1, text="📊 Performans Metrikleri")
-    
-    fig1 = plt.figure(figsize=(12, 8), dpi=100)
-    ax1 = fig1.add_subplot(111)
-    plot_performance_comparison(metrics_iso, metrics_svm, ax1)
-    ax1.set_title('Performans Metrikleri Karşılaştırması', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    
-    canvas1 = FigureCanvasTkAgg(fig1, frame1)
-    canvas1.draw()
-    canvas1.get_tk_widget().pack(fill='both', expand=True)
-    
-    toolbar1 = NavigationToolbar2Tk(canvas1, frame1)
-    toolbar1.update()
-    
-    # Sekme 2: ROC Eğrileri
-    frame2 = ttk.Frame(notebook)
-    notebook.add(frame2, text="📈 ROC Eğrileri")
-    
-    fig2 = plt.figure(figsize=(12, 8), dpi=100)
-    ax2 = fig2.add_subplot(111)
-    plot_roc_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, 
-                   metrics_iso[4], metrics_svm[4], ax2)
-    ax2.set_title('ROC Eğrileri Karşılaştırması', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    
-    canvas2 = FigureCanvasTkAgg(fig2, frame2)
-    canvas2.draw()
-    canvas2.get_tk_widget().pack(fill='both', expand=True)
-    
-    toolbar2 = NavigationToolbar2Tk(canvas2, frame2)
-    toolbar2.update()
-    
-    # Sekme 3: Precision-Recall Eğrileri
-    frame3 = ttk.Frame(notebook)
-    notebook.add(frame3, text="📉 Precision-Recall")
-    
-    fig3 = plt.figure(figsize=(12, 8), dpi=100)
-    ax3 = fig3.add_subplot(111)
-    plot_precision_recall_curves(y_test, y_pred_iso_scores, y_pred_svm_scores, ax3)
-    ax3.set_title('Precision-Recall Eğrileri Karşılaştırması', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    
-    canvas3 = FigureCanvasTkAgg(fig3, frame3)
-    canvas3.draw()
-    canvas3.get_tk_widget().pack(fill='both', expand=True)
-    
-    toolbar3 = NavigationToolbar2Tk(canvas3, frame3)
-    toolbar3.update()
-    
-    # Sekme 4: Confusion Matrix'ler
-    frame4 = ttk.Frame(notebook)
-    notebook.add(frame4, text="🔢 Confusion Matrix")
-    
-    fig4, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6), dpi=100)
-    plot_confusion_matrices(y_test, y_pred_iso, y_pred_svm, ax1, ax2)
-    plt.suptitle('Confusion Matrix Karşılaştırması', fontsize=16, fontweight='bold', y=0.95)
-    plt.tight_layout()
-    
-    canvas4 = FigureCanvasTkAgg(fig4, frame4)
-    canvas4.draw()
-    canvas4.get_tk_widget().pack(fill='both', expand=True)
-    
-    toolbar4 = NavigationToolbar2Tk(canvas4, frame4)
-    toolbar4.update()
-    
-    # Sekme 5: Isolation Forest Anomali Dağılımı
-    frame5 = ttk.Frame(notebook)
-    notebook.add(frame5, text="🌲 Isolation Forest")
-    
-    fig5 = plt.figure(figsize=(12, 8), dpi=100)
-    ax5 = fig5.add_subplot(111)
-    plot_anomaly_distribution_subplot(X_test_scaled, y_pred_iso, "Isolation Forest", ax5)
-    ax5.set_title('Isolation Forest - Anomali Dağılımı (PCA)', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    
-    canvas5 = FigureCanvasTkAgg(fig5, frame5)
-    canvas5.draw()
-    canvas5.get_tk_widget().pack(fill='both', expand=True)
-    
-    toolbar5 = NavigationToolbar2Tk(canvas5, frame5)
-    toolbar5.update()
-    
-    # Sekme 6: One-Class SVM Anomali Dağılımı
-    frame6 = ttk.Frame(notebook)
-    notebook.add(frame6, text="🤖 One-Class SVM")
-    
-    fig6 = plt.figure(figsize=(12, 8), dpi=100)
-    ax6 = fig6.add_subplot(111)
-    plot_anomaly_distribution_subplot(X_test_scaled, y_pred_svm, "One-Class SVM", ax6)
-    ax6.set_title('One-Class SVM - Anomali Dağılımı (PCA)', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    
-    canvas6 = FigureCanvasTkAgg(fig6, frame6)
-    canvas6.draw()
-    canvas6.get_tk_widget().pack(fill='both', expand=True)
+    # Sekmeler boş çerçevelerle eklenir, figürler ilk seçimde çizilir
+    frames = {}
+    for name, text, _, _ in report_figures(data):
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=text)
+        frames[str(frame)] = (name, frame)
+    rendered = set()
+    
+    def render_selected_tab(event=None):
+        name, frame = frames[notebook.select()]
+        if name in rendered:
+            return
+        rendered.add(name)
+        
+        root.config(cursor='watch')
+        root.update_idletasks()
+        canvas = FigureCanvasTkAgg(build_figure(name, data), frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill='both', expand=True)
+        
+        toolbar = NavigationToolbar2Tk(canvas, frame)
+        toolbar.update()
+        root.config(cursor='')
     
-    toolbar6 = NavigationToolbar2Tk(canvas6, frame6)
-    toolbar6.update()
+    notebook.bind('<<NotebookTabChanged>>', render_selected_tab)
+    # İlk sekme pencere açıldıktan sonra çizilir (çizilmişse tekrar çizilmez)
+    root.after_idle(render_selected_tab)
     
     # Alt bilgi paneli
     info_frame = ttk.Frame(root)
@@ -335,20 +485,161 @@ def plot_all_visualizations(y_test, y_pred_iso, y_pred_svm, y_pred_iso_scores, y
     root.mainloop()
 
 
-def plot_simple_visualizations(y_test, y_pred_iso, y_pred_svm, y_pred_iso_scores, y_pred_svm_scores, 
-                              metrics_iso, metrics_svm, X_test_scaled):
+# Başsız rapor işçi süreçlerinin girdisi (her işçiye bir kez aktarılır)
+_WORKER_DATA = None
+
+
+def _init_report_worker(data):
+    """İşçi süreçte pencere açmayan arka ucu seçer ve girdileri saklar"""
+    global _WORKER_DATA
+    plt.switch_backend('Agg')
+    _WORKER_DATA = data
+
+
+def render_figure(name, formats, dpi, data=None):
+    """Figürü çizer ve istenen biçimlerde bayt olarak döner"""
+    import io
+    
+    fig = build_figure(name, _WORKER_DATA if data is None else data, dpi)
+    outputs = {}
+    for fmt in formats:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt)
+        outputs[fmt] = buffer.getvalue()
+    return name, outputs
+
+
+def render_report(y_test, results, X_test_scaled, output_dir=None, formats=None, html=None, n_jobs=None,
+                  projection=None):
+    """
+    Tüm görselleştirmeleri pencere açmadan dosyalara çizer (başsız sunucular için).
+    Figürler ayrı işçi süreçlerde paralel çizilir; isteğe bağlı olarak tüm figürler ve
+    metrikler tek bir HTML raporunda birleştirilir.
+    
+    Args:
+        y_test, results, X_test_scaled: plot_all_visualizations ile aynı
+        output_dir: Çıktı klasörü (None ise config'den alınır)
+        formats: Figür biçimleri, 'png' ve/veya 'svg' (None ise config'den alınır)
+        html: True ise report.html yazılır (None ise config'den alınır)
+        n_jobs: İşçi süreç sayısı (None: figür sayısı ve çekirdek sayısının küçüğü, 1: süreç açmadan)
+        projection: Eğitimde fit edilmiş PCAProjection (None ise test verisi üzerinde fit edilir)
+        
+    Returns:
+        dict: Figür adı -> {biçim: dosya yolu}; HTML raporu 'html' anahtarında
+    """
+    import os
+    
+    output_dir = output_dir or REPORT_PARAMS['output_dir']
+    formats = list(formats or REPORT_PARAMS['formats'])
+    html = REPORT_PARAMS['html'] if html is None else html
+    n_jobs = n_jobs or REPORT_PARAMS['n_jobs'] or os.cpu_count() or 1
+    dpi = PLOT_PARAMS['dpi']
+    
+    invalid = [fmt for fmt in formats if fmt not in ('png', 'svg')]
+    if invalid or not formats:
+        raise ValueError(f"Geçersiz figür biçimi: {invalid or formats}. 'png' ve/veya 'svg' olmalı.")
+    
+    data = report_data(y_test, results, X_test_scaled, projection)
+    figures = report_figures(data)
+    # HTML raporuna gömülecek biçim: svg varsa vektörel, yoksa png
+    render_formats = list(formats)
+    embed_format = 'svg' if 'svg' in formats else 'png'
+    names = [spec[0] for spec in figures]
+    # Dağılım (scatter) figürleri en uzun süren işler; önce başlatılırlar
+    names.sort(key=lambda name: not name.startswith('anomaly_'))
+    
+    n_workers = min(n_jobs, len(names))
+    print(f"\nRapor çiziliyor ({len(names)} figür, {n_workers} işçi süreç)...")
+    if n_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_report_worker,
+                                 initargs=(data,)) as executor:
+            rendered = dict(executor.map(render_figure, names, [render_formats] * len(names),
+                                         [dpi] * len(names)))
+    else:
+        rendered = dict(render_figure(name, render_formats, dpi, data) for name in names)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, _, _, _ in figures:
+        paths[name] = {}
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{name}.{fmt}")
+            with open(path, 'wb') as f:
+                f.write(rendered[name][fmt])
+            paths[name][fmt] = path
+    
+    if html:
+        paths['html'] = os.path.join(output_dir, 'report.html')
+        with open(paths['html'], 'w', encoding='utf-8') as f:
+            f.write(_report_html(rendered, embed_format, data, figures))
+    
+    print(f"Rapor kaydedildi: {output_dir}")
+    return paths
+
+
+def _report_html(rendered, embed_format, data, figures):
+    """Figürleri (gömülü) ve metrik tablosunu içeren tek dosyalık HTML raporu"""
+    import base64
+    import html
+    from datetime import datetime
+    
+    rows = []
+    for model_name, model_data in data['models'].items():
+        values = list(model_data['metrics'][:5]) + [model_data['evaluation'].average_precision]
+        cells = ''.join(f"<td>{value:.4f}</td>" for value in values)
+        rows.append(f"<tr><th>{html.escape(model_title(model_name))}</th>{cells}</tr>")
+    
+    sections = []
+    for name, text, _, _ in figures:
+        content = rendered[name][embed_format]
+        if embed_format == 'svg':
+            # XML bildirimi ve DOCTYPE HTML içinde gereksiz
+            figure = content.decode('utf-8')
+            figure = figure[figure.index('<svg'):]
+        else:
+            figure = f'<img src="data:image/png;base64,{base64.b64encode(content).decode("ascii")}" alt="{name}">'
+        sections.append(f'<section id="{name}"><h2>{html.escape(text)}</h2>{figure}</section>')
+    
+    return f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>Anomali Tespit Modelleri - Analiz Raporu</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 2em; background: #f0f0f0; }}
+section, table {{ background: #fff; padding: 1em; margin-bottom: 1.5em; }}
+td, th {{ padding: 0.3em 1em; text-align: right; }}
+img, svg {{ max-width: 100%; height: auto; }}
+</style>
+</head>
+<body>
+<h1>Anomali Tespit Modelleri - Analiz Raporu</h1>
+<p>Oluşturulma: {datetime.now():%Y-%m-%d %H:%M:%S}</p>
+<table>
+<tr><th>Model</th><th>Doğruluk</th><th>Kesinlik</th><th>Duyarlılık</th><th>F1 Skoru</th><th>ROC AUC</th><th>Ort. Kesinlik</th></tr>
+{''.join(rows)}
+</table>
+{''.join(sections)}
+</body>
+</html>
+"""
+
+
+def plot_simple_visualizations(results):
     """
     Tkinter yoksa basit matplotlib pencereleri gösterir.
     """
     print("\nTkinter bulunamadı. Grafikler gösterilemiyor.")
     print("Lütfen tkinter kurulumunu kontrol edin veya uygulamayı farklı bir ortamda çalıştırın.")
     print("\nModel sonuçları:")
-    print(f"Isolation Forest - F1 Skoru: {metrics_iso[3]:.4f}")
-    print(f"One-Class SVM - F1 Skoru: {metrics_svm[3]:.4f}")
-    print("En iyi model:", "Isolation Forest" if metrics_iso[3] > metrics_svm[3] else "One-Class SVM")
+    for model_name, model_results in results.items():
+        print(f"{model_title(model_name)} - F1 Skoru: {model_results['metrics'][3]:.4f}")
+    best_model = max(results, key=lambda model_name: results[model_name]['metrics'][3])
+    print("En iyi model:", model_title(best_model))
 
 
-def plot_anomaly_distribution_subplot(X_test, y_pred, model_name, ax):
+def plot_anomaly_distribution_subplot(X_test, y_pred, model_name, ax, projection=None, coordinates=None):
     """
     Anomali dağılımını subplot olarak çizer.
     
@@ -357,19 +648,17 @@ def plot_anomaly_distribution_subplot(X_test, y_pred, model_name, ax):
         y_pred: Tahmin edilen etiketler
         model_name: Model adı
         ax: Matplotlib axis
+        projection: Eğitimde fit edilmiş PCAProjection (None ise X_test üzerinde fit edilir)
+        coordinates: Önceden hesaplanmış 2-B koordinatlar (verilirse X_test kullanılmaz)
     """
     # PCA ile 2 boyuta indir
-    pca = PCA(n_components=2)
-    X_test_pca = pca.fit_transform(X_test)
+    X_test_pca = coordinates if coordinates is not None else project_2d(X_test, projection)
     
-    # Grafik oluştur
-    scatter = ax.scatter(X_test_pca[:, 0], X_test_pca[:, 1], c=y_pred, cmap='coolwarm', s=20, alpha=0.7)
+    # Grafik oluştur (büyük verilerde normal noktalar yoğunluk haritasında toplanır)
+    draw_anomaly_scatter(ax, X_test_pca, y_pred)
     ax.set_xlabel('Ana Bileşen 1', fontsize=12)
     ax.set_ylabel('Ana Bileşen 2', fontsize=12)
     ax.grid(True, alpha=0.3)
-    
-    # Colorbar ekle
-    plt.colorbar(scatter, ax=ax, label='Anomali (1) / Normal (0)')
 
 
 def plot_feature_importance(model, feature_names, top_n=10):